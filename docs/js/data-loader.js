@@ -3,9 +3,24 @@ export class DataLoader {
     constructor() {
         this.shorts = [];
         this.fallbackData = this.getDemoData();
+        this.feedBase = 'shorts_feed/';
+        this.manifest = null;
+        this.chunkPromises = new Map();
+        this.graphPromises = new Map();
+        this.tilesBase = 'graph/tiles/';
+        this.tileIndexPromise = null;
+        this.tilePromises = new Map();
+        this.onChunkLoaded = null;
     }
 
     async loadShorts() {
+        try {
+            // Chunked feed: manifest plus the first chunk, the rest on demand
+            return await this.loadFeed();
+        } catch (error) {
+            console.warn('Chunked feed unavailable, loading shorts_data.json:', error);
+        }
+
         try {
             // Load optimized shorts data
             const response = await fetch('shorts_data.json');
@@ -24,6 +39,115 @@ export class DataLoader {
         }
     }
 
+    async loadFeed() {
+        const response = await fetch(`${this.feedBase}manifest.json`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+
+        const manifest = await response.json();
+        if (!manifest.chunks?.length) {
+            throw new Error('Feed manifest has no chunks');
+        }
+
+        this.manifest = manifest;
+        this.shorts = [];
+        await this.loadChunk(0);
+
+        console.log(`Loaded ${this.shorts.length}/${manifest.total_shorts} shorts (${manifest.total_duration}s total)`);
+        return this.shorts;
+    }
+
+    // Chunks are appended in order so this.shorts stays contiguous
+    loadChunk(chunkIndex) {
+        if (!this.manifest || chunkIndex >= this.manifest.chunks.length) {
+            return Promise.resolve([]);
+        }
+        if (this.chunkPromises.has(chunkIndex)) {
+            return this.chunkPromises.get(chunkIndex);
+        }
+
+        const previous = chunkIndex > 0 ? this.loadChunk(chunkIndex - 1) : Promise.resolve([]);
+        const entry = this.manifest.chunks[chunkIndex];
+        const request = fetch(`${this.feedBase}${entry.url}`).then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return response.json();
+        });
+
+        const promise = Promise.all([previous, request]).then(([, chunk]) => {
+            this.shorts.push(...chunk.shorts);
+            if (this.onChunkLoaded) {
+                this.onChunkLoaded(chunk.shorts, chunk.start);
+            }
+            return chunk.shorts;
+        }).catch(error => {
+            // Allow a retry on the next navigation
+            this.chunkPromises.delete(chunkIndex);
+            console.error(`Failed to load chunk ${chunkIndex}:`, error);
+            // Without the first chunk there is no feed; let loadShorts fall back
+            if (chunkIndex === 0) {
+                throw error;
+            }
+            return [];
+        });
+
+        this.chunkPromises.set(chunkIndex, promise);
+        return promise;
+    }
+
+    // Fetch the chunk after the one containing index
+    prefetchAfter(index) {
+        if (!this.manifest) return Promise.resolve([]);
+        const chunkIndex = Math.floor(index / this.manifest.chunk_size);
+        return this.loadChunk(chunkIndex + 1);
+    }
+
+    async loadGraph(short) {
+        if (!short || short.graph || !short.graph_url) {
+            return short?.graph || null;
+        }
+
+        if (!this.graphPromises.has(short.graph_url)) {
+            const promise = fetch(`${this.feedBase}${short.graph_url}`)
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+            this.graphPromises.set(short.graph_url, promise);
+        }
+
+        short.graph = await this.graphPromises.get(short.graph_url);
+        return short.graph;
+    }
+
+    // Knowledge-graph neighborhood of an entity (hops: 1 or 2), or null if it has no tile
+    async loadNeighborhood(name, hops = 1) {
+        if (!this.tileIndexPromise) {
+            this.tileIndexPromise = fetch(`${this.tilesBase}index.json`)
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+        }
+
+        const index = await this.tileIndexPromise;
+        const tiles = index?.entities?.[name];
+        if (!tiles) {
+            return null;
+        }
+
+        const tile = tiles[Math.min(hops, tiles.length) - 1];
+        if (!this.tilePromises.has(tile)) {
+            const promise = fetch(`${this.tilesBase}${tile}`)
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null);
+            this.tilePromises.set(tile, promise);
+        }
+        return this.tilePromises.get(tile);
+    }
+
+    getTotalShorts() {
+        return this.manifest?.total_shorts || this.shorts.length;
+    }
+
     async loadFallbackData() {
         try {
             // Fallback to original news data
@@ -3,6 +3,7 @@ export class GraphManager {
     constructor() {
         this.graphEngaged = false;
         this.onEntityClick = null;
+        this.onEntityExplore = null;
     }
 
     // Generate avatar URL using DiceBear API for consistent person images
@@ -102,13 +103,24 @@ export class GraphManager {
         }
 
         const nodeCount = graphData.entities.length;
-        const useCircular = nodeCount <= 8;
+        // Layouts computed by the generator are used as-is, without physics
+        const layoutPositions = graphData.layout && graphData.layout.positions;
+        const precomputed = !!layoutPositions &&
+            graphData.entities.every(entity => Array.isArray(layoutPositions[entity.name]));
+        const useCircular = !precomputed && nodeCount <= 8;
+        const layoutSpan = Math.min(400, 120 + nodeCount * 30);
         
         const nodes = new vis.DataSet(
             graphData.entities.map((entity, index) => {
                 let position = {};
                 
-                if (useCircular) {
+                if (precomputed) {
+                    const [x, y] = layoutPositions[entity.name];
+                    position = {
+                        x: (x - 0.5) * layoutSpan,
+                        y: (y - 0.5) * layoutSpan
+                    };
+                } else if (useCircular) {
                     const radius = Math.min(150, 50 + nodeCount * 15);
                     const angle = (2 * Math.PI * index) / nodeCount;
                     position = {
@@ -191,14 +203,14 @@ export class GraphManager {
             }).filter(edge => edge !== null)
         );
 
-        const options = this.getGraphOptions(useCircular);
+        const options = this.getGraphOptions(useCircular, precomputed);
         const data = { nodes: nodes, edges: edges };
         const network = new vis.Network(container, data, options);
 
         this.setupNetworkInteractions(network, graphData, nodes, edges, currentShort);
     }
 
-    getGraphOptions(useCircular) {
+    getGraphOptions(useCircular, precomputed = false) {
         return {
             nodes: {
                 shape: 'dot',
@@ -269,7 +281,7 @@ export class GraphManager {
                 }
             },
             physics: {
-                enabled: !useCircular,
+                enabled: !useCircular && !precomputed,
                 stabilization: { iterations: 100 },
                 barnesHut: {
                     gravitationalConstant: -8000,
@@ -290,7 +302,7 @@ export class GraphManager {
             },
             layout: {
                 randomSeed: 42,
-                improvedLayout: !useCircular
+                improvedLayout: !useCircular && !precomputed
             }
         };
     }
@@ -318,6 +330,20 @@ export class GraphManager {
                 this.resetHighlighting(nodes, edges, graphData);
             }
         });
+
+        // Double-click opens the entity's neighborhood in the full knowledge graph
+        network.on("doubleClick", (params) => {
+            if (params.nodes.length > 0 && this.onEntityExplore) {
+                this.onEntityExplore(graphData.entities[params.nodes[0]], currentShort);
+            }
+        });
+    }
+
+    exploreNeighborhood(tile, currentShort) {
+        const graphContainer = document.getElementById(`graph-${currentShort}`);
+        if (graphContainer && tile) {
+            this.createVisJsGraph(graphContainer, tile, currentShort);
+        }
     }
 
     showEntityInfo(entity, currentShort) {
@@ -23,12 +23,17 @@ class ScrAntennaApp {
         this.graphManager.onEntityClick = () => {
             this.modeManager.markGraphEngaged();
         };
+        this.graphManager.onEntityExplore = async (entity, index) => {
+            const tile = await this.dataLoader.loadNeighborhood(entity.name, 2);
+            this.graphManager.exploreNeighborhood(tile, index);
+        };
     }
 
     async initialize() {
         try {
-            // Load data
+            // Load data; later feed chunks are appended as they arrive
             this.shorts = await this.dataLoader.loadShorts();
+            this.dataLoader.onChunkLoaded = (shorts, start) => this.appendShorts(shorts, start);
             
             // Initialize navigation with shorts data
             this.navigation = new Navigation(this.shorts, this.onNavigate.bind(this));
@@ -73,14 +78,23 @@ class ScrAntennaApp {
         }
 
         container.innerHTML = '';
+        this.appendShorts(this.shorts, 0);
+    }
+
+    appendShorts(shorts, start) {
+        const container = document.getElementById('shortsContainer');
+        if (!container) return;
+
+        const total = this.dataLoader.getTotalShorts();
 
-        this.shorts.forEach((short, index) => {
+        shorts.forEach((short, offset) => {
+            const index = start + offset;
             const shortDiv = document.createElement('div');
-            shortDiv.className = 'short';
+            shortDiv.className = index > this.currentShort ? 'short next' : 'short';
             shortDiv.id = `short-${index}`;
             
             shortDiv.innerHTML = `
-                <div class="headline ${short.graph?.has_svo ? 'svo' : ''}" id="headline-${index}">
+                <div class="headline ${(short.graph?.has_svo ?? short.graph_summary?.has_svo) ? 'svo' : ''}" id="headline-${index}">
                     ${short.title}
                 </div>
                 <div class="content" id="content-${index}">
@@ -94,8 +108,8 @@ class ScrAntennaApp {
                     <div class="graph-header">
                         <h3 class="graph-title">${short.title}</h3>
                         <div class="graph-meta">
-                            <span>${short.graph?.entities?.length || 0} entities</span>
-                            <span>${short.graph?.relationships?.length || 0} relationships</span>
+                            <span>${short.graph?.entities?.length || short.graph_summary?.entities || 0} entities</span>
+                            <span>${short.graph?.relationships?.length || short.graph_summary?.relationships || 0} relationships</span>
                         </div>
                     </div>
                     <div class="graph-content">
@@ -111,7 +125,7 @@ class ScrAntennaApp {
                         Graph engaged - auto-advance paused
                     </div>
                 </div>
-                <div class="progress-bar" style="width: ${((index + 1) / this.shorts.length) * 100}%"></div>
+                <div class="progress-bar" style="width: ${((index + 1) / total) * 100}%"></div>
             `;
             
             container.appendChild(shortDiv);
@@ -148,6 +162,9 @@ class ScrAntennaApp {
         // Update timeline
         this.updateTimeline(index);
 
+        // Fetch the next feed chunk before the viewer reaches it
+        this.dataLoader.prefetchAfter(index);
+
         // Load graph if in explore mode
         if (this.modeManager.currentMode === 'explore') {
             this.loadGraphForShort(index);
@@ -202,9 +219,10 @@ class ScrAntennaApp {
         }
     }
 
-    loadGraphForShort(index) {
+    async loadGraphForShort(index) {
         const short = this.shorts[index];
         if (short) {
+            await this.dataLoader.loadGraph(short);
             this.graphManager.loadGraphForArticle(index, short);
         }
     }
@@ -275,7 +293,7 @@ class ScrAntennaApp {
         if (!timelineProgress || !timelineDate || !this.shorts.length) return;
 
         // Calculate progress through the timeline
-        const progress = ((currentIndex + 1) / this.shorts.length) * 100;
+        const progress = ((currentIndex + 1) / this.dataLoader.getTotalShorts()) * 100;
         timelineProgress.style.width = `${progress}%`;
 
         // Get temporal context - Apple Photos style
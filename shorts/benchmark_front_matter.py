@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the front-matter codec over a synthetic vault.
+
+Compares the previous approach (read the whole note, pure-Python
+yaml.safe_load / yaml.dump) with front_matter.py for a cold vault scan and a
+write-back of every note.
+
+Usage: python benchmark_front_matter.py [--notes 10000] [--body-lines 200]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+import front_matter
+
+
+def build_vault(vault: Path, notes: int, body_lines: int):
+    """Write synthetic entity notes shaped like the real vault."""
+    body = "\n\n# Entity\n\n" + "".join(
+        f"- **[[2025-06-{(i % 28) + 1:02d}]]**: Mentioned in a news article about Scranton ({i})\n"
+        for i in range(body_lines)
+    )
+    for i in range(notes):
+        metadata = {
+            'name': f"Entity {i}",
+            'aliases': [f"Alias {i}", f"Other Name {i}"],
+            'tags': ['person', 'government', 'scranton'],
+            'entity_type': 'PERSON',
+            'confidence': 0.9,
+            'first_mentioned': '2025-06-25',
+            'mention_count': i % 40,
+            'search_patterns': [f"Entity.*{i}"],
+            'relationships': [{'target': f"[[Entity {i + 1}]]", 'type': 'WORKS_WITH', 'confidence': 0.7}],
+        }
+        path = vault / f"note-{i:05d}.md"
+        path.write_text("---\n" + yaml.dump(metadata, default_flow_style=False) + "---" + body, encoding='utf-8')
+
+
+def baseline_read(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    end_marker = content.find('---', 3)
+    return yaml.safe_load(content[3:end_marker].strip())
+
+
+def baseline_write(path: Path, metadata):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    end_marker = content.find('---', 3)
+    body = content[end_marker + 3:]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("---\n" + yaml.dump(metadata, default_flow_style=False) + "---" + body)
+
+
+def timed(label: str, func, paths):
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {elapsed / len(paths) * 1e6:8.0f} µs/note")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark front-matter parsing and write-back')
+    parser.add_argument('--notes', type=int, default=10000, help='Number of synthetic notes (default: 10000)')
+    parser.add_argument('--body-lines', type=int, default=200, help='Markdown body lines per note (default: 200)')
+    args = parser.parse_args()
+
+    vault = Path(tempfile.mkdtemp(prefix='vault-bench-'))
+    try:
+        print(f"📝 Building synthetic vault: {args.notes} notes, {args.body_lines} body lines each")
+        build_vault(vault, args.notes, args.body_lines)
+        paths = sorted(vault.glob("*.md"))
+        print(f"🔧 libyaml C loader/dumper available: {front_matter.libyaml_available}")
+
+        print("\nCold scan (parse front matter of every note):")
+        old_scan = timed("baseline full read", baseline_read, paths)
+        new_scan = timed("front_matter codec", front_matter.read_front_matter, paths)
+
+        print("\nWrite-back (bump mention_count on every note):")
+
+        def bump_baseline(path):
+            metadata = baseline_read(path)
+            metadata['mention_count'] += 1
+            baseline_write(path, metadata)
+
+        def bump_codec(path):
+            metadata = front_matter.read_front_matter(path)
+            metadata['mention_count'] += 1
+            front_matter.write_front_matter(path, metadata)
+
+        old_write = timed("baseline read/dump/write", bump_baseline, paths)
+        new_write = timed("front_matter codec", bump_codec, paths)
+
+        print(f"\n⚡ Scan speedup: {old_scan / new_scan:.1f}x, write-back speedup: {old_write / new_write:.1f}x")
+    finally:
+        shutil.rmtree(vault)
+
+
+if __name__ == "__main__":
+    main()
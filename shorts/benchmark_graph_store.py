@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the embedded graph store on a synthetic knowledge graph.
+
+Builds a graph with a skewed (power-law-like) entity popularity, the way a
+few entities such as Scranton dominate the real news graph, then times the
+load and every sample query shape.
+
+Usage: python benchmark_graph_store.py [--edges 1000000] [--entities 100000]
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+from pipeline import GraphStore
+
+ENTITY_TYPES = ['PERSON', 'LOCATION', 'ORGANIZATION', 'CONCEPT', 'EVENT']
+RELATIONSHIP_TYPES = ['LOCATED_IN', 'WORKS_FOR', 'MAYOR_OF', 'MENTIONED_WITH', 'ANNOUNCED', 'VISITED']
+SOURCES = ['WNEP', 'Times-Tribune', 'WBRE', 'Scranton Times', 'WVIA']
+
+
+def synthetic_articles(edges: int, entities: int, edges_per_article: int, seed: int = 42):
+    """Yield articles whose graphs add up to ``edges`` relationships."""
+    rng = random.Random(seed)
+    names = [f"Entity {i}" for i in range(entities)]
+    types = {name: ENTITY_TYPES[i % len(ENTITY_TYPES)] for i, name in enumerate(names)}
+    weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(entities)))
+    start = date(2025, 1, 1)
+
+    for i in range(edges // edges_per_article):
+        pairs = zip(rng.choices(names, cum_weights=weights, k=edges_per_article),
+                    rng.choices(names, cum_weights=weights, k=edges_per_article))
+        relationships = [{'from': a, 'type': rng.choice(RELATIONSHIP_TYPES), 'to': b} for a, b in pairs if a != b]
+        mentioned = {name for rel in relationships for name in (rel['from'], rel['to'])}
+        yield {
+            'title': f"Synthetic story {i}",
+            'url': f"https://example.com/synthetic/{i}",
+            'source': SOURCES[i % len(SOURCES)],
+            'publishedAt': f"{start + timedelta(days=i % 180)}T12:00:00Z",
+            'graph': {
+                'entities': [{'name': name, 'type': types[name], 'confidence': 0.8} for name in sorted(mentioned)],
+                'relationships': relationships,
+            },
+        }
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the embedded graph store')
+    parser.add_argument('--edges', type=int, default=1000000, help='Relationships to generate (default: 1000000)')
+    parser.add_argument('--entities', type=int, default=100000, help='Distinct entities (default: 100000)')
+    parser.add_argument('--edges-per-article', type=int, default=5, help='Relationships per article (default: 5)')
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='graph-bench-'))
+    try:
+        with GraphStore(str(workdir / "graph.db")) as store:
+            print(f"📝 Loading {args.edges} edges over {args.entities} entities")
+            start = time.perf_counter()
+            store.add_articles(synthetic_articles(args.edges, args.entities, args.edges_per_article))
+            print(f"  {'load':<34} {time.perf_counter() - start:10.1f} s   {store.count()}")
+
+            hub, leaf = "Entity 0", f"Entity {args.entities // 2}"
+            print("\nQueries:")
+            timed("1. most_mentioned", lambda: store.most_mentioned(10))
+            timed("2. neighbors (hub)", lambda: store.neighbors(hub))
+            timed("2. neighbors (leaf)", lambda: store.neighbors(leaf))
+            timed("3. source_stats", store.source_stats)
+            timed("4. find_paths (leaf -> leaf, depth 3)",
+                  lambda: store.find_paths(leaf, f"Entity {args.entities - 1}", max_depth=3))
+            timed("5. timeline (last 30 days)", lambda: store.timeline("2025-06-01", "2025-06-30"))
+            timed("6. top_by_degree", lambda: store.top_by_degree(10))
+            timed("7. communities", store.communities)
+            timed("8. multi_type_articles", lambda: store.multi_type_articles(5))
+            timed("9. recent_mentions (7 days)", lambda: store.recent_mentions(7, today="2025-06-29"))
+            timed("10. co_occurrences (hub)", lambda: store.co_occurrences(20, entity=hub))
+            timed("10. co_occurrences (last 7 days)",
+                  lambda: store.co_occurrences(20, start_date="2025-06-23", end_date="2025-06-29"))
+            timed("10. co_occurrences (all pairs)", lambda: store.co_occurrences(20))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Lookup indexes for resolving extracted entity names against the vault.
+
+FuzzyNameIndex shortlists names that share enough character bigrams with the
+query to possibly clear the similarity threshold, then scores only that
+shortlist with the same SequenceMatcher ratio the entity manager has always
+used, so matches are unchanged while lookups stop scanning the whole vault.
+
+SearchPatternIndex compiles every entity's ``search_patterns`` into one regex
+per entity type, so pattern resolution is a single match per lookup.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+
+def _bigrams(text: str) -> Counter:
+    """Character bigrams of text, padded so the first and last characters count."""
+    padded = f"\x02{text}\x03"
+    return Counter(padded[i:i + 2] for i in range(len(padded) - 1))
+
+
+class FuzzyNameIndex:
+    """Bigram blocking index over entity names and aliases.
+
+    A SequenceMatcher ratio above ``threshold`` bounds the edit distance
+    between two names, and by the q-gram lemma each edit destroys at most two
+    bigrams, which gives a minimum shared-bigram count for any candidate that
+    could still match. Only names meeting that bound (and the matching length
+    bound) are scored.
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self._names: List[Tuple[str, Any]] = []
+        self._seen = set()
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, entity: Any):
+        """Index a name (canonical or alias) for an entity."""
+        name = name.lower()
+        key = (id(entity), name)
+        if not name or key in self._seen:
+            return
+        self._seen.add(key)
+
+        name_id = len(self._names)
+        grams = _bigrams(name)
+        self._names.append((name, entity))
+        self._by_length[len(name)].append(name_id)
+        for gram, count in grams.items():
+            self._postings[gram].append((name_id, count))
+
+    def _length_window(self, length: int) -> range:
+        """Candidate lengths whose best possible ratio still exceeds the threshold."""
+        # ratio <= 2 * min / (la + lb), so lb must lie within this window
+        low = math.floor(length * self.threshold / (2 - self.threshold)) + 1
+        high = math.ceil(length * (2 - self.threshold) / self.threshold) - 1
+        return range(max(low, 1), high + 1)
+
+    def _required_shared(self, la: int, lb: int) -> int:
+        """Minimum shared bigrams for two names of these lengths to clear the threshold."""
+        total = la + lb
+        # ratio > t  =>  insert/delete distance < (1 - t) * total
+        max_edits = math.ceil((1 - self.threshold) * total) - 1
+        return max(la, lb) + 1 - 2 * max_edits
+
+    def candidates(self, query: str) -> List[int]:
+        """Ids of indexed names that pass the length and shared-bigram filters, in insertion order."""
+        query = query.lower()
+        grams = _bigrams(query)
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram, count in grams.items():
+            for name_id, name_count in self._postings.get(gram, ()):
+                shared[name_id] += min(count, name_count)
+
+        window = self._length_window(len(query))
+        selected = set()
+        for length in window:
+            required = self._required_shared(len(query), length)
+            if required <= 0:
+                selected.update(self._by_length.get(length, ()))
+        for name_id, count in shared.items():
+            length = len(self._names[name_id][0])
+            if length in window and count >= self._required_shared(len(query), length):
+                selected.add(name_id)
+
+        return sorted(selected)
+
+    def best_match(self, query: str, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """Return the entity whose name is most similar to query above the threshold.
+
+        Ties go to the earliest indexed name, as with a linear scan.
+        """
+        query = query.lower()
+        best_match = None
+        best_score = self.threshold
+
+        for name_id in self.candidates(query):
+            name, entity = self._names[name_id]
+            if accept and not accept(entity):
+                continue
+            matcher = SequenceMatcher(None, query, name)
+            # quick_ratio() is a cheap upper bound on ratio()
+            if matcher.quick_ratio() <= best_score:
+                continue
+            similarity = matcher.ratio()
+            if similarity > best_score:
+                best_score = similarity
+                best_match = entity
+
+        return best_match
+
+
+class SearchPatternIndex:
+    """Combined matcher for vault ``search_patterns``.
+
+    Each alternative is a lookahead over the whole name followed by an empty
+    named group, so ``match()`` at position 0 picks the first pattern (in
+    entity load order) that matches anywhere, exactly like searching each
+    pattern in turn. Invalid patterns are reported once when added.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Tuple[Any, str, List[str]]] = {}
+        self._compiled: Dict[str, Tuple[Optional[Pattern], List[Tuple[Pattern, Any]], List[Any]]] = {}
+        self.invalid: List[Tuple[str, str, str]] = []
+
+    def add(self, entity: Any, entity_type: str, patterns: List[str], label: str = ''):
+        """Register (or refresh) an entity's search patterns."""
+        valid = []
+        for pattern in patterns:
+            try:
+                re.compile(pattern, re.IGNORECASE)
+                valid.append(pattern)
+            except (re.error, TypeError) as e:
+                if not any(entry[:2] == (label, pattern) for entry in self.invalid):
+                    print(f"Invalid search pattern {pattern!r} for {label or 'entity'}: {e}")
+                    self.invalid.append((label, pattern, str(e)))
+
+        key = id(entity)
+        if key in self._entries and self._entries[key][1:] == (entity_type, valid):
+            return
+        self._entries[key] = (entity, entity_type, valid)
+        self._compiled.clear()
+
+    def _build(self, entity_type: str):
+        owners = []
+        patterns = []
+        for entity, owner_type, owner_patterns in self._entries.values():
+            if entity_type != 'UNKNOWN' and owner_type != entity_type:
+                continue
+            for pattern in owner_patterns:
+                owners.append(entity)
+                patterns.append(pattern)
+
+        ordered = [(re.compile(pattern, re.IGNORECASE), owner) for pattern, owner in zip(patterns, owners)]
+        combined = None
+        # Patterns with their own groups could have backreferences renumbered
+        # by combining, so those types keep the ordered per-pattern scan
+        if patterns and all(compiled.groups == 0 for compiled, _ in ordered):
+            alternatives = [f"(?=(?s:.*?)(?:{pattern}))(?P<p{n}>)" for n, pattern in enumerate(patterns)]
+            try:
+                combined = re.compile("|".join(alternatives), re.IGNORECASE)
+            except re.error:
+                combined = None
+
+        self._compiled[entity_type] = (combined, ordered, owners)
+
+    def match(self, name: str, entity_type: str) -> Optional[Any]:
+        """Return the entity owning the first search pattern that matches name."""
+        if entity_type not in self._compiled:
+            self._build(entity_type)
+        combined, ordered, owners = self._compiled[entity_type]
+
+        if combined is not None:
+            found = combined.match(name)
+            return owners[int(found.lastgroup[1:])] if found else None
+
+        for compiled, owner in ordered:
+            if compiled.search(name):
+                return owner
+        return None
@@ -7,8 +7,22 @@ Provides cost-effective alternatives to OpenAI for knowledge graph generation.
 import json
 import re
 import os
+import threading
 from typing import List, Dict, Optional
 
+from pipeline.tracing import span
+from svg_graph import render_svg_graph
+
+
+def ollama_model_available(model: str = "phi3:mini") -> bool:
+    """Check if Ollama is running and has ``model``, without loading anything else."""
+    try:
+        import ollama
+        ollama.show(model)
+        return True
+    except Exception:
+        return False
+
 
 class ProductionFreeLLMExtractor:
     """Production-ready free LLM entity/relationship extractor."""
@@ -25,12 +39,7 @@ class ProductionFreeLLMExtractor:
     
     def _check_ollama(self) -> bool:
         """Check if Ollama is available and model exists."""
-        try:
-            import ollama
-            ollama.show(self.ollama_model)
-            return True
-        except Exception:
-            return False
+        return ollama_model_available(self.ollama_model)
     
     def _check_huggingface(self) -> bool:
         """Check if HuggingFace transformers is available."""
@@ -93,7 +102,9 @@ class ProductionFreeLLMExtractor:
         # Try Ollama first (best for structured output)
         if self.ollama_available:
             try:
-                entities = self._ollama_extract_entities(text)
+                with span('extract.entities', category='extract', tier='ollama', model=self.ollama_model) as tier:
+                    entities = self._ollama_extract_entities(text)
+                    tier.set(entities=len(entities))
                 if entities:
                     return entities
             except Exception as e:
@@ -101,18 +112,24 @@ class ProductionFreeLLMExtractor:
         
         # Try HuggingFace Phi-3 or NER (good accuracy)
         if self.hf_available and self.hf_pipeline:
+            hf_method = getattr(self, 'hf_method', 'ner')
             try:
-                if hasattr(self, 'hf_method') and self.hf_method == "phi3":
-                    entities = self._phi3_extract_entities(text)
-                else:
-                    entities = self._hf_extract_entities(text)
+                with span('extract.entities', category='extract', tier='huggingface', model=hf_method) as tier:
+                    if hf_method == "phi3":
+                        entities = self._phi3_extract_entities(text)
+                    else:
+                        entities = self._hf_extract_entities(text)
+                    tier.set(entities=len(entities))
                 if entities:
                     return entities
             except Exception as e:
                 print(f"HuggingFace extraction failed: {e}")
         
         # Fallback to rule-based extraction
-        return self._rule_based_entities(text)
+        with span('extract.entities', category='extract', tier='rule_based') as tier:
+            entities = self._rule_based_entities(text)
+            tier.set(entities=len(entities))
+        return entities
     
     def _ollama_extract_entities(self, text: str) -> List[Dict]:
         """Extract entities using Ollama."""
@@ -374,14 +391,19 @@ Examples:
         # Try Ollama for relationship extraction
         if self.ollama_available and entities:
             try:
-                relationships = self._ollama_extract_relationships(text, entities)
+                with span('extract.relationships', category='extract', tier='ollama', model=self.ollama_model) as tier:
+                    relationships = self._ollama_extract_relationships(text, entities)
+                    tier.set(relationships=len(relationships))
                 if relationships:
                     return relationships
             except Exception as e:
                 print(f"Ollama relationship extraction failed: {e}")
         
         # Fallback to rule-based relationships
-        return self._rule_based_relationships(text, entities)
+        with span('extract.relationships', category='extract', tier='rule_based') as tier:
+            relationships = self._rule_based_relationships(text, entities)
+            tier.set(relationships=len(relationships))
+        return relationships
     
     def _ollama_extract_relationships(self, text: str, entities: List[Dict]) -> List[Dict]:
         """Extract relationships using Ollama."""
@@ -731,55 +753,7 @@ JSON:"""
     
     def _generate_svg_graph(self, entities: List[Dict], relationships: List[Dict], index: int) -> str:
         """Generate SVG visualization of the knowledge graph."""
-        if not entities:
-            return '<svg width="300" height="200"><text x="150" y="100" text-anchor="middle" fill="white">No entities found</text></svg>'
-        
-        colors = {
-            'PERSON': '#FF6B6B',
-            'ORGANIZATION': '#4ECDC4',
-            'LOCATION': '#45B7D1',
-            'DATE': '#FFA726',
-            'EVENT': '#AB47BC',
-            'WORK': '#9C27B0',
-            'OTHER': '#78909C'
-        }
-        
-        svg = '<svg width="300" height="200" viewBox="0 0 300 200" class="graph-svg">'
-        
-        # Draw entities as circles
-        for i, entity in enumerate(entities[:6]):  # Limit to 6 for layout
-            x = 50 + (i % 3) * 100
-            y = 50 + (i // 3) * 60
-            color = colors.get(entity['type'], '#888')
-            
-            svg += f'<circle cx="{x}" cy="{y}" r="20" fill="{color}" stroke="white" stroke-width="2"/>'
-            svg += f'<text x="{x}" y="{y-25}" text-anchor="middle" fill="white" font-size="10" font-weight="bold">{entity["name"][:8]}</text>'
-            svg += f'<text x="{x}" y="{y+35}" text-anchor="middle" fill="white" font-size="8">{entity["type"]}</text>'
-        
-        # Draw relationships as lines
-        for rel in relationships:
-            from_entity = next((e for e in entities if e['name'] == rel['from']), None)
-            to_entity = next((e for e in entities if e['name'] == rel['to']), None)
-            
-            if from_entity and to_entity:
-                from_index = entities.index(from_entity)
-                to_index = entities.index(to_entity)
-                
-                if from_index < 6 and to_index < 6:  # Only draw if both visible
-                    x1 = 50 + (from_index % 3) * 100
-                    y1 = 50 + (from_index // 3) * 60
-                    x2 = 50 + (to_index % 3) * 100
-                    y2 = 50 + (to_index // 3) * 60
-                    
-                    svg += f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="white" stroke-width="1" opacity="0.7"/>'
-                    
-                    # Add relationship label
-                    mid_x = (x1 + x2) // 2
-                    mid_y = (y1 + y2) // 2
-                    svg += f'<text x="{mid_x}" y="{mid_y}" text-anchor="middle" fill="white" font-size="8">{rel["type"]}</text>'
-        
-        svg += '</svg>'
-        return svg
+        return render_svg_graph(entities, relationships)
     
     def _calculate_confidence(self, entities: List[Dict]) -> float:
         """Calculate overall confidence score."""
@@ -810,23 +784,73 @@ JSON:"""
         }
 
 
+# One extractor per thread, so models load once per worker rather than per article
+_worker_state = threading.local()
+
+# The vault manager is shared per process and not thread-safe
+_vault_lock = threading.Lock()
+
+# Set in process-pool workers, whose graphs the parent resolves against the vault
+_defer_vault = False
+
+
+def get_extractor() -> ProductionFreeLLMExtractor:
+    """Return this thread's extractor, creating (and loading models) on first use."""
+    extractor = getattr(_worker_state, 'extractor', None)
+    if extractor is None:
+        extractor = _worker_state.extractor = ProductionFreeLLMExtractor()
+    return extractor
+
+
+def init_extraction_worker(resolve_vault: bool = True):
+    """Pool initializer: load the extraction models and the vault index up front.
+    
+    With ``resolve_vault=False`` graphs are returned marked ``vault_pending``
+    for the caller to pass to integrate_graph_with_vault(), and the vault is
+    not loaded here.
+    """
+    global _defer_vault
+    _defer_vault = not resolve_vault
+    get_extractor()
+    if not resolve_vault:
+        return
+    try:
+        from obsidian_entity_manager import get_entity_manager
+        with _vault_lock:
+            get_entity_manager()
+    except ImportError:
+        pass
+
+
 # Integration function for generate_shorts.py
 def create_free_llm_graph_data(article: Dict, index: int = 0) -> Dict:
     """
     Drop-in replacement for generate_article_graph() in generate_shorts.py
     Enhanced with Obsidian entity vault integration.
     """
-    extractor = ProductionFreeLLMExtractor()
-    result = extractor.extract_for_article(article, index)
+    result = get_extractor().extract_for_article(article, index)
+    if _defer_vault:
+        result['vault_pending'] = True
+        return result
+    return integrate_graph_with_vault(result, article)
+
+
+def integrate_graph_with_vault(result: Dict, article: Dict) -> Dict:
+    """Resolve an extracted graph's entities against the Obsidian entity vault.
     
-    # Integrate with Obsidian entity vault
+    Updates and returns ``result``; if the vault is unavailable or fails,
+    the standard extraction is kept. Vault access is serialized across
+    threads.
+    """
     try:
         from obsidian_entity_manager import integrate_with_obsidian
         
-        obsidian_result = integrate_with_obsidian(
-            result['entities'], 
-            result['relationships']
-        )
+        with _vault_lock, span('vault.resolve', category='vault', article=article.get('url', ''),
+                               entities=len(result['entities'])):
+            obsidian_result = integrate_with_obsidian(
+                result['entities'], 
+                result['relationships']
+            )
         
         # Update result with resolved entities
         result['entities'] = obsidian_result['resolved_entities']
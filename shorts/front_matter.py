@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Front-matter codec for Obsidian entity notes.
+
+Reads only the YAML header of a note (up to the closing ``---``) and uses the
+libyaml C loader and dumper when PyYAML was built with them. Rewrites stream
+the markdown body from the original file, so it is preserved byte-for-byte
+without being loaded.
+"""
+
+import io
+from pathlib import Path
+from typing import IO, Dict, Optional, Tuple
+
+import yaml
+
+from pipeline.serialization import atomic_write_chunks
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    libyaml_available = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    libyaml_available = False
+
+DELIMITER = b'---'
+COPY_CHUNK_SIZE = 65536
+
+
+def _read_header(handle: IO[bytes]) -> Tuple[Optional[str], int]:
+    """Read the front-matter lines of an open note.
+
+    Returns:
+        (front matter text, offset where the body starts), or (None, 0) if the
+        note has no front matter
+    """
+    first_line = handle.readline()
+    if not first_line.startswith(DELIMITER):
+        return None, 0
+
+    lines = [first_line[len(DELIMITER):]]
+    while True:
+        offset = handle.tell()
+        line = handle.readline()
+        if not line:
+            return None, 0
+        if line.startswith(DELIMITER):
+            # The body is everything after the closing delimiter
+            return b''.join(lines).decode('utf-8').strip(), offset + len(DELIMITER)
+        lines.append(line)
+
+
+def load_yaml(text: str) -> Optional[Dict]:
+    """Parse a front-matter block."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def dump_front_matter(front_matter: Dict) -> str:
+    """Serialize front matter, including the surrounding delimiters."""
+    return "---\n" + yaml.dump(front_matter, Dumper=SafeDumper, default_flow_style=False) + "---"
+
+
+def read_front_matter(file_path: Path) -> Optional[Dict]:
+    """Parse a note's front matter without reading its body."""
+    with open(file_path, 'rb') as handle:
+        text, _ = _read_header(handle)
+    return load_yaml(text) if text is not None else None
+
+
+def split_front_matter(content: str) -> Tuple[Optional[Dict], str]:
+    """Split note text into (front matter, body); front matter is None if absent."""
+    text, offset = _read_header(io.BytesIO(content.encode('utf-8')))
+    if text is None:
+        return None, content
+    return load_yaml(text), content.encode('utf-8')[offset:].decode('utf-8')
+
+
+def write_front_matter(file_path: Path, front_matter: Dict) -> bool:
+    """Atomically replace a note's front matter, streaming the body unchanged.
+
+    Returns:
+        False if the note has no front matter to replace
+    """
+    with open(file_path, 'rb') as source:
+        text, offset = _read_header(source)
+        if text is None:
+            return False
+        source.seek(offset)
+
+        def chunks():
+            yield dump_front_matter(front_matter).encode('utf-8')
+            yield from iter(lambda: source.read(COPY_CHUNK_SIZE), b'')
+
+        atomic_write_chunks(file_path, chunks())
+    return True
@@ -7,9 +7,17 @@ Creates condensed, visual-friendly versions for the shorts player.
 import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from graph_layout import add_graph_layouts
+from pipeline.serialization import write_json
+from pipeline.shorts_feed import write_shorts_feed
+from pipeline.tracing import (drain_events, enable_tracing, finish_tracing, merge_events, span,
+                              start_tracing, tracing_enabled)
+from svg_graph import render_svg_graph
 
 # Try to import OpenAI for LLM-based distillation
 try:
@@ -21,6 +29,15 @@ except ImportError:
     llm_available = False
     client = None
 
+# LLM distillation settings; both are part of the shorts build manifest
+DISTILL_MODEL = "gpt-3.5-turbo"
+DISTILL_PROMPT = "Extract the core facts from news text into direct, precise statements. Use simple subject-verb-object format. Avoid referring to 'the article' or 'the story'. State facts directly as if reporting them yourself. Keep it under 80 characters. Be specific about WHO did WHAT."
+
+# Modules whose code determines the extracted graphs
+EXTRACTOR_SOURCES = ('free_llm_extractor.py', 'svg_graph.py', 'obsidian_entity_manager.py', 'graph_layout.py',
+                     'entity_index.py', 'front_matter.py', 'vault_writer.py', 'vault_index.py')
+VAULT_PATH = Path("../entities")
+
 def clean_text(text: str, truncate: bool = False) -> str:
     """Clean text for shorts display."""
     if not text:
@@ -56,21 +73,22 @@ def create_distilled_version_llm(text: str) -> str:
         return ""
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "Extract the core facts from news text into direct, precise statements. Use simple subject-verb-object format. Avoid referring to 'the article' or 'the story'. State facts directly as if reporting them yourself. Keep it under 80 characters. Be specific about WHO did WHAT."
-                },
-                {
-                    "role": "user", 
-                    "content": f"Distill this news text: {text}"
-                }
-            ],
-            max_tokens=30,
-            temperature=0.1
-        )
+        with span('distill.llm', category='distill', model=DISTILL_MODEL, chars=len(text)):
+            response = client.chat.completions.create(
+                model=DISTILL_MODEL,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": DISTILL_PROMPT
+                    },
+                    {
+                        "role": "user", 
+                        "content": f"Distill this news text: {text}"
+                    }
+                ],
+                max_tokens=30,
+                temperature=0.1
+            )
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"LLM distillation failed: {e}")
@@ -97,10 +115,11 @@ def create_distilled_version_fallback(text: str) -> str:
 
 def create_distilled_version(text: str) -> str:
     """Create distilled version using best available method."""
-    if llm_available:
-        return create_distilled_version_llm(text)
-    else:
-        return create_distilled_version_fallback(text)
+    with span('distill', category='distill', method='llm' if llm_available else 'fallback', chars=len(text or '')):
+        if llm_available:
+            return create_distilled_version_llm(text)
+        else:
+            return create_distilled_version_fallback(text)
 
 def extract_simple_entities(text: str) -> List[Dict]:
     """Extract meaningful entities with focus on people, places, organizations, and events."""
@@ -308,60 +327,15 @@ def generate_article_graph(article: Dict, index: int) -> Dict:
         return {
             "entities": entities,
             "relationships": relationships,
-            "svg": generate_svg_graph(entities, relationships, index)
+            "svg": render_svg_graph(entities, relationships)
         }
 
-def generate_svg_graph(entities: List[Dict], relationships: List[Dict], index: int) -> str:
-    """Generate SVG representation of the graph."""
-    if not entities:
-        return '<svg width="300" height="200"><text x="150" y="100" text-anchor="middle" fill="white">No entities found</text></svg>'
-    
-    colors = {
-        'Person': '#FF6B6B',
-        'Organization': '#4ECDC4', 
-        'Location': '#45B7D1',
-        'Work': '#9C27B0',
-        'Event': '#FF9800'
-    }
-    
-    svg = '<svg width="300" height="200" viewBox="0 0 300 200" class="graph-svg">'
+def create_short_from_article(article: Dict, index: int, graph_data: Optional[Dict] = None) -> Dict:
+    """Convert a news article into a short format.
     
-    # Draw entities as circles
-    for i, entity in enumerate(entities):
-        x = 50 + (i % 3) * 100
-        y = 50 + (i // 3) * 60
-        color = colors.get(entity['type'], '#888')
-        
-        svg += f'<circle cx="{x}" cy="{y}" r="20" fill="{color}" stroke="white" stroke-width="2"/>'
-        svg += f'<text x="{x}" y="{y-25}" text-anchor="middle" fill="white" font-size="10" font-weight="bold">{entity["name"][:8]}</text>'
-        svg += f'<text x="{x}" y="{y+35}" text-anchor="middle" fill="white" font-size="8">{entity["type"]}</text>'
-    
-    # Draw relationships as lines
-    for rel in relationships:
-        from_entity = next((e for e in entities if e['name'] == rel['from']), None)
-        to_entity = next((e for e in entities if e['name'] == rel['to']), None)
-        
-        if from_entity and to_entity:
-            from_index = entities.index(from_entity)
-            to_index = entities.index(to_entity)
-            
-            x1 = 50 + (from_index % 3) * 100
-            y1 = 50 + (from_index // 3) * 60
-            x2 = 50 + (to_index % 3) * 100
-            y2 = 50 + (to_index // 3) * 60
-            
-            svg += f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="white" stroke-width="1" opacity="0.7"/>'
-            
-            # Add relationship label
-            mid_x = (x1 + x2) // 2
-            mid_y = (y1 + y2) // 2
-            svg += f'<text x="{mid_x}" y="{mid_y}" text-anchor="middle" fill="white" font-size="8">{rel["type"]}</text>'
-    
-    svg += '</svg>'
-    return svg
-
-def create_short_from_article(article: Dict, index: int) -> Dict:
-    """Convert a news article into a short format."""
+    ``graph_data`` can be passed in when extraction already ran upstream
+    (e.g. in the streaming pipeline); otherwise it is generated here.
+    """
     
     # Extract key information - never truncate distilled content
     title = clean_text(article.get('title', ''), truncate=True)
@@ -381,7 +355,8 @@ def create_short_from_article(article: Dict, index: int) -> Dict:
         content_distilled = create_distilled_version(content)
     
     # Generate inline graph data for this article
-    graph_data = generate_article_graph(article, index)
+    if graph_data is None:
+        graph_data = generate_article_graph(article, index)
     
     short = {
         "id": f"short_{index}",
@@ -419,8 +394,111 @@ def get_background_gradient(index: int) -> str:
     ]
     return gradients[index % len(gradients)]
 
-def generate_shorts_from_news(news_file: Path, max_shorts: int = 15) -> Dict:
-    """Generate shorts data from news file."""
+def _init_short_worker(trace: bool = False, resolve_vault: bool = True):
+    """Pool initializer: load extraction models (and the vault index, if resolving here) once per worker."""
+    if trace:
+        enable_tracing()
+    try:
+        from free_llm_extractor import init_extraction_worker
+    except ImportError:
+        return
+    init_extraction_worker(resolve_vault)
+
+def _build_short(task: Tuple[int, Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+    """Create one short, returning ``(short, None)`` or ``(None, error)``."""
+    index, article = task
+    try:
+        with span('article', category='article', index=index, article=article.get('url', '')):
+            return create_short_from_article(article, index), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _build_short_in_process(task: Tuple[int, Dict]) -> Tuple[Tuple[Optional[Dict], Optional[str]], List[Dict]]:
+    """Create one short in a worker process, returning it with the trace spans recorded for it."""
+    return _build_short(task), drain_events()
+
+def _resolve_vault_in_order(tasks: List[Tuple[int, Dict]], results: List[Tuple[Optional[Dict], Optional[str]]]):
+    """Resolve graphs extracted by worker processes against the vault, in article order.
+    
+    Each worker process would load its own copy of the vault, so an entity
+    or alias created for one article would be unknown to the others and
+    created again. The parent's single manager sees every earlier article,
+    as in a serial run.
+    """
+    pending = [(article, short['graph']) for (_, article), (short, _) in zip(tasks, results)
+               if short and short['graph'].pop('vault_pending', False)]
+    if not pending:
+        return
+    from free_llm_extractor import integrate_graph_with_vault
+    for article, graph in pending:
+        integrate_graph_with_vault(graph, article)
+
+def select_executor_kind() -> str:
+    """Pick threads or processes for parallel short generation.
+    
+    The LLM tiers (OpenAI distillation, Ollama extraction) wait on the
+    network, so threads are enough; the rule-based and local-model tiers
+    are CPU-bound and need processes to use more than one core.
+    
+    The choice holds for the whole run: when an LLM tier is reachable, any
+    article that falls back to a CPU-bound tier still runs on a thread, so
+    those fallbacks share one core. Pass ``executor='process'`` to trade the
+    LLM tiers' cheap threads for parallel fallbacks.
+    """
+    if llm_available:
+        return 'thread'
+    try:
+        from free_llm_extractor import ollama_model_available
+    except ImportError:
+        return 'process'
+    return 'thread' if ollama_model_available() else 'process'
+
+def build_shorts(articles: List[Dict], workers: int = 1, executor: str = 'auto') -> List[Dict]:
+    """Create shorts for articles, in article order, optionally in parallel.
+    
+    Args:
+        articles: Articles to turn into shorts; ids follow this order
+        workers: Number of parallel workers (1 runs in this thread)
+        executor: 'thread', 'process' or 'auto' (see select_executor_kind)
+    
+    Returns:
+        Shorts in article order; an article that fails is reported and
+        skipped without affecting the others
+    """
+    tasks = list(enumerate(articles))
+    
+    if workers <= 1 or len(tasks) <= 1:
+        results = [_build_short(task) for task in tasks]
+    else:
+        kind = select_executor_kind() if executor == 'auto' else executor
+        print(f"⚡ Generating shorts with {workers} {kind} workers")
+        if kind == 'process':
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_short_worker,
+                                     initargs=(tracing_enabled(), False)) as pool:
+                # map() yields in submission order regardless of completion order
+                results = []
+                for result, events in pool.map(_build_short_in_process, tasks):
+                    merge_events(events)
+                    results.append(result)
+            _resolve_vault_in_order(tasks, results)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, initializer=_init_short_worker) as pool:
+                results = list(pool.map(_build_short, tasks))
+    
+    shorts = []
+    for (index, article), (short, error) in zip(tasks, results):
+        if error:
+            print(f"⚠️ Skipping article {index} ({article.get('title', '')[:50]}): {error}")
+        else:
+            shorts.append(short)
+    return shorts
+
+def generate_shorts_from_news(news_file: Path, max_shorts: int = 15, workers: int = 1,
+                              executor: str = 'auto') -> Dict:
+    """Generate shorts data from news file.
+    
+    ``workers`` > 1 builds the shorts in parallel (see build_shorts).
+    """
     
     print(f"Loading news from: {news_file}")
     
@@ -441,65 +519,92 @@ def generate_shorts_from_news(news_file: Path, max_shorts: int = 15) -> Dict:
     
     # Filter and sort articles for best shorts
     # Prioritize articles with both title and description
-    good_articles = []
-    for article in articles[:max_shorts]:
-        if (article.get('title') and 
-            article.get('description') and 
-            len(article.get('title', '')) > 10):
-            good_articles.append(article)
+    good_articles = [article for article in articles[:max_shorts] if is_good_short_article(article)]
     
     print(f"Selected {len(good_articles)} articles for shorts")
     
     # Generate shorts
-    shorts = []
-    for i, article in enumerate(good_articles):
-        short = create_short_from_article(article, i)
-        shorts.append(short)
+    shorts = build_shorts(good_articles, workers, executor)
     
-    # Create shorts data structure
-    shorts_data = {
+    return build_shorts_data(shorts, news_file, news_data.get('has_svo', False))
+
+def is_good_short_article(article: Dict) -> bool:
+    """Check if an article has enough text to make a good short."""
+    return bool(article.get('title') and 
+                article.get('description') and 
+                len(article.get('title', '')) > 10)
+
+def build_shorts_data(shorts: List[Dict], source_file: Path, has_svo: bool = False) -> Dict:
+    """Wrap generated shorts in the shorts_data.json structure."""
+    return {
         "generated_at": datetime.now().isoformat(),
-        "source_file": str(news_file),
+        "source_file": str(source_file),
         "total_shorts": len(shorts),
         "total_duration": len(shorts) * 8,  # seconds
-        "has_svo": news_data.get('has_svo', False),
+        "has_svo": has_svo,
         "shorts": shorts
     }
-    
-    return shorts_data
 
-def check_if_shorts_current(news_file: Path) -> bool:
-    """Check if shorts data is current with the news file."""
-    shorts_file = Path("shorts_data.json")
+def vault_fingerprint(vault_path: Optional[Path] = None) -> str:
+    """Fingerprint of the entity vault as entity resolution sees it (see VaultIndex.fingerprint)."""
+    vault_path = vault_path or VAULT_PATH
+    if not vault_path.exists():
+        return "none"
+    from front_matter import read_front_matter
+    from vault_index import VaultIndex
+    
+    def parse(file_path: Path) -> Optional[Dict]:
+        try:
+            return read_front_matter(file_path)
+        except Exception:
+            return None
+    
+    return VaultIndex(vault_path, parse).fingerprint()
+
+def shorts_build_inputs(news_file: Path, max_shorts: int = 15) -> Dict[str, str]:
+    """Digests of everything shorts_data.json is built from, for the build manifest."""
+    from pipeline.build_manifest import digest_files, digest_text
+    from pipeline.dag import file_digest
+    
+    here = Path(__file__).resolve().parent
+    return {
+        "news_file": file_digest(news_file),
+        "generator": file_digest(here / "generate_shorts.py"),
+        "extractor": digest_files(here / name for name in EXTRACTOR_SOURCES),
+        "prompts": digest_text(DISTILL_MODEL, DISTILL_PROMPT) if llm_available else "fallback",
+        "vault": vault_fingerprint(),
+        "config": f"max_shorts={max_shorts}"
+    }
+
+def check_if_shorts_current(news_file: Path, output_file: Path = Path("shorts_data.json")) -> Tuple[bool, str]:
+    """Check shorts data against its build manifest.
     
-    if not shorts_file.exists():
-        return False
+    Returns:
+        ``(current, reason)``; the reason names what changed when a rebuild
+        is needed
+    """
+    from pipeline.build_manifest import BuildManifest
     
-    try:
-        with open(shorts_file, 'r') as f:
-            shorts_data = json.load(f)
-        
-        # Check if source file matches and is recent
-        source_file = shorts_data.get('source_file', '')
-        if str(news_file) in source_file:
-            # Check if generated recently (within last hour)
-            generated_at = shorts_data.get('generated_at', '')
-            if generated_at:
-                from datetime import datetime, timedelta
-                gen_time = datetime.fromisoformat(generated_at)
-                if datetime.now() - gen_time < timedelta(hours=1):
-                    return True
-        
-        return False
-    except:
-        return False
+    return BuildManifest(output_file).check(shorts_build_inputs(news_file))
 
 def main():
     """Main function to generate shorts."""
-    import sys
-    
-    # Check for force flag
-    force_regenerate = '--force' in sys.argv
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate shorts data from the latest news file')
+    parser.add_argument('--force', action='store_true', help='Regenerate even if shorts are current')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel workers for article processing (0: one per CPU)')
+    parser.add_argument('--executor', choices=['auto', 'thread', 'process'], default='auto',
+                        help='Worker type for the whole run (default: auto, threads when an LLM tier is '
+                             'reachable, else processes; CPU-bound fallbacks under threads share one core)')
+    parser.add_argument('--trace', type=Path, metavar='FILE',
+                        help='Write a Chrome trace of generation stages to FILE (or set SCRANTENNA_TRACE)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Also import new daily files into the SQLite article archive')
+    args = parser.parse_args()
+    force_regenerate = args.force
+    workers = args.workers or os.cpu_count() or 1
     
     # Find the latest news file
     data_dir = Path("../data/daily")
@@ -507,33 +612,91 @@ def main():
         print(f"Data directory not found: {data_dir}")
         return
     
-    news_files = sorted(data_dir.glob("scranton_news_*.json"), reverse=True)
-    if not news_files:
+    from pipeline import ArticleArchive, NewsLoader
+    
+    try:
+        latest_file = NewsLoader(str(data_dir)).latest_file()
+    except FileNotFoundError:
         print("No news files found")
         return
     
-    latest_file = news_files[0]
+    if args.archive:
+        with ArticleArchive() as archive:
+            imported = archive.sync(data_dir)
+            print(f"🗄️ Archived {imported} new or changed articles ({archive.count()} total)")
     
     # Check if shorts are already current (unless forced)
-    if not force_regenerate and check_if_shorts_current(latest_file):
-        print(f"✓ Shorts data is current for {latest_file.name}")
+    current, reason = check_if_shorts_current(latest_file)
+    if current and not force_regenerate:
+        print(f"✓ Shorts data is current for {latest_file.name}: {reason}")
         print("🔄 Use --force to regenerate anyway")
         return
+    print(f"🔄 Rebuilding shorts: {'--force' if force_regenerate else reason}")
+    
+    # Digest inputs before building, so edits made during the run trigger the next one
+    build_inputs = shorts_build_inputs(latest_file)
     
     # Generate shorts data
-    shorts_data = generate_shorts_from_news(latest_file)
+    trace_file = start_tracing(args.trace)
+    try:
+        shorts_data = generate_shorts_from_news(latest_file, workers=workers, executor=args.executor)
+        write_shorts_outputs(shorts_data, build_inputs=build_inputs)
+    finally:
+        finish_tracing(trace_file)
+
+def write_shorts_outputs(shorts_data: Dict, output_file: Path = Path("shorts_data.json"),
+                         build_inputs: Optional[Dict[str, str]] = None) -> Path:
+    """Write shorts_data.json and everything derived from it.
+    
+    Flushes queued vault updates, adds graph layouts, then writes the shorts
+    data, the chunked feed, the local graph store and the player launcher.
+    With ``build_inputs`` (see shorts_build_inputs) the build manifest is
+    written too, recording the vault as this build left it: entities it
+    created are already accounted for in the shorts.
+    """
+    from pipeline import GraphStore
+    from pipeline.build_manifest import BuildManifest
+    
+    flush_vault_updates()
+    
+    # Precomputed graph layouts so the player can skip physics
+    laid_out = add_graph_layouts(shorts_data['shorts'])
     
     # Save shorts data
-    output_file = Path("shorts_data.json")
-    with open(output_file, 'w') as f:
-        json.dump(shorts_data, f, indent=2)
+    write_json(output_file, shorts_data, compress=True)
+    if build_inputs is not None:
+        BuildManifest(output_file).write(dict(build_inputs, vault=vault_fingerprint()))
+    
+    # Chunked feed for lazy loading in the web player
+    manifest_path = write_shorts_feed(shorts_data, output_file.parent / "shorts_feed")
+    
+    # Local graph store for routine analytics without Neo4j
+    with GraphStore() as graph_store:
+        added = graph_store.add_articles(shorts_data['shorts'])
     
     print(f"Generated {shorts_data['total_shorts']} shorts")
     print(f"Total duration: {shorts_data['total_duration']} seconds")
     print(f"Saved to: {output_file}")
+    print(f"Chunked feed: {manifest_path}")
+    print(f"Graph store: {added} new articles in {graph_store.db_path}")
+    print(f"Graph layouts: {laid_out} precomputed")
     
     # Generate a simple player launcher
     create_player_launcher()
+    return output_file
+
+def flush_vault_updates():
+    """Write entity updates queued by the Obsidian integration during this run."""
+    try:
+        from obsidian_entity_manager import flush_entity_managers
+    except ImportError:
+        return
+    
+    with span('vault.flush', category='vault') as flush_span:
+        updated = flush_entity_managers()
+        flush_span.set(notes=updated)
+    if updated:
+        print(f"🏛️ Updated {updated} entity notes in the vault")
 
 def create_player_launcher():
     """Create a simple launcher script."""
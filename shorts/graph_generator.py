@@ -4,12 +4,26 @@ Generate knowledge graphs from news articles using GraphViz.
 Creates Neo4j-style visual representations of entities and relationships.
 """
 
+import hashlib
 import json
 import re
+import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
-import graphviz
+from typing import Dict, Iterable, List, Optional, Tuple, Set
+
+from graph_layout import add_knowledge_graph_positions
+from graph_render import GraphRenderer
+from neo4j_export import cypher_string
+from pipeline.article_archive import date_from_filename
+from pipeline.graph_tiles import write_graph_tiles
+from pipeline.serialization import atomic_write_bytes, write_json
+
+try:
+    import graphviz
+    graphviz_available = True
+except ImportError:
+    graphviz_available = False
 
 # Try to load SpaCy model
 spacy_available = False
@@ -54,11 +68,92 @@ RELATIONSHIP_PATTERNS = [
     (r"(\w+(?:\s+\w+)*)\s+(?:mailed|sent)", "SENT")
 ]
 
+# Articles already merged into the cumulative graph, kept out of the web-facing JSON
+MERGE_STATE_FILE = "merge_state.json"
+
+def stable_entity_id(name: str) -> str:
+    """Entity id derived from the normalized name, identical across runs."""
+    return "entity_" + hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+
+
+def article_key(article: Dict) -> str:
+    """Short hash identifying an article across daily files."""
+    key = article.get('url') or f"{article.get('title', '')}\n{article.get('description', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _touch(record: Dict, seen_date: Optional[str]):
+    """Count one more mention and widen the first/last-seen dates."""
+    record['mention_count'] = record.get('mention_count', 0) + 1
+    if seen_date:
+        record['first_seen'] = min(filter(None, (record.get('first_seen'), seen_date)))
+        record['last_seen'] = max(filter(None, (record.get('last_seen'), seen_date)))
+
+
 class NewsGraphGenerator:
     def __init__(self):
         self.entities = {}
         self.relationships = []
-        self.entity_counter = 0
+        self._relationship_index = {}
+        self.merged_articles: Set[str] = set()
+        # Merged since loading; dropped again on load if the graph they went into was never saved
+        self.added_articles: Set[str] = set()
+        self.days: Dict[str, int] = {}
+    
+    @classmethod
+    def from_graph_data(cls, data: Dict) -> 'NewsGraphGenerator':
+        """Resume from a saved knowledge_graph.json.
+        
+        Graphs saved before ids were content-derived (``PERSON_0``...) are
+        migrated to stable ids on load.
+        """
+        graph_gen = cls()
+        id_map = {}
+        for name, entity in data.get('entities', {}).items():
+            stable_id = stable_entity_id(name)
+            id_map[entity['id']] = stable_id
+            graph_gen.entities[name] = dict(entity, id=stable_id)
+        
+        for rel in data.get('relationships', []):
+            rel = dict(rel, subject=id_map.get(rel['subject'], rel['subject']),
+                       object=id_map.get(rel['object'], rel['object']))
+            key = (rel['subject'], rel['relationship'], rel['object'])
+            if key in graph_gen._relationship_index:
+                existing = graph_gen._relationship_index[key]
+                existing['mention_count'] = existing.get('mention_count', 1) + rel.get('mention_count', 1)
+            else:
+                graph_gen._relationship_index[key] = rel
+                graph_gen.relationships.append(rel)
+        
+        # Graphs saved before the merge state had its own file carry it inline
+        graph_gen.merged_articles = set(data.get('merged_articles', []))
+        graph_gen.days = dict(data.get('days', {}))
+        return graph_gen
+    
+    @classmethod
+    def load(cls, json_path: Path) -> 'NewsGraphGenerator':
+        """Load a saved graph and its merge state, or start an empty one if none exists yet.
+        
+        The merge state is written before the graph. If a run stopped in
+        between, the state names a graph that was never saved, and the
+        articles that run added are left out so they are merged again.
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return cls()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        graph_gen = cls.from_graph_data(data)
+        
+        state_path = json_path.with_name(MERGE_STATE_FILE)
+        if state_path.exists():
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            merged = set(state.get('merged_articles', []))
+            if state.get('graph_generated_at') != data.get('generated_at'):
+                merged -= set(state.get('added_articles', []))
+            graph_gen.merged_articles.update(merged)
+        return graph_gen
     
     def extract_entities(self, text: str) -> List[Tuple[str, str, str]]:
         """Extract entities from text using SpaCy or fallback method."""
@@ -142,28 +237,32 @@ class NewsGraphGenerator:
     def add_entity(self, name: str, entity_type: str) -> str:
         """Add entity to graph and return unique ID."""
         clean_name = name.strip().title()
-        entity_id = f"{entity_type}_{self.entity_counter}"
         
         if clean_name not in self.entities:
             self.entities[clean_name] = {
-                "id": entity_id,
+                "id": stable_entity_id(clean_name),
                 "type": entity_type,
                 "label": clean_name,
-                "properties": ENTITY_TYPES.get(entity_type, ENTITY_TYPES["PERSON"])
+                "properties": ENTITY_TYPES.get(entity_type, ENTITY_TYPES["PERSON"]),
+                "mention_count": 0
             }
-            self.entity_counter += 1
         
         return self.entities[clean_name]["id"]
     
-    def add_relationship(self, subject: str, rel_type: str, obj: str):
-        """Add relationship between entities."""
-        self.relationships.append({
-            "subject": subject,
-            "relationship": rel_type,
-            "object": obj
-        })
+    def add_relationship(self, subject: str, rel_type: str, obj: str, seen_date: Optional[str] = None):
+        """Add relationship between entities, merging repeats into one counted edge."""
+        key = (subject, rel_type, obj)
+        relationship = self._relationship_index.get(key)
+        if relationship is None:
+            relationship = self._relationship_index[key] = {
+                "subject": subject,
+                "relationship": rel_type,
+                "object": obj
+            }
+            self.relationships.append(relationship)
+        _touch(relationship, seen_date)
     
-    def process_article(self, article: Dict) -> Dict:
+    def process_article(self, article: Dict, seen_date: Optional[str] = None) -> Dict:
         """Process a single article and extract graph data."""
         # Combine title and description for analysis
         text = f"{article.get('title', '')} {article.get('description', '')}"
@@ -177,11 +276,15 @@ class NewsGraphGenerator:
             entity_id = self.add_entity(ent_text, ent_type)
             entity_ids[ent_text] = entity_id
         
+        # Count each entity once per article
+        for clean_name in {ent_text.strip().title() for ent_text in entity_ids}:
+            _touch(self.entities[clean_name], seen_date)
+        
         # Extract and add relationships
         relationships = self.extract_relationships(text, entities)
         for subj, rel, obj in relationships:
             if subj in entity_ids and obj in entity_ids:
-                self.add_relationship(entity_ids[subj], rel, entity_ids[obj])
+                self.add_relationship(entity_ids[subj], rel, entity_ids[obj], seen_date)
         
         return {
             "entities": len(entities),
@@ -192,8 +295,58 @@ class NewsGraphGenerator:
             }
         }
     
+    def merge_articles(self, articles: Iterable[Dict], seen_date: Optional[str] = None) -> Dict[str, int]:
+        """Merge articles not yet in the graph, counting mentions under ``seen_date``.
+        
+        Articles already merged (by URL) are skipped, so re-running a day, or
+        a day whose fetch repeats yesterday's stories, adds nothing twice.
+        """
+        totals = {"articles": 0, "skipped": 0, "entities": 0, "relationships": 0}
+        for article in articles:
+            key = article_key(article)
+            if key in self.merged_articles:
+                totals["skipped"] += 1
+                continue
+            
+            result = self.process_article(article, seen_date)
+            self.merged_articles.add(key)
+            self.added_articles.add(key)
+            totals["articles"] += 1
+            totals["entities"] += result["entities"]
+            totals["relationships"] += result["relationships"]
+        
+        if seen_date and totals["articles"]:
+            self.days[seen_date] = self.days.get(seen_date, 0) + totals["articles"]
+        return totals
+    
+    def to_graph_data(self, source_file: str = '') -> Dict:
+        """Serializable graph, as served to the web UI (see ``merge_state`` for the rest)."""
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "source_file": source_file,
+            "total_entities": len(self.entities),
+            "total_relationships": len(self.relationships),
+            "first_day": min(self.days) if self.days else None,
+            "last_day": max(self.days) if self.days else None,
+            "days": dict(sorted(self.days.items())),
+            "entities": self.entities,
+            "relationships": self.relationships
+        }
+    
+    def merge_state(self, graph_generated_at: str) -> Dict:
+        """What is needed besides the graph to resume merging, for the graph saved as ``graph_generated_at``."""
+        return {
+            "graph_generated_at": graph_generated_at,
+            "merged_articles": sorted(self.merged_articles),
+            "added_articles": sorted(self.added_articles)
+        }
+    
     def generate_graphviz(self, output_path: Path, title: str = "Scranton News Knowledge Graph"):
         """Generate GraphViz visualization of the knowledge graph."""
+        if not graphviz_available:
+            print("GraphViz Python package not available; skipping visualization")
+            return None
+        
         dot = graphviz.Digraph(comment='News Knowledge Graph')
         dot.attr(rankdir='TB', size='12,8', dpi='300')
         dot.attr('node', fontname='Arial', fontsize='10')
@@ -223,11 +376,19 @@ class NewsGraphGenerator:
                 color='gray'
             )
         
-        # Save as both SVG and PNG
-        dot.render(output_path.stem, directory=output_path.parent, format='svg', cleanup=True)
-        dot.render(output_path.stem, directory=output_path.parent, format='png', cleanup=True)
+        # Save as both SVG and PNG from one layout, skipped if the graph is unchanged
+        renderer = GraphRenderer(output_path.parent / ".render_cache")
+        if not renderer.available:
+            print("⚠️  Graphviz 'dot' not found; skipping visualization")
+            return None
+        try:
+            outputs = renderer.render(dot.source, output_path.parent / output_path.stem, ('svg', 'png'))
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️  Graphviz rendering failed ({e}); skipping visualization")
+            return None
+        renderer.prune()
         
-        return str(output_path.parent / f"{output_path.stem}.svg")
+        return str(outputs['svg'])
     
     def generate_neo4j_cypher(self, output_path: Path):
         """Generate Neo4j Cypher queries for importing the graph."""
@@ -237,7 +398,7 @@ class NewsGraphGenerator:
         cypher_queries.append("// Create entity nodes")
         for entity_name, entity_data in self.entities.items():
             entity_type = entity_data["type"]
-            safe_name = entity_name.replace("'", "\\'")
+            safe_name = cypher_string(entity_name)
             cypher_queries.append(
                 f"CREATE (:{entity_type} {{id: '{entity_data['id']}', name: '{safe_name}'}})"
             )
@@ -250,38 +411,64 @@ class NewsGraphGenerator:
             )
         
         # Save Cypher file
-        with open(output_path, 'w') as f:
-            f.write("\n".join(cypher_queries))
+        atomic_write_bytes(output_path, "\n".join(cypher_queries).encode('utf-8'))
         
         return str(output_path)
 
-def process_news_to_graph(news_file: Path, output_dir: Path):
-    """Process news articles and generate knowledge graphs."""
-    
-    print(f"Loading news from: {news_file}")
-    
+def load_news_articles(news_file: Path) -> List[Dict]:
+    """Read the articles of a daily news file."""
     with open(news_file, 'r') as f:
         news_data = json.load(f)
+    return news_data.get('articles', []) if isinstance(news_data, dict) else news_data
+
+
+def process_news_to_graph(news_file: Path, output_dir: Path, cumulative: bool = False,
+                          history: Iterable[Path] = ()):
+    """Process news articles and generate knowledge graphs.
     
-    articles = news_data.get('articles', [])
-    print(f"Found {len(articles)} articles")
+    Args:
+        news_file: Daily news file to process
+        output_dir: Directory for the graph outputs
+        cumulative: Merge into the saved knowledge_graph.json instead of
+            rebuilding from this file alone
+        history: Older daily files to merge first (cumulative backfill)
+    """
+    json_path = output_dir / "knowledge_graph.json"
+    
+    if cumulative:
+        graph_gen = NewsGraphGenerator.load(json_path)
+        print(f"Loaded cumulative graph: {len(graph_gen.entities)} entities, "
+              f"{len(graph_gen.relationships)} relationships, {len(graph_gen.days)} days")
+    else:
+        # Initialize graph generator
+        graph_gen = NewsGraphGenerator()
     
-    # Initialize graph generator
-    graph_gen = NewsGraphGenerator()
+    merged = 0
+    for history_file in history:
+        totals = graph_gen.merge_articles(load_news_articles(history_file), date_from_filename(history_file))
+        merged += totals['articles']
+        print(f"Merged {totals['articles']} new articles from {history_file.name}")
     
-    # Process each article
-    total_entities = 0
-    total_relationships = 0
+    print(f"Loading news from: {news_file}")
+    articles = load_news_articles(news_file)
+    print(f"Found {len(articles)} articles")
     
-    for i, article in enumerate(articles):
-        print(f"Processing article {i+1}/{len(articles)}: {article.get('title', 'No title')[:50]}...")
-        result = graph_gen.process_article(article)
-        total_entities += result["entities"]
-        total_relationships += result["relationships"]
+    seen_date = date_from_filename(news_file) or datetime.now().strftime('%Y-%m-%d')
+    totals = graph_gen.merge_articles(articles, seen_date)
+    merged += totals['articles']
     
-    print(f"\\nExtracted {total_entities} entities and {total_relationships} relationships")
+    if totals["skipped"]:
+        print(f"Skipped {totals['skipped']} articles already in the graph")
+    print(f"\nExtracted {totals['entities']} entities and {totals['relationships']} relationships")
     print(f"Unique entities in graph: {len(graph_gen.entities)}")
     
+    graph_data = graph_gen.to_graph_data(str(news_file))
+    
+    # knowledge_graph.json is written after every other output, so if it exists they match it
+    if cumulative and not merged and json_path.exists():
+        print("No new articles; keeping the existing graph outputs")
+        return graph_data
+    
     # Generate outputs
     output_dir.mkdir(exist_ok=True)
     
@@ -290,31 +477,40 @@ def process_news_to_graph(news_file: Path, output_dir: Path):
         output_dir / "news_knowledge_graph",
         title=f"Scranton News Knowledge Graph ({datetime.now().strftime('%Y-%m-%d')})"
     )
-    print(f"✓ GraphViz visualization: {svg_path}")
+    if svg_path:
+        print(f"✓ GraphViz visualization: {svg_path}")
     
     # Generate Neo4j Cypher queries
     cypher_path = graph_gen.generate_neo4j_cypher(output_dir / "knowledge_graph.cypher")
     print(f"✓ Neo4j Cypher queries: {cypher_path}")
     
-    # Save graph data as JSON
-    graph_data = {
-        "generated_at": datetime.now().isoformat(),
-        "source_file": str(news_file),
-        "total_entities": len(graph_gen.entities),
-        "total_relationships": len(graph_gen.relationships),
-        "entities": graph_gen.entities,
-        "relationships": graph_gen.relationships
-    }
+    # Entity positions seeded from the previous run's, so the graph only moves where it grew
+    if add_knowledge_graph_positions(graph_data):
+        print(f"✓ Graph layout: {len(graph_data['entities'])} entity positions")
     
-    json_path = output_dir / "knowledge_graph.json"
-    with open(json_path, 'w') as f:
-        json.dump(graph_data, f, indent=2)
+    # Neighborhood tiles so the web UI never loads the whole graph
+    tiles_index = write_graph_tiles(graph_data, output_dir / "tiles")
+    print(f"✓ Neighborhood tiles: {tiles_index}")
+    
+    # Merge state first, then the graph; load() reconciles the two if a run stops in between
+    write_json(output_dir / MERGE_STATE_FILE, graph_gen.merge_state(graph_data['generated_at']))
+    write_json(json_path, graph_data, compress=True)
     print(f"✓ Graph data: {json_path}")
     
     return graph_data
 
 def main():
     """Main function to generate knowledge graphs from news."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate knowledge graphs from news')
+    parser.add_argument('--cumulative', action='store_true',
+                        help='Merge the latest day into the saved multi-day graph instead of rebuilding it')
+    parser.add_argument('--backfill', action='store_true',
+                        help='With --cumulative, also merge every older daily file not yet in the graph')
+    parser.add_argument('--archive', action='store_true',
+                        help='Also import new daily files into the SQLite article archive')
+    args = parser.parse_args()
     
     # Find the latest news file
     data_dir = Path("../data/daily")
@@ -322,20 +518,31 @@ def main():
         print(f"Data directory not found: {data_dir}")
         return
     
-    news_files = sorted(data_dir.glob("scranton_news_*.json"), reverse=True)
-    if not news_files:
+    from pipeline import ArticleArchive, NewsLoader
+    
+    try:
+        latest_file = NewsLoader(str(data_dir)).latest_file()
+    except FileNotFoundError:
         print("No news files found")
         return
     
-    latest_file = news_files[0]
+    if args.archive:
+        with ArticleArchive() as archive:
+            imported = archive.sync(data_dir)
+            print(f"🗄️ Archived {imported} new or changed articles ({archive.count()} total)")
+    
+    history = []
+    if args.cumulative and args.backfill:
+        history = [path for path in sorted(data_dir.glob("scranton_news_*.json"))
+                   if path != latest_file and date_from_filename(path)]
     
     # Process news to graph
     output_dir = Path("../data/graph")
-    graph_data = process_news_to_graph(latest_file, output_dir)
+    graph_data = process_news_to_graph(latest_file, output_dir, cumulative=args.cumulative, history=history)
     
-    print(f"\\n🎯 Knowledge graph generation complete!")
+    print(f"\n🎯 Knowledge graph generation complete!")
     print(f"📊 View visualization: {output_dir}/news_knowledge_graph.svg")
     print(f"🔍 Import to Neo4j: {output_dir}/knowledge_graph.cypher")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Server-side layouts for the per-short and cumulative knowledge graphs.
+
+Each graph is laid out once with stress majorization over graph-theoretic
+distances, vectorized across all node pairs with NumPy, and the normalized
+coordinates are stored in the graph JSON (and used for the short's inline
+SVG) so the player can draw the graph without running a physics
+simulation. Positions are cached between runs: an unchanged graph reuses
+its layout as-is, and entities already placed on an earlier day seed the
+new layout, which is then rotated onto their previous positions so
+recurring entities stay where readers saw them. The cumulative
+knowledge_graph.json keeps its own ``x``/``y`` per entity, which seed the
+next day's layout the same way.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pipeline.serialization import write_json
+from svg_graph import render_svg_graph
+
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+DEFAULT_CACHE_FILE = Path("../data/graph/layout_cache.json")
+CACHE_VERSION = 1
+MAX_ITERATIONS = 300
+TOLERANCE = 1e-4
+# Per-short graphs are small; larger graphs fall back to client-side layout
+MAX_LAYOUT_NODES = 200
+# Laying out the whole cumulative graph takes seconds at this size
+MAX_KNOWLEDGE_GRAPH_NODES = 500
+
+
+def graph_signature(nodes: List[str], edges: List[Tuple[str, str]]) -> str:
+    """Hash of a graph's node and edge sets, independent of their order."""
+    payload = "\n".join(sorted(nodes)) + "\0" + "\n".join(sorted(f"{a}\t{b}" for a, b in edges))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def shortest_path_lengths(n: int, edges: List[Tuple[int, int]]) -> 'np.ndarray':
+    """All-pairs hop distances (undirected); disconnected pairs get max + 1."""
+    distances = np.full((n, n), np.inf)
+    np.fill_diagonal(distances, 0.0)
+    for a, b in edges:
+        if a != b:
+            distances[a, b] = distances[b, a] = 1.0
+    # Floyd-Warshall, one vectorized relaxation per intermediate node
+    for k in range(n):
+        distances = np.minimum(distances, distances[:, k, None] + distances[None, k, :])
+
+    finite = np.isfinite(distances)
+    longest = distances[finite].max() if finite.any() else 0.0
+    distances[~finite] = longest + 1.0
+    return distances
+
+
+def stress(positions: 'np.ndarray', distances: 'np.ndarray') -> float:
+    """Weighted stress: sum of w_ij (|x_i - x_j| - d_ij)^2 with w_ij = d_ij^-2."""
+    diff = positions[:, None, :] - positions[None, :, :]
+    actual = np.sqrt((diff ** 2).sum(axis=-1))
+    mask = ~np.eye(len(positions), dtype=bool)
+    return float((((actual - distances) ** 2)[mask] / distances[mask] ** 2).sum() / 2)
+
+
+def stress_majorization(distances: 'np.ndarray', initial: 'np.ndarray',
+                        iterations: int = MAX_ITERATIONS, tolerance: float = TOLERANCE) -> 'np.ndarray':
+    """Minimize stress from an initial placement (localized SMACOF updates).
+
+    Every node moves at once to the weighted average of where each other
+    node says it should be, so an iteration is a handful of n x n array
+    operations.
+    """
+    n = len(distances)
+    positions = initial.astype(float).copy()
+    if n < 2:
+        return positions
+
+    weights = np.zeros_like(distances)
+    off_diagonal = ~np.eye(n, dtype=bool)
+    weights[off_diagonal] = distances[off_diagonal] ** -2
+    weight_sums = weights.sum(axis=1)[:, None]
+
+    for _ in range(iterations):
+        diff = positions[:, None, :] - positions[None, :, :]
+        actual = np.sqrt((diff ** 2).sum(axis=-1))
+        np.fill_diagonal(actual, 1.0)
+        actual = np.maximum(actual, 1e-9)
+        targets = positions[None, :, :] + distances[..., None] * diff / actual[..., None]
+        updated = (weights[..., None] * targets).sum(axis=1) / weight_sums
+        movement = np.abs(updated - positions).max()
+        positions = updated
+        if movement < tolerance:
+            break
+    return positions
+
+
+def align_to(positions: 'np.ndarray', anchors: Dict[int, Tuple[float, float]]) -> 'np.ndarray':
+    """Rotate/reflect and translate a layout so anchored nodes land near their old spots."""
+    if not anchors:
+        return positions
+    indices = list(anchors)
+    previous = np.array([anchors[i] for i in indices], dtype=float)
+    current = positions[indices]
+    if len(indices) == 1:
+        return positions - current[0] + previous[0]
+
+    current_center, previous_center = current.mean(axis=0), previous.mean(axis=0)
+    u, _, vt = np.linalg.svd((current - current_center).T @ (previous - previous_center))
+    rotation = u @ vt
+    return (positions - current_center) @ rotation + previous_center
+
+
+def stress_layout(n: int, edges: List[Tuple[int, int]], anchors: Dict[int, Tuple[float, float]],
+                  signature: str) -> 'np.ndarray':
+    """Lay out from a seeded random start; anchored nodes start at, and are aligned back to, their old spots."""
+    distances = shortest_path_lengths(n, edges)
+    rng = np.random.default_rng(int(signature[:8], 16))
+    initial = rng.normal(scale=1.0, size=(n, 2))
+    for i, position in anchors.items():
+        initial[i] = position
+    return align_to(stress_majorization(distances, initial), anchors)
+
+
+def normalize(positions: 'np.ndarray') -> 'np.ndarray':
+    """Fit a layout into the unit square, keeping its aspect ratio and centering it."""
+    if len(positions) == 1:
+        return np.full((1, 2), 0.5)
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    span = (high - low).max() or 1.0
+    return (positions - low) / span + (1.0 - (high - low) / span) / 2
+
+
+class LayoutCache:
+    """Layout positions kept between runs, by graph signature and by entity."""
+
+    def __init__(self, cache_file: Path = DEFAULT_CACHE_FILE):
+        self.path = Path(cache_file)
+        self.today = datetime.now().strftime('%Y-%m-%d')
+        self.graphs: Dict[str, Dict] = {}
+        self.entities: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                self.graphs = cache.get('graphs', {})
+                self.entities = cache.get('entities', {})
+
+    def layout_graph(self, graph: Dict) -> Optional[Dict]:
+        """Compute (or reuse) the layout of a short's graph.
+
+        Returns:
+            ``{'algorithm', 'positions': {name: [x, y]}}`` with coordinates in
+            [0, 1], or None if the graph cannot be laid out here
+        """
+        names = list(dict.fromkeys(entity['name'] for entity in graph.get('entities', []) if entity.get('name')))
+        if not names or len(names) > MAX_LAYOUT_NODES:
+            return None
+        index = {name: i for i, name in enumerate(names)}
+        edges = [(rel['from'], rel['to']) for rel in graph.get('relationships', [])
+                 if rel.get('from') in index and rel.get('to') in index]
+
+        signature = graph_signature(names, edges)
+        cached = self.graphs.get(signature)
+        if cached:
+            raw = np.array([cached['positions'][name] for name in names], dtype=float)
+        else:
+            anchors = {index[name]: tuple(self.entities[name]['position'])
+                       for name in names if name in self.entities}
+            raw = stress_layout(len(names), [(index[a], index[b]) for a, b in edges], anchors, signature)
+
+        self.graphs[signature] = {
+            'positions': {name: [round(float(x), 4), round(float(y), 4)] for name, (x, y) in zip(names, raw)},
+            'last_used': self.today
+        }
+        for name, (x, y) in zip(names, raw):
+            self.entities[name] = {'position': [round(float(x), 4), round(float(y), 4)], 'last_seen': self.today}
+
+        return {
+            'algorithm': 'stress',
+            'positions': {name: [round(float(x), 4), round(float(y), 4)]
+                          for name, (x, y) in zip(names, normalize(raw))}
+        }
+
+    def save(self, max_age_days: int = 30):
+        """Drop entries unused for ``max_age_days`` and write the cache atomically."""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d')
+        self.graphs = {key: value for key, value in self.graphs.items() if value['last_used'] >= cutoff}
+        self.entities = {key: value for key, value in self.entities.items() if value['last_seen'] >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, {'version': CACHE_VERSION, 'graphs': self.graphs, 'entities': self.entities})
+
+
+def add_graph_layouts(shorts: List[Dict], cache_file: Path = DEFAULT_CACHE_FILE) -> int:
+    """Store a precomputed layout in every short's graph; returns how many were laid out.
+
+    Graphs that carry an inline SVG have it redrawn at the layout positions.
+    Without NumPy the graphs are left as they are and the player lays them
+    out itself.
+    """
+    if not numpy_available:
+        print("⚠️ NumPy not available; graphs will be laid out in the browser")
+        return 0
+
+    cache = LayoutCache(cache_file)
+    laid_out = 0
+    for short in shorts:
+        graph = short.get('graph')
+        if not graph:
+            continue
+        layout = cache.layout_graph(graph)
+        if layout:
+            graph['layout'] = layout
+            if graph.get('svg'):
+                graph['svg'] = render_svg_graph(graph['entities'], graph.get('relationships', []),
+                                                layout['positions'])
+            laid_out += 1
+    cache.save()
+    return laid_out
+
+
+def add_knowledge_graph_positions(graph_data: Dict, max_nodes: int = MAX_KNOWLEDGE_GRAPH_NODES) -> bool:
+    """Store normalized ``x``/``y`` on every entity of a knowledge_graph.json document.
+
+    Entities placed by the previous run seed the layout, so the graph only
+    moves where it grew. Without NumPy, or above ``max_nodes`` entities, any
+    old positions are dropped and the web UI lays the graph out itself.
+
+    Returns:
+        Whether the graph was laid out
+    """
+    entities = graph_data.get('entities', {})
+    if not numpy_available or not entities or len(entities) > max_nodes:
+        for entity in entities.values():
+            entity.pop('x', None)
+            entity.pop('y', None)
+        return False
+
+    names = list(entities)
+    index = {name: i for i, name in enumerate(names)}
+    names_by_id = {entity['id']: name for name, entity in entities.items()}
+    edges = [(index[names_by_id[rel['subject']]], index[names_by_id[rel['object']]])
+             for rel in graph_data.get('relationships', [])
+             if rel.get('subject') in names_by_id and rel.get('object') in names_by_id]
+    anchors = {index[name]: (entity['x'], entity['y'])
+               for name, entity in entities.items() if 'x' in entity and 'y' in entity}
+
+    signature = graph_signature(names, [(names[a], names[b]) for a, b in edges])
+    positions = normalize(stress_layout(len(names), edges, anchors, signature))
+    for name, (x, y) in zip(names, positions):
+        entities[name]['x'] = round(float(x), 4)
+        entities[name]['y'] = round(float(y), 4)
+    return True
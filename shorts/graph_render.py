@@ -0,0 +1,100 @@
+"""
+Cached Graphviz rendering for Scrantenna graphs.
+
+Rendered outputs are stored under the SHA-256 of the DOT source (plus the
+Graphviz version), so a graph that has not changed since the last run is
+copied from the cache instead of being laid out again. When rendering is
+needed, every requested format comes from one ``dot`` process and one
+layout (``dot -Tsvg -Tpng -O``).
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+DEFAULT_CACHE_DIR = Path("../data/graph/.render_cache")
+DEFAULT_FORMATS = ('svg', 'png')
+
+
+class GraphRenderer:
+    """Render DOT sources through a content-addressed output cache."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, dot_binary: str = 'dot'):
+        self.cache_dir = Path(cache_dir)
+        self.dot_binary = dot_binary
+        self._version: Optional[str] = None
+        self.stats = {'hits': 0, 'renders': 0}
+
+    @property
+    def available(self) -> bool:
+        return shutil.which(self.dot_binary) is not None
+
+    def version(self) -> str:
+        """Graphviz version string; part of the cache key so upgrades re-render."""
+        if self._version is None:
+            result = subprocess.run([self.dot_binary, '-V'], capture_output=True, text=True)
+            self._version = (result.stderr or result.stdout).strip()
+        return self._version
+
+    def cache_key(self, source: str) -> str:
+        digest = hashlib.sha256(self.version().encode('utf-8') + b'\0' + source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _render_to_cache(self, source: str, key: str, formats: Sequence[str]):
+        """Lay out once and write every format into the cache."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=str(self.cache_dir)) as workdir:
+            dot_file = Path(workdir) / f"{key}.dot"
+            dot_file.write_text(source, encoding='utf-8')
+            subprocess.run(
+                [self.dot_binary, *(f'-T{fmt}' for fmt in formats), '-O', str(dot_file)],
+                check=True, capture_output=True
+            )
+            for fmt in formats:
+                os.replace(Path(workdir) / f"{key}.dot.{fmt}", self.cache_dir / f"{key}.{fmt}")
+
+    def render(self, source: str, output_base: Path,
+               formats: Sequence[str] = DEFAULT_FORMATS) -> Dict[str, Path]:
+        """Render DOT source to ``output_base.<format>`` for each format.
+
+        Returns:
+            Output path per format
+        """
+        key = self.cache_key(source)
+        cached = {fmt: self.cache_dir / f"{key}.{fmt}" for fmt in formats}
+        missing = [fmt for fmt, path in cached.items() if not path.exists()]
+
+        if missing:
+            self._render_to_cache(source, key, missing)
+            self.stats['renders'] += 1
+        else:
+            self.stats['hits'] += 1
+
+        outputs = {}
+        output_base = Path(output_base)
+        output_base.parent.mkdir(parents=True, exist_ok=True)
+        for fmt, path in cached.items():
+            # Mark as recently used for prune()
+            os.utime(path)
+            output = output_base.with_name(f"{output_base.name}.{fmt}")
+            shutil.copyfile(path, output)
+            outputs[fmt] = output
+        return outputs
+
+    def prune(self, max_age_days: float = 30) -> int:
+        """Delete cached outputs not used for ``max_age_days``; returns how many."""
+        if not self.cache_dir.exists():
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        return removed
+
@@ -4,12 +4,145 @@ Neo4j Export Utility for Scrantenna
 Converts processed news data into Neo4j Cypher format for advanced graph analysis.
 """
 
+import csv
+import gzip
+import hashlib
 import json
 import os
+import time
 from datetime import datetime
-from typing import List, Dict, Set, Tuple
+from functools import partial
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
 
+from pipeline.serialization import write_json
+
+try:
+    from neo4j import GraphDatabase
+    neo4j_available = True
+except ImportError:
+    neo4j_available = False
+
+DEFAULT_BATCH_SIZE = 1000
+WRITE_BUFFER_SIZE = 1 << 20
+DEFAULT_STATE_FILE = "neo4j_export_state.json"
+STATE_VERSION = 1
+
+SETUP_STATEMENTS = [
+    "CREATE CONSTRAINT entity_name IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT article_id IF NOT EXISTS FOR (a:Article) REQUIRE a.id IS UNIQUE",
+]
+
+INDEX_STATEMENTS = [
+    "CREATE INDEX entity_type_idx IF NOT EXISTS FOR (e:Entity) ON (e.type)",
+    "CREATE INDEX article_source_idx IF NOT EXISTS FOR (a:Article) ON (a.source)",
+    "CREATE INDEX article_published_idx IF NOT EXISTS FOR (a:Article) ON (a.published_at)",
+]
+
+
+def cypher_identifier(name: str) -> str:
+    """Quote a label or relationship type for use in a Cypher pattern."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def cypher_string(value: Any) -> str:
+    """Escape a value for a single-quoted Cypher string literal.
+    
+    Backslashes are escaped first, so a trailing backslash cannot swallow the
+    closing quote.
+    """
+    return str(value).replace("\\", "\\\\").replace("'", "\\'")
+
+
+def _batched(rows: List[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def article_key(article: Dict) -> str:
+    """Stable identity for an article across daily runs; the Article node id.
+    
+    Short ids (``short_0``...) are positions in one day's feed, so every
+    export keys articles by URL and only falls back to the id.
+    """
+    return article.get('url') or article.get('id', '')
+
+
+class DeltaExportState:
+    """What earlier delta exports already sent to Neo4j.
+    
+    Kept in a small JSON file: entity types by name, and for every exported
+    article a digest of its content plus the edges it contributed, so an
+    unchanged article costs nothing and a changed one only emits the
+    difference.
+    """
+    
+    def __init__(self, state_file: str = DEFAULT_STATE_FILE):
+        self.path = Path(state_file)
+        self.entities: Dict[str, str] = {}
+        self.articles: Dict[str, Dict] = {}
+        self.watermark: Dict[str, str] = {}
+        
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                self.entities = state.get('entities', {})
+                self.articles = state.get('articles', {})
+                self.watermark = state.get('watermark', {})
+            else:
+                print(f"⚠️  Ignoring {self.path}: unsupported state version, starting a full delta")
+    
+    def apply(self, delta: Dict[str, Any]):
+        """Record a delta as exported and advance the watermark."""
+        for row in delta['entities']:
+            self.entities[row['name']] = row['type']
+        self.articles.update(delta['records'])
+        
+        published = [row['published_at'] for row in delta['articles'] if row['published_at']]
+        if self.watermark.get('published_at'):
+            published.append(self.watermark['published_at'])
+        self.watermark = {
+            'published_at': max(published) if published else '',
+            'exported_at': datetime.now().isoformat(),
+            'articles': len(self.articles)
+        }
+    
+    def save(self, path: Optional[Path] = None):
+        """Write the state, or with ``path`` a pending copy that records where it belongs."""
+        state = {
+            'version': STATE_VERSION,
+            'watermark': self.watermark,
+            'entities': self.entities,
+            'articles': self.articles
+        }
+        if path is not None:
+            state['state_file'] = str(self.path.resolve())
+        write_json(Path(path or self.path), state)
+
+
+def pending_state_path(batch_file: str) -> Path:
+    """Where a delta export keeps the state to commit once it has been loaded."""
+    batch_file = Path(batch_file)
+    return batch_file.with_name(f"{batch_file.stem}.pending_state.json")
+
+
+def commit_pending_state(batch_file: str) -> Optional[Path]:
+    """Advance the delta export state after ``batch_file`` was loaded into Neo4j.
+    
+    Returns:
+        The state file written, or None if the batch file was not a delta
+    """
+    pending = pending_state_path(batch_file)
+    if not pending.exists():
+        return None
+    with open(pending, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    state_file = Path(state.pop('state_file'))
+    write_json(state_file, state)
+    pending.unlink()
+    return state_file
+
 
 class ScrantennaNeo4jExporter:
     """Export Scrantenna data to Neo4j Cypher format."""
@@ -18,7 +151,7 @@ class ScrantennaNeo4jExporter:
         self.entities: Set[Tuple[str, str]] = set()  # (name, type)
         self.relationships: List[Dict] = []
         self.articles: List[Dict] = []
-        self.cypher_commands: List[str] = []
+        self.export_phases: List[List[Path]] = [[Path("scrantenna_graph.cypher")]]
     
     def load_shorts_data(self, shorts_file: str = "shorts_data.json") -> bool:
         """Load data from shorts JSON file."""
@@ -59,7 +192,7 @@ class ScrantennaNeo4jExporter:
                         'from': rel['from'],
                         'to': rel['to'],
                         'type': rel['type'],
-                        'article_id': article.get('id', ''),
+                        'article_id': article_key(article),
                         'published_at': article.get('publishedAt', ''),
                         'source': article.get('source', 'Unknown')
                     })
@@ -67,158 +200,449 @@ class ScrantennaNeo4jExporter:
         print(f"✓ Found {len(self.entities)} unique entities")
         print(f"✓ Found {len(self.relationships)} relationships")
     
-    def generate_cypher_commands(self):
-        """Generate Cypher commands for Neo4j import."""
-        self.cypher_commands = []
+    def iter_cypher_units(self) -> Iterator[Tuple[str, str, int, Callable[[], Iterator[str]]]]:
+        """Yield ``(phase, name, statement count, emitter)`` for each import unit.
         
-        # Add cleanup and constraints
-        self._add_setup_commands()
+        Units come in dependency order: constraints, then nodes (one unit per
+        entity label, plus articles), then relationships (one unit per type,
+        plus MENTIONS), then indices. Units within the nodes or relationships
+        phase are independent of each other and can be imported in parallel.
+        Emitters are generators, so statements are produced as they are written.
+        """
+        entities_by_type = {}
+        for name, entity_type in self.entities:
+            entities_by_type.setdefault(entity_type, []).append(name)
         
-        # Create entity nodes
-        self._create_entity_nodes()
+        relationships_by_type = {}
+        for rel in self.relationships:
+            relationships_by_type.setdefault(rel['type'], []).append(rel)
         
-        # Create article nodes
-        self._create_article_nodes()
+        mention_count = sum(len(article.get('graph', {}).get('entities', [])) for article in self.articles)
         
-        # Create relationships
-        self._create_relationships()
+        yield 'setup', 'setup', len(SETUP_STATEMENTS), self._emit_setup_commands
+        for index, (entity_type, names) in enumerate(sorted(entities_by_type.items())):
+            yield ('nodes', entity_type, len(names),
+                   partial(self._emit_entity_nodes, entity_type, names, heading=index == 0))
+        yield 'nodes', 'Article', len(self.articles), self._emit_article_nodes
+        for index, (rel_type, rels) in enumerate(relationships_by_type.items()):
+            yield ('relationships', rel_type, len(rels),
+                   partial(self._emit_relationships, rel_type, rels, heading=index == 0))
+        yield 'relationships', 'MENTIONS', mention_count, self._emit_mentions
+        yield 'indices', 'indices', len(INDEX_STATEMENTS), self._emit_indices
+    
+    def iter_cypher_commands(self) -> Iterator[str]:
+        """Yield the complete import script, one line at a time."""
+        for _, _, _, emit in self.iter_cypher_units():
+            yield from emit()
+    
+    def _emit_setup_commands(self) -> Iterator[str]:
+        """Database setup commands."""
+        yield "// Scrantenna Knowledge Graph Import"
+        yield f"// Generated on {datetime.now().isoformat()}"
+        yield ""
+        yield "// Clear existing data (CAUTION: This will delete all data!)"
+        yield "// MATCH (n) DETACH DELETE n;"
+        yield ""
+        yield "// Create constraints (run these first)"
+        for statement in SETUP_STATEMENTS:
+            yield f"{statement};"
+        yield ""
+    
+    def _emit_entity_nodes(self, entity_type: str, names: List[str], heading: bool = False) -> Iterator[str]:
+        """Entity node commands for one type label."""
+        if heading:
+            yield "// Create Entity Nodes"
+        yield f"// {entity_type} entities"
         
-        # Add indices and constraints
-        self._add_indices()
+        for name in sorted(names):
+            safe_name = cypher_string(name)
+            
+            yield (f"MERGE (e:Entity:{entity_type} {{name: '{safe_name}'}}) "
+                   f"SET e.type = '{entity_type}', e.created_at = datetime();")
         
-        print(f"✓ Generated {len(self.cypher_commands)} Cypher commands")
+        yield ""
     
-    def _add_setup_commands(self):
-        """Add database setup commands."""
-        self.cypher_commands.extend([
-            "// Scrantenna Knowledge Graph Import",
-            f"// Generated on {datetime.now().isoformat()}",
-            "",
-            "// Clear existing data (CAUTION: This will delete all data!)",
-            "// MATCH (n) DETACH DELETE n;",
-            "",
-            "// Create constraints (run these first)",
-            "CREATE CONSTRAINT entity_name IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE;",
-            "CREATE CONSTRAINT article_id IF NOT EXISTS FOR (a:Article) REQUIRE a.id IS UNIQUE;",
-            ""
-        ])
+    def _emit_article_nodes(self) -> Iterator[str]:
+        """Article node commands."""
+        yield "// Create Article Nodes"
+        
+        for article in self.articles:
+            article_id = cypher_string(article_key(article))
+            title = cypher_string(article.get('title', ''))
+            source = cypher_string(article.get('source', 'Unknown'))
+            published_at = cypher_string(article.get('publishedAt', ''))
+            url = cypher_string(article.get('url', ''))
+            
+            yield (f"CREATE (a:Article {{id: '{article_id}', "
+                   f"title: '{title}', "
+                   f"source: '{source}', "
+                   f"published_at: '{published_at}', "
+                   f"url: '{url}'}});")
+        
+        yield ""
+    
+    def _emit_relationships(self, rel_type: str, rels: List[Dict], heading: bool = False) -> Iterator[str]:
+        """Entity relationship commands for one relationship type."""
+        if heading:
+            yield "// Create Relationships"
+        yield f"// {rel_type} relationships"
+        
+        for rel in rels:
+            from_name = cypher_string(rel['from'])
+            to_name = cypher_string(rel['to'])
+            article_id = cypher_string(rel.get('article_id', ''))
+            source = cypher_string(rel.get('source', ''))
+            
+            yield (f"MATCH (from:Entity {{name: '{from_name}'}}), "
+                   f"(to:Entity {{name: '{to_name}'}}) "
+                   f"CREATE (from)-[r:{rel_type} {{article_id: '{article_id}', "
+                   f"source: '{source}'}}]->(to);")
+        
+        yield ""
+    
+    def _emit_mentions(self) -> Iterator[str]:
+        """Article-entity relationship commands."""
+        yield "// Article-Entity relationships"
+        for article in self.articles:
+            article_id = cypher_string(article_key(article))
+            entities = article.get('graph', {}).get('entities', [])
+            
+            for entity in entities:
+                entity_name = cypher_string(entity.get('name', ''))
+                confidence = entity.get('confidence', 0.5)
+                
+                yield (f"MATCH (a:Article {{id: '{article_id}'}}), "
+                       f"(e:Entity {{name: '{entity_name}'}}) "
+                       f"CREATE (a)-[:MENTIONS {{confidence: {confidence}}}]->(e);")
+        
+        yield ""
+    
+    def _emit_indices(self) -> Iterator[str]:
+        """Performance indices."""
+        yield "// Create Indices for Performance"
+        for statement in INDEX_STATEMENTS:
+            yield f"{statement};"
+        yield ""
     
-    def _create_entity_nodes(self):
-        """Create Cypher commands for entity nodes."""
-        self.cypher_commands.append("// Create Entity Nodes")
+
+    def iter_parameter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield ``{'query', 'rows'}`` batches for ``UNWIND $rows`` imports.
         
-        # Group entities by type for better organization
+        Values travel as parameters, so nothing needs escaping; labels and
+        relationship types cannot be parameters and get one query per value.
+        """
+        # Entity nodes, one query per type label
         entities_by_type = {}
         for name, entity_type in self.entities:
-            if entity_type not in entities_by_type:
-                entities_by_type[entity_type] = []
-            entities_by_type[entity_type].append(name)
+            entities_by_type.setdefault(entity_type, []).append(name)
+        
+        for entity_type in sorted(entities_by_type):
+            query = (f"UNWIND $rows AS row "
+                     f"MERGE (e:Entity:{cypher_identifier(entity_type)} {{name: row.name}}) "
+                     f"SET e.type = row.type, e.created_at = datetime()")
+            rows = [{'name': name, 'type': entity_type} for name in sorted(entities_by_type[entity_type])]
+            for batch in _batched(rows, batch_size):
+                yield {'query': query, 'rows': batch}
+        
+        # Article nodes
+        query = ("UNWIND $rows AS row "
+                 "MERGE (a:Article {id: row.id}) "
+                 "SET a.title = row.title, a.source = row.source, "
+                 "a.published_at = row.published_at, a.url = row.url")
+        rows = [{
+            'id': article_key(article),
+            'title': article.get('title', ''),
+            'source': article.get('source', 'Unknown'),
+            'published_at': article.get('publishedAt', ''),
+            'url': article.get('url', '')
+        } for article in self.articles]
+        for batch in _batched(rows, batch_size):
+            yield {'query': query, 'rows': batch}
+        
+        # Entity relationships, one query per relationship type
+        relationships_by_type = {}
+        for rel in self.relationships:
+            relationships_by_type.setdefault(rel['type'], []).append({
+                'from': rel['from'],
+                'to': rel['to'],
+                'article_id': rel.get('article_id', ''),
+                'source': rel.get('source', '')
+            })
+        
+        for rel_type in sorted(relationships_by_type):
+            query = (f"UNWIND $rows AS row "
+                     f"MATCH (from:Entity {{name: row.from}}), (to:Entity {{name: row.to}}) "
+                     f"CREATE (from)-[r:{cypher_identifier(rel_type)} "
+                     f"{{article_id: row.article_id, source: row.source}}]->(to)")
+            for batch in _batched(relationships_by_type[rel_type], batch_size):
+                yield {'query': query, 'rows': batch}
         
-        for entity_type, names in entities_by_type.items():
-            self.cypher_commands.append(f"// {entity_type} entities")
+        # Article-entity relationships
+        query = ("UNWIND $rows AS row "
+                 "MATCH (a:Article {id: row.article_id}), (e:Entity {name: row.name}) "
+                 "CREATE (a)-[:MENTIONS {confidence: row.confidence}]->(e)")
+        rows = [{
+            'article_id': article_key(article),
+            'name': entity.get('name', ''),
+            'confidence': entity.get('confidence', 0.5)
+        } for article in self.articles for entity in article.get('graph', {}).get('entities', [])]
+        for batch in _batched(rows, batch_size):
+            yield {'query': query, 'rows': batch}
+    
+    def export_parameter_batches(self, output_file: str = "scrantenna_graph.batches.json",
+                                 batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+        """Export the graph as JSON parameter batches for load_parameter_batches()."""
+        try:
+            batches = list(self.iter_parameter_batches(batch_size))
+            write_json(Path(output_file), {
+                'generated_at': datetime.now().isoformat(),
+                'batch_size': batch_size,
+                'setup': SETUP_STATEMENTS,
+                'batches': batches,
+                'indices': INDEX_STATEMENTS
+            })
             
-            for name in sorted(names):
-                # Escape single quotes in names
-                safe_name = name.replace("'", "\\'")
-                
-                cypher = (f"MERGE (e:Entity:{entity_type} {{name: '{safe_name}'}}) "
-                         f"SET e.type = '{entity_type}', e.created_at = datetime();")
-                
-                self.cypher_commands.append(cypher)
+            print(f"✅ Exported {len(batches)} parameter batches to {output_file}")
+            return True
             
-            self.cypher_commands.append("")
+        except Exception as e:
+            print(f"❌ Batch export failed: {e}")
+            return False
     
-    def _create_article_nodes(self):
-        """Create Cypher commands for article nodes."""
-        self.cypher_commands.append("// Create Article Nodes")
+    def collect_delta(self, state: DeltaExportState) -> Dict[str, Any]:
+        """Compare the loaded articles with the export state.
+        
+        Returns:
+            Rows to merge or delete, plus the new per-article state records
+        """
+        delta = {key: [] for key in ('entities', 'articles', 'relationships', 'mentions',
+                                     'stale_relationships', 'stale_mentions')}
+        delta['records'] = {}
+        queued_entities = {}
         
         for article in self.articles:
-            article_id = article.get('id', '')
-            title = article.get('title', '').replace("'", "\\'")
-            source = article.get('source', 'Unknown').replace("'", "\\'")
-            published_at = article.get('publishedAt', '')
-            url = article.get('url', '').replace("'", "\\'")
+            key = article_key(article)
+            if not key or key in delta['records']:
+                continue
             
-            cypher = (f"CREATE (a:Article {{id: '{article_id}', "
-                     f"title: '{title}', "
-                     f"source: '{source}', "
-                     f"published_at: '{published_at}', "
-                     f"url: '{url}'}});")
+            graph = article.get('graph', {})
+            mentions = {}
+            for entity in graph.get('entities', []):
+                name = entity.get('name', '').strip()
+                if name and len(name) > 1:
+                    mentions[name] = entity.get('confidence', 0.5)
+                    entity_type = entity.get('type', 'UNKNOWN')
+                    if state.entities.get(name, queued_entities.get(name)) != entity_type:
+                        queued_entities[name] = entity_type
+            edges = sorted({(rel['from'], rel['type'], rel['to'])
+                            for rel in graph.get('relationships', [])
+                            if all(rel.get(field) for field in ('from', 'to', 'type'))})
+            
+            node = {
+                'id': key,
+                'title': article.get('title', ''),
+                'source': article.get('source', 'Unknown'),
+                'published_at': article.get('publishedAt', ''),
+                'url': article.get('url', '')
+            }
+            digest = hashlib.sha1(json.dumps([node, mentions, edges], sort_keys=True).encode('utf-8')).hexdigest()
+            
+            previous = state.articles.get(key, {})
+            if previous.get('digest') == digest:
+                continue
+            
+            delta['records'][key] = {'digest': digest, 'mentions': mentions, 'edges': [list(edge) for edge in edges]}
+            delta['articles'].append(node)
             
-            self.cypher_commands.append(cypher)
+            old_mentions = previous.get('mentions', {})
+            delta['mentions'].extend({'article_id': key, 'name': name, 'confidence': confidence}
+                                     for name, confidence in mentions.items()
+                                     if old_mentions.get(name) != confidence)
+            delta['stale_mentions'].extend({'article_id': key, 'name': name}
+                                           for name in old_mentions if name not in mentions)
+            
+            old_edges = {tuple(edge) for edge in previous.get('edges', [])}
+            delta['relationships'].extend({'from': source, 'type': rel_type, 'to': target,
+                                           'article_id': key, 'source': node['source']}
+                                          for source, rel_type, target in edges
+                                          if (source, rel_type, target) not in old_edges)
+            delta['stale_relationships'].extend({'from': source, 'type': rel_type, 'to': target, 'article_id': key}
+                                                for source, rel_type, target in sorted(old_edges - set(edges)))
         
-        self.cypher_commands.append("")
+        delta['entities'] = [{'name': name, 'type': entity_type}
+                             for name, entity_type in sorted(queued_entities.items())]
+        return delta
     
-    def _create_relationships(self):
-        """Create Cypher commands for relationships."""
-        self.cypher_commands.append("// Create Relationships")
+    @staticmethod
+    def iter_delta_batches(delta: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield idempotent ``MERGE``/``DELETE`` batches for a delta from collect_delta().
         
-        # Group relationships by type
-        relationships_by_type = {}
-        for rel in self.relationships:
-            rel_type = rel['type']
-            if rel_type not in relationships_by_type:
-                relationships_by_type[rel_type] = []
-            relationships_by_type[rel_type].append(rel)
-        
-        for rel_type, rels in relationships_by_type.items():
-            self.cypher_commands.append(f"// {rel_type} relationships")
-            
-            for rel in rels:
-                from_name = rel['from'].replace("'", "\\'")
-                to_name = rel['to'].replace("'", "\\'")
-                article_id = rel.get('article_id', '')
-                source = rel.get('source', '').replace("'", "\\'")
-                
-                cypher = (f"MATCH (from:Entity {{name: '{from_name}'}}), "
-                         f"(to:Entity {{name: '{to_name}'}}) "
-                         f"CREATE (from)-[r:{rel_type} {{article_id: '{article_id}', "
-                         f"source: '{source}'}}]->(to);")
-                
-                self.cypher_commands.append(cypher)
-            
-            self.cypher_commands.append("")
+        Replaying a batch file, or re-exporting an article, leaves the
+        database unchanged, so no cleanup is needed before a load.
+        """
+        def by_type(rows):
+            grouped = {}
+            for row in rows:
+                grouped.setdefault(row['type'], []).append(row)
+            return sorted(grouped.items())
         
-        # Create article-entity relationships
-        self.cypher_commands.append("// Article-Entity relationships")
-        for article in self.articles:
-            article_id = article.get('id', '')
-            entities = article.get('graph', {}).get('entities', [])
+        for entity_type, rows in by_type(delta['entities']):
+            query = (f"UNWIND $rows AS row "
+                     f"MERGE (e:Entity {{name: row.name}}) "
+                     f"ON CREATE SET e.created_at = datetime() "
+                     f"SET e.type = row.type, e:{cypher_identifier(entity_type)}")
+            for batch in _batched(rows, batch_size):
+                yield {'query': query, 'rows': batch}
+        
+        query = ("UNWIND $rows AS row "
+                 "MERGE (a:Article {id: row.id}) "
+                 "SET a.title = row.title, a.source = row.source, "
+                 "a.published_at = row.published_at, a.url = row.url")
+        for batch in _batched(delta['articles'], batch_size):
+            yield {'query': query, 'rows': batch}
+        
+        for rel_type, rows in by_type(delta['stale_relationships']):
+            query = (f"UNWIND $rows AS row "
+                     f"MATCH (:Entity {{name: row.from}})-[r:{cypher_identifier(rel_type)} "
+                     f"{{article_id: row.article_id}}]->(:Entity {{name: row.to}}) "
+                     f"DELETE r")
+            for batch in _batched(rows, batch_size):
+                yield {'query': query, 'rows': batch}
+        
+        query = ("UNWIND $rows AS row "
+                 "MATCH (:Article {id: row.article_id})-[m:MENTIONS]->(:Entity {name: row.name}) "
+                 "DELETE m")
+        for batch in _batched(delta['stale_mentions'], batch_size):
+            yield {'query': query, 'rows': batch}
+        
+        for rel_type, rows in by_type(delta['relationships']):
+            query = (f"UNWIND $rows AS row "
+                     f"MATCH (from:Entity {{name: row.from}}), (to:Entity {{name: row.to}}) "
+                     f"MERGE (from)-[r:{cypher_identifier(rel_type)} {{article_id: row.article_id}}]->(to) "
+                     f"SET r.source = row.source")
+            for batch in _batched(rows, batch_size):
+                yield {'query': query, 'rows': batch}
+        
+        query = ("UNWIND $rows AS row "
+                 "MATCH (a:Article {id: row.article_id}), (e:Entity {name: row.name}) "
+                 "MERGE (a)-[m:MENTIONS]->(e) "
+                 "SET m.confidence = row.confidence")
+        for batch in _batched(delta['mentions'], batch_size):
+            yield {'query': query, 'rows': batch}
+    
+    def export_delta(self, output_file: str = "scrantenna_graph.delta.json",
+                     state_file: str = DEFAULT_STATE_FILE,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+        """Export only what changed since the last loaded delta.
+        
+        The output uses the export_parameter_batches() format, so it loads
+        with load_parameter_batches(). The advanced state is kept next to it
+        and only replaces ``state_file`` once the load succeeds; until then
+        every new delta is computed against the last loaded one, so
+        overwriting an unloaded delta loses nothing.
+        """
+        try:
+            state = DeltaExportState(state_file)
+            delta = self.collect_delta(state)
+            batches = list(self.iter_delta_batches(delta, batch_size))
+            write_json(Path(output_file), {
+                'generated_at': datetime.now().isoformat(),
+                'batch_size': batch_size,
+                'since': state.watermark,
+                'setup': SETUP_STATEMENTS,
+                'batches': batches,
+                'indices': INDEX_STATEMENTS
+            })
             
-            for entity in entities:
-                entity_name = entity.get('name', '').replace("'", "\\'")
-                confidence = entity.get('confidence', 0.5)
-                
-                cypher = (f"MATCH (a:Article {{id: '{article_id}'}}), "
-                         f"(e:Entity {{name: '{entity_name}'}}) "
-                         f"CREATE (a)-[:MENTIONS {{confidence: {confidence}}}]->(e);")
-                
-                self.cypher_commands.append(cypher)
-        
-        self.cypher_commands.append("")
-    
-    def _add_indices(self):
-        """Add performance indices."""
-        self.cypher_commands.extend([
-            "// Create Indices for Performance",
-            "CREATE INDEX entity_type_idx IF NOT EXISTS FOR (e:Entity) ON (e.type);",
-            "CREATE INDEX article_source_idx IF NOT EXISTS FOR (a:Article) ON (a.source);",
-            "CREATE INDEX article_published_idx IF NOT EXISTS FOR (a:Article) ON (a.published_at);",
-            ""
-        ])
-    
-    def export_to_file(self, output_file: str = "scrantenna_graph.cypher"):
-        """Export Cypher commands to file."""
+            state.apply(delta)
+            state.save(pending_state_path(output_file))
+            
+            print(f"✅ Exported delta to {output_file} ({len(batches)} batches)")
+            print(f"   • Changed articles: {len(delta['articles'])} of {len(self.articles)}")
+            print(f"   • New entities: {len(delta['entities'])}")
+            print(f"   • Relationships: +{len(delta['relationships'])} / -{len(delta['stale_relationships'])}")
+            print(f"   • Mentions: +{len(delta['mentions'])} / -{len(delta['stale_mentions'])}")
+            print(f"   • Watermark: {state.watermark['published_at'] or 'n/a'} (committed when loaded)")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Delta export failed: {e}")
+            return False
+    
+    @staticmethod
+    def _open_cypher(path: Path, compress: bool) -> IO[str]:
+        if compress:
+            return gzip.open(path, 'wt', encoding='utf-8')
+        return open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+    
+    @staticmethod
+    def _write_lines(handle: IO[str], lines: Iterable[str]) -> int:
+        count = 0
+        for line in lines:
+            handle.write(line)
+            handle.write('\n')
+            count += 1
+        return count
+    
+    @staticmethod
+    def _assign_shards(units: List[Tuple], shards: int) -> List[List[Tuple]]:
+        """Spread units over at most ``shards`` files, largest first onto the lightest file."""
+        bins = [[] for _ in range(min(shards, len(units)))]
+        loads = [0] * len(bins)
+        for position, unit in sorted(enumerate(units), key=lambda item: (-item[1][2], item[0])):
+            lightest = loads.index(min(loads))
+            bins[lightest].append((position, unit))
+            loads[lightest] += unit[2]
+        # Keep the script order within each file
+        return [[unit for _, unit in sorted(units_in_bin)] for units_in_bin in bins]
+    
+    def export_to_file(self, output_file: str = "scrantenna_graph.cypher",
+                       compress: bool = False, shards: int = 1) -> bool:
+        """Stream Cypher commands to file as they are generated.
+        
+        Args:
+            output_file: Script path; with sharding, the base name for the shard files
+            compress: Write gzip streams (``.gz`` is appended to each file name)
+            shards: Split node and relationship commands into up to this many
+                files per phase, by label and relationship type
+        """
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.cypher_commands))
+            output_path = Path(output_file)
+            suffix = '.cypher.gz' if compress else '.cypher'
+            units = list(self.iter_cypher_units())
+            
+            if shards <= 1:
+                path = output_path if not compress else output_path.with_name(output_path.name + '.gz')
+                plan = [[(path, units)]]
+            else:
+                stem = output_path.name[:-len('.cypher')] if output_path.name.endswith('.cypher') else output_path.name
+                plan = []
+                for phase in ('setup', 'nodes', 'relationships', 'indices'):
+                    phase_units = [unit for unit in units if unit[0] == phase]
+                    if phase in ('setup', 'indices'):
+                        plan.append([(output_path.with_name(f"{stem}.{phase}{suffix}"), phase_units)])
+                    else:
+                        plan.append([
+                            (output_path.with_name(f"{stem}.{phase}-{number:02d}{suffix}"), shard_units)
+                            for number, shard_units in enumerate(self._assign_shards(phase_units, shards), 1)
+                        ])
+            
+            lines = 0
+            for phase_files in plan:
+                for path, shard_units in phase_files:
+                    with self._open_cypher(path, compress) as handle:
+                        for _, _, _, emit in shard_units:
+                            lines += self._write_lines(handle, emit())
             
-            print(f"✅ Exported to {output_file}")
+            self.export_phases = [[path for path, _ in phase_files] for phase_files in plan]
+            files = [path for phase_files in self.export_phases for path in phase_files]
+            
+            print(f"✅ Exported to {files[0] if len(files) == 1 else f'{len(files)} files'}")
             print(f"📊 Import Statistics:")
             print(f"   • Entities: {len(self.entities)}")
             print(f"   • Articles: {len(self.articles)}")
             print(f"   • Relationships: {len(self.relationships)}")
-            print(f"   • Cypher commands: {len(self.cypher_commands)}")
+            print(f"   • Cypher lines: {lines}")
             
             return True
             
@@ -226,6 +650,7 @@ class ScrantennaNeo4jExporter:
             print(f"❌ Export failed: {e}")
             return False
     
+
     def generate_sample_queries(self, output_file: str = "sample_queries.cypher"):
         """Generate useful sample queries for analysis."""
         
@@ -307,7 +732,16 @@ class ScrantennaNeo4jExporter:
             return False
     
     def create_import_script(self, script_file: str = "import_to_neo4j.sh"):
-        """Create a shell script for easy Neo4j import."""
+        """Create a shell script for easy Neo4j import.
+        
+        Runs the files written by the last export_to_file() phase by phase;
+        shard files within a phase are imported in parallel.
+        """
+        files = [path.name for phase_files in self.export_phases for path in phase_files]
+        import_phases = "\n".join(
+            "import_phase " + " ".join(f'"{path.name}"' for path in phase_files) + " || exit 1"
+            for phase_files in self.export_phases
+        )
         
         script_content = f"""#!/bin/bash
 # Scrantenna Neo4j Import Script
@@ -319,7 +753,7 @@ echo "🔄 Starting Scrantenna graph import to Neo4j..."
 NEO4J_URI="neo4j://localhost:7687"
 NEO4J_USER="neo4j"
 NEO4J_PASSWORD="password"
-CYPHER_FILE="scrantenna_graph.cypher"
+CYPHER_FILES=({' '.join(f'"{name}"' for name in files)})
 
 # Check if Neo4j is running
 echo "🔍 Checking Neo4j connection..."
@@ -329,25 +763,46 @@ if ! nc -z localhost 7687; then
     exit 1
 fi
 
-# Check if cypher file exists
-if [ ! -f "$CYPHER_FILE" ]; then
-    echo "❌ Cypher file not found: $CYPHER_FILE"
-    echo "   Run: python neo4j_export.py"
-    exit 1
-fi
+# Check if cypher files exist
+for CYPHER_FILE in "${{CYPHER_FILES[@]}}"; do
+    if [ ! -f "$CYPHER_FILE" ]; then
+        echo "❌ Cypher file not found: $CYPHER_FILE"
+        echo "   Run: python neo4j_export.py"
+        exit 1
+    fi
+done
+
+run_cypher() {{
+    case "$1" in
+        *.gz) gunzip -c "$1" | cypher-shell -a "$NEO4J_URI" -u "$NEO4J_USER" -p "$NEO4J_PASSWORD" ;;
+        *) cypher-shell -a "$NEO4J_URI" -u "$NEO4J_USER" -p "$NEO4J_PASSWORD" -f "$1" ;;
+    esac
+}}
+
+# Files in one phase are independent and run in parallel
+import_phase() {{
+    local pids=()
+    for CYPHER_FILE in "$@"; do
+        run_cypher "$CYPHER_FILE" &
+        pids+=($!)
+    done
+    local status=0
+    for pid in "${{pids[@]}}"; do
+        wait "$pid" || status=1
+    done
+    if [ $status -ne 0 ]; then
+        echo "❌ Import failed"
+    fi
+    return $status
+}}
 
 # Import data using cypher-shell
 echo "📊 Importing data to Neo4j..."
-cypher-shell -a "$NEO4J_URI" -u "$NEO4J_USER" -p "$NEO4J_PASSWORD" -f "$CYPHER_FILE"
-
-if [ $? -eq 0 ]; then
-    echo "✅ Import completed successfully!"
-    echo "🌐 Open Neo4j Browser: http://localhost:7474"
-    echo "📊 Run sample queries from: sample_queries.cypher"
-else
-    echo "❌ Import failed"
-    exit 1
-fi
+{import_phases}
+
+echo "✅ Import completed successfully!"
+echo "🌐 Open Neo4j Browser: http://localhost:7474"
+echo "📊 Run sample queries from: sample_queries.cypher"
 """
         
         try:
@@ -366,8 +821,207 @@ fi
             return False
 
 
+def stable_node_id(kind: str, key: str) -> int:
+    """Stable 60-bit integer node id derived from a node's identity."""
+    return int(hashlib.sha1(f"{kind}:{key}".encode('utf-8')).hexdigest()[:15], 16)
+
+
+def rule_based_article_graph(article: Dict) -> Dict:
+    """Article graph for archive exports: the stored graph, else cheap rule-based extraction."""
+    if article.get('graph'):
+        return article['graph']
+    
+    from generate_shorts import extract_simple_entities, extract_simple_relationships
+    
+    text = f"{article.get('title', '')} {article.get('description', '')}"
+    entities = extract_simple_entities(text)
+    return {'entities': entities, 'relationships': extract_simple_relationships(text, entities)}
+
+
+class Neo4jBulkCSVExporter:
+    """Export the article archive as CSVs for ``neo4j-admin database import``.
+    
+    Articles are streamed once and rows are written as they are produced, so
+    memory is bounded by the set of distinct entity ids. Node ids are hashes
+    of article URLs and entity names, so they are stable across rebuilds.
+    """
+    
+    FILES = {
+        'articles': ('nodes', [':ID', 'url', 'title', 'source', 'published_at', ':LABEL']),
+        'entities': ('nodes', [':ID', 'name', 'type', ':LABEL']),
+        'mentions': ('relationships', [':START_ID', ':END_ID', 'confidence:float', ':TYPE']),
+        'relationships': ('relationships', [':START_ID', ':END_ID', 'article_id:long', 'source', ':TYPE']),
+    }
+    
+    def __init__(self, output_dir: str = "neo4j_import",
+                 graph_for_article: Callable[[Dict], Dict] = rule_based_article_graph):
+        self.output_dir = Path(output_dir)
+        self.graph_for_article = graph_for_article
+        self.stats = {name: 0 for name in self.FILES}
+    
+    @staticmethod
+    def _text(value: Any) -> str:
+        # Keep every record on one line so the import needs no --multiline-fields
+        return ' '.join(str(value or '').split())
+    
+    def export(self, articles: Iterable[Dict]) -> Dict[str, int]:
+        """Write node and relationship CSVs for a stream of articles.
+        
+        Returns:
+            Row counts per CSV file
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {name: 0 for name in self.FILES}
+        seen_articles: Set[int] = set()
+        seen_entities: Set[int] = set()
+        
+        handles = {name: open(self.output_dir / f"{name}.csv", 'w', encoding='utf-8', newline='')
+                   for name in self.FILES}
+        try:
+            writers = {name: csv.writer(handle) for name, handle in handles.items()}
+            for name, (_, header) in self.FILES.items():
+                writers[name].writerow(header)
+            
+            for article in articles:
+                url = article.get('url') or article.get('id') or article.get('title', '')
+                article_id = stable_node_id('article', url)
+                if article_id in seen_articles:
+                    continue
+                seen_articles.add(article_id)
+                
+                source = article.get('source', 'Unknown')
+                if isinstance(source, dict):
+                    source = source.get('name', 'Unknown')
+                
+                writers['articles'].writerow([
+                    article_id, url, self._text(article.get('title')), self._text(source),
+                    article.get('publishedAt', ''), 'Article'
+                ])
+                self.stats['articles'] += 1
+                
+                graph = self.graph_for_article(article) or {}
+                entity_ids = {}
+                # One MENTIONS edge per entity, however often the article repeats it
+                mentions: Dict[int, float] = {}
+                for entity in graph.get('entities', []):
+                    name = self._text(entity.get('name'))
+                    if len(name) <= 1:
+                        continue
+                    entity_id = stable_node_id('entity', name)
+                    entity_ids[entity.get('name')] = entity_id
+                    
+                    if entity_id not in seen_entities:
+                        seen_entities.add(entity_id)
+                        entity_type = entity.get('type', 'UNKNOWN')
+                        writers['entities'].writerow([entity_id, name, entity_type, f"Entity;{entity_type}"])
+                        self.stats['entities'] += 1
+                    
+                    confidence = entity.get('confidence', 0.5)
+                    mentions[entity_id] = max(confidence, mentions.get(entity_id, confidence))
+                
+                for entity_id, confidence in mentions.items():
+                    writers['mentions'].writerow([article_id, entity_id, confidence, 'MENTIONS'])
+                    self.stats['mentions'] += 1
+                
+                for rel in graph.get('relationships', []):
+                    if rel.get('from') in entity_ids and rel.get('to') in entity_ids and rel.get('type'):
+                        writers['relationships'].writerow([
+                            entity_ids[rel['from']], entity_ids[rel['to']], article_id,
+                            self._text(source), rel['type']
+                        ])
+                        self.stats['relationships'] += 1
+        finally:
+            for handle in handles.values():
+                handle.close()
+        
+        return self.stats
+    
+    def import_command(self, database: str = "neo4j") -> str:
+        """The neo4j-admin command that imports the exported CSVs."""
+        args = [f"--{kind}={self.output_dir / f'{name}.csv'}" for name, (kind, _) in self.FILES.items()]
+        return f"neo4j-admin database import full --id-type=INTEGER {' '.join(args)} {database}"
+
+
+def load_parameter_batches(batch_file: str = "scrantenna_graph.batches.json",
+                           uri: str = "neo4j://localhost:7687", user: str = "neo4j",
+                           password: str = "password") -> bool:
+    """Load exported parameter batches with the neo4j driver, one transaction per batch."""
+    if not neo4j_available:
+        print("❌ The neo4j Python driver is not installed (pip install neo4j)")
+        return False
+    
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        export = json.load(f)
+    
+    start = time.perf_counter()
+    rows_loaded = 0
+    
+    with GraphDatabase.driver(uri, auth=(user, password)) as driver:
+        with driver.session() as session:
+            for statement in export.get('setup', []):
+                session.run(statement).consume()
+            
+            for batch in export['batches']:
+                session.execute_write(
+                    lambda tx, batch=batch: tx.run(batch['query'], rows=batch['rows']).consume()
+                )
+                rows_loaded += len(batch['rows'])
+            
+            for statement in export.get('indices', []):
+                session.run(statement).consume()
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ Loaded {rows_loaded} rows in {len(export['batches'])} batches ({elapsed:.1f}s)")
+    
+    state_file = commit_pending_state(batch_file)
+    if state_file is not None:
+        print(f"✅ Delta export state advanced: {state_file}")
+    return True
+
+
 def main():
     """Main export function."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Export Scrantenna data to Neo4j')
+    parser.add_argument('--format', choices=['cypher', 'batches', 'bulk-csv'], default='cypher',
+                        help='Cypher script for cypher-shell, JSON parameter batches for the driver, '
+                             'or neo4j-admin import CSVs built from the full article archive')
+    parser.add_argument('--output-dir', default='neo4j_import',
+                        help='Output directory for --format bulk-csv (default: neo4j_import)')
+    parser.add_argument('--compress', action='store_true',
+                        help='Write the Cypher script as gzip')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Split the Cypher script into up to N files per phase, by label and '
+                             'relationship type, for parallel import (default: 1)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows per UNWIND batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--delta', action='store_true',
+                        help='Export only articles and edges not yet loaded, as MERGE batches')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE,
+                        help=f'Delta export state file (default: {DEFAULT_STATE_FILE})')
+    parser.add_argument('--load', metavar='BATCH_FILE',
+                        help='Load a batch export into Neo4j with the Python driver')
+    parser.add_argument('--uri', default='neo4j://localhost:7687')
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default=os.getenv('NEO4J_PASSWORD', 'password'))
+    args = parser.parse_args()
+    
+    if args.load:
+        return load_parameter_batches(args.load, args.uri, args.user, args.password)
+    
+    if args.format == 'bulk-csv':
+        from pipeline import ArticleArchive
+        
+        bulk_exporter = Neo4jBulkCSVExporter(args.output_dir)
+        with ArticleArchive() as archive:
+            archive.sync("../data/daily")
+            stats = bulk_exporter.export(archive.iter_range("0000-01-01", "9999-12-31"))
+        
+        print(f"✅ Bulk import CSVs written to {args.output_dir}: {stats}")
+        print(f"   Stop the database, then run:\n   {bulk_exporter.import_command()}")
+        return True
+    
     print("🚀 Scrantenna Neo4j Exporter")
     print("=" * 40)
     
@@ -380,20 +1034,28 @@ def main():
     # Extract graph data
     exporter.extract_graph_data()
     
-    # Generate Cypher commands
-    exporter.generate_cypher_commands()
-    
     # Export to files
     success = True
-    success &= exporter.export_to_file()
+    if args.delta:
+        success &= exporter.export_delta(state_file=args.state_file, batch_size=args.batch_size)
+    elif args.format == 'batches':
+        success &= exporter.export_parameter_batches(batch_size=args.batch_size)
+    else:
+        success &= exporter.export_to_file(compress=args.compress, shards=args.shards)
+        success &= exporter.create_import_script()
     success &= exporter.generate_sample_queries()
-    success &= exporter.create_import_script()
     
     if success:
         print("\n🎉 Export completed successfully!")
         print("\nNext steps:")
         print("1. Start Neo4j Desktop or server")
-        print("2. Run: ./import_to_neo4j.sh")
+        if args.delta:
+            print("2. Run: python neo4j_export.py --load scrantenna_graph.delta.json")
+            print("   The export state only advances once this load succeeds")
+        elif args.format == 'batches':
+            print("2. Run: python neo4j_export.py --load scrantenna_graph.batches.json")
+        else:
+            print("2. Run: ./import_to_neo4j.sh")
         print("3. Open Neo4j Browser: http://localhost:7474")
         print("4. Try queries from sample_queries.cypher")
     else:
@@ -4,66 +4,108 @@ Obsidian Entity Manager for Scrantenna
 Integrates entity extraction with Obsidian vault for knowledge accumulation.
 """
 
+import atexit
 import json
 import os
 import re
-import yaml
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from difflib import SequenceMatcher
+
+from entity_index import FuzzyNameIndex, SearchPatternIndex
+from front_matter import read_front_matter
+from pipeline.serialization import atomic_write_bytes
+from vault_index import VaultIndex
+from vault_lock import vault_file_lock
+from vault_writer import VaultWriteBuffer, apply_mention, apply_relationship
 
 
 class ObsidianEntityManager:
     """Manages entity knowledge base using Obsidian vault structure."""
     
     def __init__(self, vault_path: str = "../entities"):
-        self.vault_path = Path(vault_path)
+        # Absolute, so the exit hook still finds the vault after a chdir
+        self.vault_path = Path(vault_path).resolve()
         self.templates_path = self.vault_path / "templates"
-        self.known_entities = self._load_known_entities()
+        self.index = VaultIndex(self.vault_path, self._parse_front_matter)
+        self.writer = VaultWriteBuffer(self.vault_path)
+        self.known_entities = {}
+        self._entities_by_path = {}
+        self.fuzzy_index = FuzzyNameIndex(threshold=0.8)
+        self.pattern_index = SearchPatternIndex()
+        
+        # Apply updates journaled by a run that exited before flushing
+        recovered = self.writer.recover()
+        if recovered:
+            print(f"Recovering {recovered} unflushed vault updates")
+            self.writer.flush()
+        
+        self._load_known_entities()
         
     def _load_known_entities(self) -> Dict[str, Dict]:
-        """Load all known entities from vault for resolution."""
-        known_entities = {}
+        """Load all known entities from vault for resolution.
         
-        for entity_file in self.vault_path.rglob("*.md"):
-            # Skip template and meta files
-            if "templates" in str(entity_file) or "meta" in str(entity_file) or "dashboards" in str(entity_file):
-                continue
-                
+        Front matter comes from the persistent vault index, so only notes
+        changed since the last run are re-parsed.
+        """
+        for entity_file, metadata in self.index.refresh().items():
             try:
-                metadata = self._parse_front_matter(entity_file)
                 if metadata and 'name' in metadata:
-                    known_entities[metadata['name'].lower()] = {
-                        'file_path': entity_file,
-                        'metadata': metadata,
-                        'canonical_name': metadata['name'],
-                        'aliases': metadata.get('aliases', []),
-                        'search_patterns': metadata.get('search_patterns', []),
-                        'entity_type': metadata.get('entity_type', 'UNKNOWN')
-                    }
-                    
-                    # Add aliases to lookup
-                    for alias in metadata.get('aliases', []):
-                        known_entities[alias.lower()] = known_entities[metadata['name'].lower()]
-                        
+                    self._register_entity(entity_file, metadata)
             except Exception as e:
                 print(f"Error loading entity {entity_file}: {e}")
                 
-        return known_entities
+        return self.known_entities
+    
+    def _register_entity(self, file_path: Path, metadata: Dict, name: Optional[str] = None):
+        """Add or refresh an entity in the in-memory lookup tables."""
+        known = self._entities_by_path.get(file_path)
+        if known is None:
+            known = {'file_path': file_path, 'canonical_name': name or metadata['name']}
+            self._entities_by_path[file_path] = known
+        
+        known.update({
+            'metadata': metadata,
+            'aliases': metadata.get('aliases', []),
+            'search_patterns': metadata.get('search_patterns', []),
+            'entity_type': metadata.get('entity_type', 'UNKNOWN')
+        })
+        
+        self.known_entities[known['canonical_name'].lower()] = known
+        self.fuzzy_index.add(known['canonical_name'], known)
+        self.pattern_index.add(known, known['entity_type'], known['search_patterns'], label=str(file_path))
+        
+        # Add aliases to lookup
+        for alias in known['aliases']:
+            self.known_entities[alias.lower()] = known
+            self.fuzzy_index.add(alias, known)
+    
+    def _record_write(self, file_path: Path, metadata: Dict, name: Optional[str] = None):
+        """Keep the in-memory entities and the vault index in step with a write."""
+        self.index.record(file_path, metadata)
+        if name or file_path in self._entities_by_path or 'name' in metadata:
+            self._register_entity(file_path, metadata, name)
+    
+    def save_index(self):
+        """Persist the vault index."""
+        self.index.save()
+    
+    def flush(self) -> int:
+        """Write all queued entity updates and persist the vault index.
+        
+        Returns:
+            Number of entity files rewritten
+        """
+        written = self.writer.flush()
+        for file_path, front_matter in written.items():
+            self.index.record(file_path, front_matter)
+        self.save_index()
+        return len(written)
     
     def _parse_front_matter(self, file_path: Path) -> Optional[Dict]:
         """Parse YAML front matter from markdown file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            if content.startswith('---'):
-                # Find the end of front matter
-                end_marker = content.find('---', 3)
-                if end_marker != -1:
-                    front_matter = content[3:end_marker].strip()
-                    return yaml.safe_load(front_matter)
+            return read_front_matter(file_path)
         except Exception as e:
             print(f"Error parsing front matter from {file_path}: {e}")
         
@@ -118,75 +160,33 @@ class ObsidianEntityManager:
             if known['entity_type'] == entity_type or entity_type == 'UNKNOWN':
                 return known
         
-        # Strategy 2: Pattern matching
-        for known_name, known_data in self.known_entities.items():
-            if known_data['entity_type'] != entity_type and entity_type != 'UNKNOWN':
-                continue
-                
-            # Check search patterns
-            for pattern in known_data.get('search_patterns', []):
-                if re.search(pattern, entity_name, re.IGNORECASE):
-                    return known_data
-        
-        # Strategy 3: Fuzzy matching
-        best_match = None
-        best_score = 0.8  # Minimum similarity threshold
+        # Strategy 2: Pattern matching (one combined regex per entity type)
+        known = self.pattern_index.match(entity_name, entity_type)
+        if known:
+            return known
         
-        for known_name, known_data in self.known_entities.items():
-            if known_data['entity_type'] != entity_type and entity_type != 'UNKNOWN':
-                continue
-                
-            # Check against canonical name and aliases
-            candidates = [known_data['canonical_name']] + known_data.get('aliases', [])
-            
-            for candidate in candidates:
-                similarity = SequenceMatcher(None, entity_lower, candidate.lower()).ratio()
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = known_data
-        
-        return best_match
+        # Strategy 3: Fuzzy matching against canonical names and aliases,
+        # scoring only candidates shortlisted by the blocking index
+        return self.fuzzy_index.best_match(
+            entity_lower,
+            lambda known: known['entity_type'] == entity_type or entity_type == 'UNKNOWN'
+        )
     
     def _update_entity_file(self, file_path: Path, new_entity_data: Dict):
-        """Update existing entity file with new mention data."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse front matter
-            if content.startswith('---'):
-                end_marker = content.find('---', 3)
-                if end_marker != -1:
-                    front_matter_text = content[3:end_marker].strip()
-                    front_matter = yaml.safe_load(front_matter_text)
-                    body = content[end_marker + 3:]
-                    
-                    # Update metadata
-                    front_matter['mention_count'] = front_matter.get('mention_count', 0) + 1
-                    front_matter['last_mentioned'] = datetime.now().strftime('%Y-%m-%d')
-                    
-                    # Add new alias if different
-                    new_name = new_entity_data.get('name', '')
-                    if (new_name and 
-                        new_name != front_matter.get('name') and 
-                        new_name not in front_matter.get('aliases', [])):
-                        aliases = front_matter.get('aliases', [])
-                        aliases.append(new_name)
-                        front_matter['aliases'] = aliases
-                    
-                    # Update confidence if higher
-                    new_confidence = new_entity_data.get('confidence', 0.5)
-                    if new_confidence > front_matter.get('confidence', 0.5):
-                        front_matter['confidence'] = new_confidence
-                    
-                    # Write updated file
-                    new_content = "---\n" + yaml.dump(front_matter, default_flow_style=False) + "---" + body
-                    
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                        
-        except Exception as e:
-            print(f"Error updating entity file {file_path}: {e}")
+        """Queue a mention update for an existing entity file.
+        
+        The note itself is rewritten once per run by flush().
+        """
+        name = new_entity_data.get('name', '')
+        confidence = new_entity_data.get('confidence', 0.5)
+        date = datetime.now().strftime('%Y-%m-%d')
+        
+        self.writer.add_mention(file_path, name, confidence, date)
+        
+        known = self._entities_by_path.get(file_path)
+        if known:
+            apply_mention(known['metadata'], name, confidence, date)
+            self._register_entity(file_path, known['metadata'])
     
     def _create_new_entity(self, entity_name: str, entity_type: str, entity_data: Dict) -> Optional[Path]:
         """Create new entity file from template."""
@@ -245,11 +245,20 @@ class ObsidianEntityManager:
             # Ensure directory exists
             entity_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write file
-            with open(entity_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Reserve the slug under its lock so concurrent workers create it once
+            with vault_file_lock(self.vault_path, entity_path):
+                created = not entity_path.exists()
+                if created:
+                    atomic_write_bytes(entity_path, content.encode('utf-8'))
+            
+            # Later mentions in this process resolve to the new note
+            self._record_write(entity_path, self._parse_front_matter(entity_path) or {}, name=entity_name)
             
-            print(f"Created new entity: {entity_path}")
+            if created:
+                print(f"Created new entity: {entity_path}")
+            else:
+                # Another worker created it first; count this as a mention
+                self._update_entity_file(entity_path, entity_data)
             return entity_path
             
         except Exception as e:
@@ -308,45 +317,12 @@ class ObsidianEntityManager:
                     self._add_relationship_to_file(to_file, from_entity, reverse_rel, confidence)
     
     def _add_relationship_to_file(self, file_path: Path, target_entity: str, rel_type: str, confidence: float):
-        """Add a relationship to an entity file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if content.startswith('---'):
-                end_marker = content.find('---', 3)
-                if end_marker != -1:
-                    front_matter_text = content[3:end_marker].strip()
-                    front_matter = yaml.safe_load(front_matter_text)
-                    body = content[end_marker + 3:]
-                    
-                    # Add relationship
-                    relationships = front_matter.get('relationships', [])
-                    
-                    # Check if relationship already exists
-                    existing = False
-                    for rel in relationships:
-                        if (rel.get('target') == f"[[{target_entity}]]" and 
-                            rel.get('type') == rel_type):
-                            existing = True
-                            break
-                    
-                    if not existing:
-                        relationships.append({
-                            'target': f"[[{target_entity}]]",
-                            'type': rel_type,
-                            'confidence': confidence
-                        })
-                        front_matter['relationships'] = relationships
-                        
-                        # Write updated file
-                        new_content = "---\n" + yaml.dump(front_matter, default_flow_style=False) + "---" + body
-                        
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(new_content)
-                            
-        except Exception as e:
-            print(f"Error adding relationship to {file_path}: {e}")
+        """Queue a relationship addition for an entity file."""
+        self.writer.add_relationship(file_path, target_entity, rel_type, confidence)
+        
+        known = self._entities_by_path.get(file_path)
+        if known:
+            apply_relationship(known['metadata'], target_entity, rel_type, confidence)
     
     def _get_reverse_relationship(self, rel_type: str) -> Optional[str]:
         """Get reverse relationship type if applicable."""
@@ -391,19 +367,49 @@ class ObsidianEntityManager:
         return stats
 
 
+# One long-lived manager per vault per process
+_managers: Dict[Path, ObsidianEntityManager] = {}
+
+
+def get_entity_manager(vault_path: str = "../entities") -> ObsidianEntityManager:
+    """Return the process-wide manager for a vault, loading it on first use."""
+    key = Path(vault_path).resolve()
+    if key not in _managers:
+        manager = ObsidianEntityManager(key)
+        atexit.register(manager.flush)
+        _managers[key] = manager
+    return _managers[key]
+
+
+def flush_entity_managers() -> int:
+    """Flush queued vault updates for every manager in this process."""
+    return sum(manager.flush() for manager in _managers.values())
+
+
+def close_entity_managers() -> int:
+    """Flush every manager in this process and forget them, exit hooks included."""
+    updated = flush_entity_managers()
+    for manager in _managers.values():
+        atexit.unregister(manager.flush)
+    _managers.clear()
+    return updated
+
+
 # Integration function for use with existing pipeline
-def integrate_with_obsidian(extracted_entities: List[Dict], extracted_relationships: List[Dict]) -> Dict:
+def integrate_with_obsidian(extracted_entities: List[Dict], extracted_relationships: List[Dict],
+                            manager: Optional[ObsidianEntityManager] = None) -> Dict:
     """
     Integrate extracted entities and relationships with Obsidian vault.
     
     Args:
         extracted_entities: List of entities from extraction pipeline
         extracted_relationships: List of relationships from extraction pipeline
+        manager: Entity manager to use; defaults to the shared per-process manager
     
     Returns:
         Dictionary with resolved entities and statistics
     """
-    manager = ObsidianEntityManager()
+    manager = manager or get_entity_manager()
     
     # Resolve entities against known vault
     resolved_entities = manager.resolve_entities(extracted_entities)
@@ -414,6 +420,11 @@ def integrate_with_obsidian(extracted_entities: List[Dict], extracted_relationsh
     # Add relationships between entities
     manager.create_entity_relationships(extracted_relationships, entity_map)
     
+    # Report note paths relative to the working directory, not as absolute paths
+    for entity in resolved_entities:
+        entity['file_path'] = os.path.relpath(entity['file_path'])
+    entity_map = {entity['name']: entity['file_path'] for entity in resolved_entities}
+    
     # Get vault statistics
     stats = manager.get_entity_statistics()
     
@@ -437,6 +448,7 @@ if __name__ == "__main__":
     ]
     
     resolved = manager.resolve_entities(test_entities)
+    manager.flush()
     
     print("🏛️ Obsidian Entity Manager Test Results:")
     print(f"Known entities loaded: {len(manager.known_entities)}")
@@ -1,6 +1,21 @@
 # Pipeline modules for news processing
+from .article_archive import ArticleArchive
+from .dag import PipelineDAG, Task
+from .graph_store import GraphStore
+from .graph_tiles import write_graph_tiles
 from .news_loader import NewsLoader
+from .streaming import Stage, StreamingPipeline, PipelineError
+from .shorts_feed import write_shorts_feed
 
 __all__ = [
-    'NewsLoader'
+    'ArticleArchive',
+    'GraphStore',
+    'NewsLoader',
+    'PipelineDAG',
+    'Stage',
+    'StreamingPipeline',
+    'PipelineError',
+    'Task',
+    'write_graph_tiles',
+    'write_shorts_feed'
 ]
\ No newline at end of file
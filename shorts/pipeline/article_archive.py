@@ -0,0 +1,233 @@
+"""Indexed article archive backed by SQLite."""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_hash TEXT NOT NULL UNIQUE,
+    fingerprint TEXT NOT NULL,
+    date TEXT NOT NULL,
+    published_at TEXT,
+    source TEXT,
+    url TEXT,
+    source_file TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+CREATE INDEX IF NOT EXISTS idx_articles_source_date ON articles (source, date);
+CREATE INDEX IF NOT EXISTS idx_articles_fingerprint ON articles (fingerprint);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    file_name TEXT PRIMARY KEY,
+    file_date TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    article_count INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_imported_files_date ON imported_files (file_date);
+"""
+
+
+def url_hash(url: str) -> str:
+    """Stable hash of an article URL."""
+    return hashlib.sha1(url.strip().encode('utf-8')).hexdigest()
+
+
+def article_fingerprint(article: Dict[str, Any]) -> str:
+    """Content fingerprint of an article's normalized title and description."""
+    title = ' '.join((article.get('title') or '').lower().split())
+    description = ' '.join((article.get('description') or '').lower().split())
+    return hashlib.sha1(f"{title}\n{description}".encode('utf-8')).hexdigest()
+
+
+def date_from_filename(file_path: Path) -> Optional[str]:
+    """Extract the YYYY-MM-DD date from a scranton_news_<date>.json filename."""
+    try:
+        date_str = file_path.stem.split('_')[-1]
+        datetime.strptime(date_str, '%Y-%m-%d')
+        return date_str
+    except (ValueError, IndexError):
+        return None
+
+
+class ArticleArchive:
+    """Article store indexed by date, source, URL hash and fingerprint.
+
+    Daily ``scranton_news_*.json`` files are imported once (and re-imported
+    only when their size or mtime changes), after which range scans and
+    point lookups hit SQLite indexes instead of parsing every daily file.
+    """
+
+    def __init__(self, db_path: str = "../data/archive/articles.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_articles(self, articles: List[Dict[str, Any]], date: Optional[str] = None,
+                     source_file: str = '') -> int:
+        """Insert or refresh articles, returning how many rows were written.
+
+        An article keeps the date it was first archived under; later copies
+        (e.g. the same story in the next day's fetch) only refresh its data.
+        """
+        rows = []
+        for article in articles:
+            if not isinstance(article, dict) or not article.get('title'):
+                continue
+
+            fingerprint = article_fingerprint(article)
+            url = article.get('url') or ''
+            article_date = date or (article.get('publishedAt') or '')[:10] or datetime.now().strftime('%Y-%m-%d')
+            source = article.get('source', {})
+            source_name = source.get('name', '') if isinstance(source, dict) else str(source)
+
+            rows.append((
+                url_hash(url) if url else fingerprint,
+                fingerprint,
+                article_date,
+                article.get('publishedAt', ''),
+                source_name,
+                url,
+                source_file,
+                json.dumps(article, ensure_ascii=False),
+            ))
+
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO articles (url_hash, fingerprint, date, published_at, source, url, source_file, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_hash) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    published_at = excluded.published_at,
+                    source = excluded.source,
+                    data = excluded.data
+                """,
+                rows
+            )
+        return len(rows)
+
+    def import_daily_file(self, file_path: Path, force: bool = False) -> int:
+        """Import a daily news file, skipping it if unchanged since the last import."""
+        file_path = Path(file_path)
+        file_date = date_from_filename(file_path)
+        if file_date is None:
+            print(f"Skipping file with invalid date format: {file_path.name}")
+            return 0
+
+        stat = file_path.stat()
+        if not force:
+            row = self.conn.execute(
+                "SELECT mtime, size FROM imported_files WHERE file_name = ?", (file_path.name,)
+            ).fetchone()
+            if row and row['mtime'] == stat.st_mtime and row['size'] == stat.st_size:
+                return 0
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        articles = data.get('articles', []) if isinstance(data, dict) else data
+
+        count = self.add_articles(articles, date=file_date, source_file=file_path.name)
+
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO imported_files (file_name, file_date, mtime, size, article_count, imported_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (file_path.name, file_date, stat.st_mtime, stat.st_size, count, datetime.now().isoformat())
+            )
+        return count
+
+    def sync(self, data_dir: Path) -> int:
+        """Import new or changed daily files from a directory."""
+        total = 0
+        for news_file in sorted(Path(data_dir).glob("scranton_news_*.json")):
+            try:
+                total += self.import_daily_file(news_file)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error importing {news_file}: {e}")
+        return total
+
+    def iter_range(self, start_date: str, end_date: str, source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield articles archived between two dates (YYYY-MM-DD, inclusive)."""
+        query = "SELECT data FROM articles WHERE date BETWEEN ? AND ?"
+        params: List[Any] = [start_date, end_date]
+        if source is not None:
+            query = "SELECT data FROM articles WHERE source = ? AND date BETWEEN ? AND ?"
+            params.insert(0, source)
+        query += " ORDER BY date, id"
+
+        for row in self.conn.execute(query, params):
+            yield json.loads(row['data'])
+
+    def load_date_range(self, start_date: str, end_date: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load articles archived between two dates (YYYY-MM-DD, inclusive)."""
+        return list(self.iter_range(start_date, end_date, source))
+
+    def last_n_days(self, days: int, today: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load articles archived in the last ``days`` days, including today."""
+        end = datetime.strptime(today, '%Y-%m-%d') if today else datetime.now()
+        start = end - timedelta(days=max(days, 1) - 1)
+        return self.load_date_range(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+
+    def get_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Look up an article by URL."""
+        row = self.conn.execute("SELECT data FROM articles WHERE url_hash = ?", (url_hash(url),)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def get_by_fingerprint(self, fingerprint: str) -> List[Dict[str, Any]]:
+        """Look up articles sharing a content fingerprint."""
+        rows = self.conn.execute("SELECT data FROM articles WHERE fingerprint = ? ORDER BY id", (fingerprint,))
+        return [json.loads(row['data']) for row in rows]
+
+    def available_dates(self) -> List[str]:
+        """List dates that have archived articles."""
+        return [row['date'] for row in self.conn.execute("SELECT DISTINCT date FROM articles ORDER BY date")]
+
+    def latest_date(self) -> Optional[str]:
+        """Most recent archived date, or None if the archive is empty."""
+        row = self.conn.execute("SELECT MAX(date) AS latest FROM articles").fetchone()
+        return row['latest'] if row else None
+
+    def count(self) -> int:
+        """Total number of archived articles."""
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def main():
+    """Import daily news files into the archive."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Import daily news files into the article archive')
+    parser.add_argument('data_dir', nargs='?', default='../data/daily', help='Directory with scranton_news_*.json files')
+    parser.add_argument('--db', default='../data/archive/articles.db', help='Archive database path')
+    args = parser.parse_args()
+
+    with ArticleArchive(args.db) as archive:
+        imported = archive.sync(Path(args.data_dir))
+        print(f"Imported {imported} articles ({archive.count()} total, "
+              f"{len(archive.available_dates())} days)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Build manifests: what an output file was built from.
+
+A manifest sits next to its output (``shorts_data.json`` ->
+``shorts_data.manifest.json``) and records a digest for every input the
+output depends on, plus a digest of the output itself. An output is current
+when the recorded digests match the current ones; otherwise ``check``
+explains what changed, so every rebuild has a stated reason.
+"""
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .dag import file_digest
+from .serialization import write_json
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(output_file: Path) -> Path:
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.stem}.manifest.json")
+
+
+def digest_files(paths: Iterable[Path]) -> str:
+    """One digest over several files' contents (e.g. the sources of a stage)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{Path(path).name}:{file_digest(path)}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def digest_text(*parts: str) -> str:
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class BuildManifest:
+    """Input digests recorded for one output file."""
+
+    def __init__(self, output_file: Path):
+        self.output_file = Path(output_file)
+        self.path = manifest_path(self.output_file)
+
+    def load(self) -> Optional[Dict]:
+        """The recorded manifest, or None if missing, unreadable or from another version."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+    def check(self, inputs: Dict[str, str]) -> Tuple[bool, str]:
+        """Compare current input digests with the manifest.
+
+        Returns:
+            ``(current, reason)``; the reason says why a rebuild is needed, or
+            that the output is up to date
+        """
+        if not self.output_file.exists():
+            return False, f"{self.output_file.name} does not exist"
+
+        manifest = self.load()
+        if manifest is None:
+            return False, f"no readable build manifest ({self.path.name})"
+
+        if manifest.get('output') != file_digest(self.output_file):
+            return False, f"{self.output_file.name} was modified after it was built"
+
+        recorded = manifest.get('inputs', {})
+        changed = sorted(name for name in set(inputs) | set(recorded) if inputs.get(name) != recorded.get(name))
+        if changed:
+            return False, f"inputs changed: {', '.join(changed)}"
+
+        return True, f"up to date (built {manifest.get('built_at', 'unknown')})"
+
+    def write(self, inputs: Dict[str, str]) -> Path:
+        """Record ``inputs`` for the output as it is now on disk."""
+        return write_json(self.path, {
+            'version': MANIFEST_VERSION,
+            'built_at': datetime.now().isoformat(),
+            'output': file_digest(self.output_file),
+            'inputs': dict(sorted(inputs.items()))
+        }, pretty=True)
@@ -0,0 +1,178 @@
+"""In-process pipeline DAG with content-fingerprint skipping.
+
+Each task declares the tasks it depends on, the inputs its result depends
+on (files, or raw bytes for in-memory data) and the files it produces.
+Before a task runs, its inputs are hashed into a fingerprint; if the
+fingerprint matches the last successful run and every output still exists,
+the task is skipped, Make-style. Because downstream inputs are upstream
+outputs, a task that reran but produced identical files does not force its
+dependents to rerun. Independent branches run concurrently on a thread
+pool, and everything shares one interpreter, so imports and loaded models
+stay warm across stages.
+"""
+import hashlib
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .serialization import write_json
+from .streaming import PipelineError
+from .tracing import span
+
+DEFAULT_STATE_FILE = Path(".pipeline_state.json")
+STATE_VERSION = 1
+
+Input = Union[Path, bytes, str]
+
+
+@dataclass
+class Task:
+    """One node of the pipeline DAG.
+
+    ``func`` receives the shared context dict; its return value is stored
+    there under the task's name for downstream tasks. ``inputs`` is called
+    with the context once all dependencies have finished and returns the
+    files (hashed by content), strings or bytes the result depends on.
+    ``always_run`` tasks (e.g. fetching from an external API) are never
+    skipped.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Sequence[str] = ()
+    inputs: Callable[[Dict[str, Any]], Iterable[Input]] = field(default=lambda context: ())
+    outputs: Sequence[Path] = ()
+    always_run: bool = False
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents, or 'missing'."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return 'missing'
+    return digest.hexdigest()
+
+
+class PipelineDAG:
+    """Runs tasks in dependency order, skipping those whose inputs are unchanged."""
+
+    def __init__(self, tasks: List[Task], state_file: Path = DEFAULT_STATE_FILE, workers: int = 4):
+        self.tasks = {task.name: task for task in tasks}
+        if len(self.tasks) != len(tasks):
+            raise ValueError("Task names must be unique")
+        for task in tasks:
+            unknown = [dep for dep in task.deps if dep not in self.tasks]
+            if unknown:
+                raise ValueError(f"Task '{task.name}' depends on unknown tasks: {unknown}")
+        self.order = self._topological_order()
+        self.state_file = Path(state_file)
+        self.workers = max(1, workers)
+        self.statuses: Dict[str, str] = {}
+        self.errors: Dict[str, PipelineError] = {}
+        self._state_lock = threading.Lock()
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through task '{name}'")
+            visiting.add(name)
+            for dep in self.tasks[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.tasks:
+            visit(name)
+        return order
+
+    def fingerprint(self, task: Task, context: Dict[str, Any]) -> str:
+        """Hash of everything the task's result depends on."""
+        digest = hashlib.sha256(task.name.encode('utf-8'))
+        for item in task.inputs(context):
+            if isinstance(item, Path):
+                part = f"file:{item}:{file_digest(item)}"
+            elif isinstance(item, bytes):
+                part = f"bytes:{hashlib.sha256(item).hexdigest()}"
+            else:
+                part = f"str:{item}"
+            digest.update(b'\0' + part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state.get('fingerprints', {}) if state.get('version') == STATE_VERSION else {}
+
+    def _record(self, fingerprints: Dict[str, str], name: str, fingerprint: str):
+        with self._state_lock:
+            fingerprints[name] = fingerprint
+            write_json(self.state_file, {'version': STATE_VERSION, 'fingerprints': fingerprints})
+
+    def _execute(self, name: str, context: Dict[str, Any], fingerprints: Dict[str, str], force: bool) -> str:
+        """Run or skip one task; returns 'ran' or 'skipped'."""
+        task = self.tasks[name]
+        fingerprint = self.fingerprint(task, context)
+        if (not force and not task.always_run and fingerprints.get(name) == fingerprint
+                and all(Path(output).exists() for output in task.outputs)):
+            print(f"⏭️  {name}: inputs unchanged, skipping")
+            return 'skipped'
+
+        print(f"▶️  {name}")
+        with span(f"stage.{name}", category='stage'):
+            context[name] = task.func(context)
+        self._record(fingerprints, name, fingerprint)
+        return 'ran'
+
+    def run(self, context: Optional[Dict[str, Any]] = None, force: bool = False) -> Dict[str, str]:
+        """Run the DAG, overlapping tasks whose dependencies are satisfied.
+
+        A failed task blocks its dependents but not independent branches.
+
+        Returns:
+            Status per task: 'ran', 'skipped', 'failed' or 'blocked'; failures
+            are in ``self.errors``
+        """
+        context = {} if context is None else context
+        fingerprints = self._load_state()
+        self.statuses = {}
+        self.errors = {}
+        pending = list(self.order)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    deps = [self.statuses.get(dep) for dep in self.tasks[name].deps]
+                    if any(status in ('failed', 'blocked') for status in deps):
+                        self.statuses[name] = 'blocked'
+                        pending.remove(name)
+                    elif all(status in ('ran', 'skipped') for status in deps):
+                        running[executor.submit(self._execute, name, context, fingerprints, force)] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.statuses[name] = future.result()
+                    except Exception as e:
+                        self.statuses[name] = 'failed'
+                        self.errors[name] = PipelineError(name, e)
+                        print(f"❌ {self.errors[name]}")
+
+        return {name: self.statuses[name] for name in self.order}
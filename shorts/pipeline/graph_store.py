@@ -0,0 +1,465 @@
+"""Embedded knowledge graph store backed by SQLite adjacency tables.
+
+Answers the routine questions from ``sample_queries.cypher`` (most-mentioned
+entities, neighbors, paths, centrality, co-occurrence, recent mentions, ...)
+without a Neo4j server.
+"""
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Edges and mentions are WITHOUT ROWID tables clustered on their forward
+# key; the secondary indexes cover the reverse direction so adjacency
+# lookups in either direction never touch the base table. Mention counts
+# and degrees are kept on the entity rows, and the entity types an article
+# mentions on its row, so those queries read an index instead of joining.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    mention_count INTEGER NOT NULL DEFAULT 0,
+    degree INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entities_mentions ON entities (mention_count DESC);
+CREATE INDEX IF NOT EXISTS idx_entities_degree ON entities (degree DESC);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT,
+    source TEXT,
+    published_at TEXT,
+    date TEXT,
+    entity_types TEXT,
+    type_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+CREATE INDEX IF NOT EXISTS idx_articles_type_count ON articles (type_count DESC);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    article_id INTEGER NOT NULL,
+    entity_id INTEGER NOT NULL,
+    confidence REAL,
+    PRIMARY KEY (article_id, entity_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_mentions_entity ON mentions (entity_id, article_id);
+
+CREATE TABLE IF NOT EXISTS edges (
+    source_id INTEGER NOT NULL,
+    target_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (source_id, target_id, type, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_edges_target ON edges (target_id, source_id, type);
+"""
+
+# SQLite's default limit on host parameters is 999 on older builds
+IN_CHUNK_SIZE = 500
+
+
+def _chunks(values: List[Any], size: int = IN_CHUNK_SIZE) -> Iterator[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _placeholders(values: List[Any]) -> str:
+    return ','.join('?' * len(values))
+
+
+class GraphStore:
+    """Entities, articles, mentions and relationships in indexed SQLite tables.
+
+    Populated from extraction results (anything carrying a ``graph`` with
+    ``entities`` and ``relationships``, such as the shorts in
+    ``shorts_data.json``); re-adding an article is a no-op.
+    """
+
+    def __init__(self, db_path: str = "../data/archive/graph.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Loading
+
+    def _entity_ids(self, entities: Dict[str, str], cache: Dict[str, int]) -> Dict[str, int]:
+        """Insert missing entities and map every name to its row id."""
+        missing = [(name, entity_type) for name, entity_type in entities.items() if name not in cache]
+        if missing:
+            self.conn.executemany("INSERT OR IGNORE INTO entities (name, type) VALUES (?, ?)", missing)
+            for chunk in _chunks([name for name, _ in missing]):
+                rows = self.conn.execute(
+                    f"SELECT id, name FROM entities WHERE name IN ({_placeholders(chunk)})", chunk
+                )
+                cache.update((row['name'], row['id']) for row in rows)
+        return cache
+
+    def add_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """Add articles with their extracted graphs, returning how many were new."""
+        added = 0
+        entity_ids: Dict[str, int] = {}
+        mention_counts: Counter = Counter()
+        degrees: Counter = Counter()
+
+        with self.conn:
+            for article in articles:
+                key = article.get('url') or article.get('id') or article.get('title')
+                if not key:
+                    continue
+
+                source = article.get('source', 'Unknown')
+                if isinstance(source, dict):
+                    source = source.get('name', 'Unknown')
+                published_at = article.get('publishedAt') or ''
+
+                graph = article.get('graph') or {}
+                entities = {}
+                confidences = {}
+                for entity in graph.get('entities', []):
+                    name = (entity.get('name') or '').strip()
+                    if len(name) > 1:
+                        entities.setdefault(name, entity.get('type', 'UNKNOWN'))
+                        confidences.setdefault(name, entity.get('confidence', 0.5))
+                relationships = {(rel['from'].strip(), rel['to'].strip(), rel['type'])
+                                 for rel in graph.get('relationships', [])
+                                 if rel.get('from') and rel.get('to') and rel.get('type')}
+                for source_name, target_name, _ in relationships:
+                    entities.setdefault(source_name, 'UNKNOWN')
+                    entities.setdefault(target_name, 'UNKNOWN')
+                entity_types = sorted({entities[name] for name in confidences})
+
+                cursor = self.conn.execute(
+                    """
+                    INSERT OR IGNORE INTO articles (key, title, source, published_at, date, entity_types, type_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, article.get('title', ''), source, published_at, published_at[:10] or None,
+                     ','.join(entity_types), len(entity_types))
+                )
+                if not cursor.rowcount:
+                    continue
+                article_id = cursor.lastrowid
+                added += 1
+
+                ids = self._entity_ids(entities, entity_ids)
+                # The article is new, so all of its mentions and edges are too
+                mentions = [(article_id, ids[name], confidence) for name, confidence in confidences.items()]
+                edges = [(ids[source_name], ids[target_name], rel_type, article_id)
+                         for source_name, target_name, rel_type in relationships]
+                self.conn.executemany(
+                    "INSERT INTO mentions (article_id, entity_id, confidence) VALUES (?, ?, ?)", mentions
+                )
+                self.conn.executemany(
+                    "INSERT INTO edges (source_id, target_id, type, article_id) VALUES (?, ?, ?, ?)", edges
+                )
+                mention_counts.update(entity_id for _, entity_id, _ in mentions)
+                degrees.update(node for edge in edges for node in edge[:2])
+
+            self.conn.executemany("UPDATE entities SET mention_count = mention_count + ? WHERE id = ?",
+                                  ((count, entity_id) for entity_id, count in mention_counts.items()))
+            self.conn.executemany("UPDATE entities SET degree = degree + ? WHERE id = ?",
+                                  ((count, entity_id) for entity_id, count in degrees.items()))
+        return added
+
+    def _entity_id(self, name: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+        return row['id'] if row else None
+
+    def _names(self, ids: Iterable[int]) -> Dict[int, str]:
+        names = {}
+        for chunk in _chunks(list(set(ids))):
+            rows = self.conn.execute(f"SELECT id, name FROM entities WHERE id IN ({_placeholders(chunk)})", chunk)
+            names.update((row['id'], row['name']) for row in rows)
+        return names
+
+    # Sample query shapes
+
+    def most_mentioned(self, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """1. Entities mentioned by the most articles: (name, type, mentions)."""
+        rows = self.conn.execute(
+            "SELECT name, type, mention_count FROM entities ORDER BY mention_count DESC LIMIT ?", (limit,)
+        )
+        return [tuple(row) for row in rows]
+
+    def neighbors(self, name: str) -> List[Tuple[str, str, str, str]]:
+        """2. Entities related to ``name``: (relationship type, direction, name, type)."""
+        entity_id = self._entity_id(name)
+        if entity_id is None:
+            return []
+        rows = self.conn.execute(
+            """
+            SELECT DISTINCT e.type AS rel_type, 'out' AS direction, n.name, n.type
+            FROM edges e JOIN entities n ON n.id = e.target_id WHERE e.source_id = :id
+            UNION
+            SELECT DISTINCT e.type, 'in', n.name, n.type
+            FROM edges e JOIN entities n ON n.id = e.source_id WHERE e.target_id = :id
+            ORDER BY 1, 3
+            """,
+            {'id': entity_id}
+        )
+        return [tuple(row) for row in rows]
+
+    def source_stats(self) -> List[Tuple[str, int, int]]:
+        """3. Per source: (source, distinct entities mentioned, articles)."""
+        rows = self.conn.execute(
+            """
+            SELECT a.source, COUNT(DISTINCT m.entity_id) AS entity_count, COUNT(DISTINCT a.id) AS articles
+            FROM articles a JOIN mentions m ON m.article_id = a.id
+            GROUP BY a.source ORDER BY entity_count DESC
+            """
+        )
+        return [tuple(row) for row in rows]
+
+    def _adjacent(self, ids: Set[int]) -> Iterator[Tuple[int, int, str]]:
+        """Yield (node, neighbor, relationship type) for edges touching ``ids``, either direction."""
+        for chunk in _chunks(list(ids)):
+            marks = _placeholders(chunk)
+            yield from self.conn.execute(
+                f"""
+                SELECT DISTINCT source_id, target_id, type FROM edges WHERE source_id IN ({marks})
+                UNION
+                SELECT DISTINCT target_id, source_id, type FROM edges WHERE target_id IN ({marks})
+                """,
+                chunk + chunk
+            )
+
+    def find_paths(self, source: str, target: str, max_depth: int = 3,
+                   limit: int = 5) -> List[Dict[str, List[str]]]:
+        """4. Shortest paths of at most ``max_depth`` hops between two entities.
+
+        Bidirectional breadth-first search over relationships in either
+        direction, expanding the smaller frontier one level at a time.
+
+        Returns:
+            Up to ``limit`` paths as ``{'nodes': [...], 'relationships': [...]}``
+        """
+        source_id, target_id = self._entity_id(source), self._entity_id(target)
+        if source_id is None or target_id is None:
+            return []
+        if source_id == target_id:
+            return [{'nodes': [source], 'relationships': []}]
+
+        # node -> [(parent, relationship type)] toward the side's root, and hop counts
+        forward, backward = {source_id: []}, {target_id: []}
+        forward_depth, backward_depth = {source_id: 0}, {target_id: 0}
+        forward_frontier, backward_frontier = {source_id}, {target_id}
+
+        for _ in range(max_depth):
+            if not forward_frontier or not backward_frontier:
+                return []
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                parents, depth, frontier, other_depth = forward, forward_depth, forward_frontier, backward_depth
+            else:
+                parents, depth, frontier, other_depth = backward, backward_depth, backward_frontier, forward_depth
+
+            discovered = {}
+            for node, neighbor, rel_type in self._adjacent(frontier):
+                if neighbor not in parents:
+                    discovered.setdefault(neighbor, []).append((node, rel_type))
+            level = depth[next(iter(frontier))] + 1
+            parents.update(discovered)
+            depth.update((node, level) for node in discovered)
+            if expand_forward:
+                forward_frontier = set(discovered)
+            else:
+                backward_frontier = set(discovered)
+
+            meeting = [node for node in discovered if node in other_depth]
+            if meeting:
+                # Only meeting points on a shortest path
+                closest = min(other_depth[node] for node in meeting)
+                meeting = sorted(node for node in meeting if other_depth[node] == closest)
+                paths = list(islice(self._join_paths(meeting, forward, backward), limit))
+                names = self._names(node for nodes, _ in paths for node in nodes)
+                return [{'nodes': [names[node] for node in nodes], 'relationships': rel_types}
+                        for nodes, rel_types in paths]
+        return []
+
+    @staticmethod
+    def _walk(node: int, parents: Dict[int, List[Tuple[int, str]]]) -> Iterator[Tuple[List[int], List[str]]]:
+        """Yield (nodes, relationship types) from ``node`` back to the root of ``parents``."""
+        if not parents[node]:
+            yield [node], []
+            return
+        for parent, rel_type in parents[node]:
+            for nodes, rel_types in GraphStore._walk(parent, parents):
+                yield [node] + nodes, [rel_type] + rel_types
+
+    def _join_paths(self, meeting: List[int], forward, backward) -> Iterator[Tuple[List[int], List[str]]]:
+        for node in meeting:
+            for head_nodes, head_types in self._walk(node, forward):
+                for tail_nodes, tail_types in self._walk(node, backward):
+                    yield head_nodes[::-1] + tail_nodes[1:], head_types[::-1] + tail_types
+
+    def timeline(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Tuple[str, int]]:
+        """5. Distinct entities mentioned per publication date, newest first."""
+        rows = self.conn.execute(
+            """
+            SELECT a.date, COUNT(DISTINCT m.entity_id) AS entities
+            FROM articles a JOIN mentions m ON m.article_id = a.id
+            WHERE a.date BETWEEN ? AND ?
+            GROUP BY a.date ORDER BY a.date DESC
+            """,
+            (start_date or '0000-01-01', end_date or '9999-12-31')
+        )
+        return [tuple(row) for row in rows]
+
+    def top_by_degree(self, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """6. Degree centrality over entity relationships: (name, type, connections)."""
+        rows = self.conn.execute("SELECT name, type, degree FROM entities ORDER BY degree DESC LIMIT ?", (limit,))
+        return [tuple(row) for row in rows]
+
+    def communities(self, min_size: int = 2) -> List[List[str]]:
+        """7. Groups of entities connected through relationships, largest first.
+
+        Connected components via union-find in one pass over the edge index;
+        a cheap stand-in for the GDS Louvain query.
+        """
+        parent: Dict[int, int] = {}
+
+        def find(node: int) -> int:
+            root = parent.setdefault(node, node)
+            while root != parent[root]:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        for source_id, target_id in self.conn.execute("SELECT DISTINCT source_id, target_id FROM edges"):
+            a, b = find(source_id), find(target_id)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+        groups: Dict[int, List[int]] = {}
+        for node in parent:
+            groups.setdefault(find(node), []).append(node)
+        members = [group for group in groups.values() if len(group) >= min_size]
+        names = self._names(node for group in members for node in group)
+        return sorted((sorted(names[node] for node in group) for group in members), key=lambda g: (-len(g), g))
+
+    def multi_type_articles(self, min_types: int = 3) -> List[Tuple[str, str, List[str]]]:
+        """8. Articles mentioning at least ``min_types`` entity types: (title, source, types)."""
+        rows = self.conn.execute(
+            "SELECT title, source, entity_types FROM articles WHERE type_count >= ? ORDER BY type_count DESC, id",
+            (min_types,)
+        )
+        return [(row['title'], row['source'], row['entity_types'].split(',')) for row in rows]
+
+    def recent_mentions(self, days: int = 7, today: Optional[str] = None,
+                        limit: int = 15) -> List[Tuple[str, str, int]]:
+        """9. Entities mentioned most in the last ``days`` days: (name, type, mentions)."""
+        end = datetime.strptime(today, '%Y-%m-%d') if today else datetime.now()
+        start = (end - timedelta(days=max(days, 1) - 1)).strftime('%Y-%m-%d')
+        rows = self.conn.execute(
+            """
+            SELECT e.name, e.type, COUNT(*) AS recent_mentions
+            FROM articles a
+            JOIN mentions m ON m.article_id = a.id
+            JOIN entities e ON e.id = m.entity_id
+            WHERE a.date BETWEEN ? AND ?
+            GROUP BY e.id ORDER BY recent_mentions DESC, e.name LIMIT ?
+            """,
+            (start, end.strftime('%Y-%m-%d'), limit)
+        )
+        return [tuple(row) for row in rows]
+
+    def co_occurrences(self, limit: int = 20, entity: Optional[str] = None,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """10. Entity pairs mentioned in the same articles: (name, name, articles).
+
+        With ``entity``, only pairs including that entity are counted, which
+        reads just the articles mentioning it. Otherwise every article is
+        paired up, so pass a date range for routine (e.g. weekly) questions.
+        """
+        if entity is not None:
+            entity_id = self._entity_id(entity)
+            if entity_id is None:
+                return []
+            rows = self.conn.execute(
+                """
+                SELECT m2.entity_id AS other, COUNT(*) AS together
+                FROM mentions m1 JOIN mentions m2 ON m2.article_id = m1.article_id AND m2.entity_id != m1.entity_id
+                WHERE m1.entity_id = ?
+                GROUP BY m2.entity_id ORDER BY together DESC LIMIT ?
+                """,
+                (entity_id, limit)
+            ).fetchall()
+            names = self._names(row['other'] for row in rows)
+            return [tuple(sorted((entity, names[row['other']]))) + (row['together'],) for row in rows]
+
+        if start_date or end_date:
+            mentions = self.conn.execute(
+                """
+                SELECT m.article_id, m.entity_id FROM articles a JOIN mentions m ON m.article_id = a.id
+                WHERE a.date BETWEEN ? AND ? ORDER BY m.article_id
+                """,
+                (start_date or '0000-01-01', end_date or '9999-12-31')
+            )
+        else:
+            mentions = self.conn.execute("SELECT article_id, entity_id FROM mentions ORDER BY article_id")
+
+        counts: Counter = Counter()
+        article_entities: List[int] = []
+        current = None
+        # One ordered pass over the mentions primary key, pairing within each article
+        for article_id, entity_id in mentions:
+            if article_id != current:
+                current, article_entities = article_id, []
+            for other in article_entities:
+                counts[(other, entity_id) if other < entity_id else (entity_id, other)] += 1
+            article_entities.append(entity_id)
+
+        top = counts.most_common(limit)
+        names = self._names(node for pair, _ in top for node in pair)
+        pairs = [tuple(sorted((names[a], names[b]))) + (count,) for (a, b), count in top]
+        return sorted(pairs, key=lambda pair: (-pair[2], pair[0], pair[1]))
+
+    def count(self) -> Dict[str, int]:
+        """Row counts per table."""
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('entities', 'articles', 'mentions', 'edges')}
+
+
+def main():
+    """Load shorts into the graph store and print the daily summary queries."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Load extraction results into the embedded graph store')
+    parser.add_argument('shorts_files', nargs='*', default=['shorts_data.json'], help='shorts_data.json files to load')
+    parser.add_argument('--db', default='../data/archive/graph.db', help='Graph database path')
+    args = parser.parse_args()
+
+    with GraphStore(args.db) as store:
+        for shorts_file in args.shorts_files:
+            with open(shorts_file, 'r', encoding='utf-8') as f:
+                added = store.add_articles(json.load(f).get('shorts', []))
+            print(f"Loaded {added} new articles from {shorts_file}")
+
+        print(f"Graph: {store.count()}")
+        print("Most mentioned:", store.most_mentioned(5))
+        print("Most connected:", store.top_by_degree(5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Per-entity neighborhood tiles for browsing the knowledge graph in the web UI.
+
+The cumulative knowledge_graph.json grows every day, so the browser loads a
+small index mapping each entity name to its tiles instead: one tile with the
+entity's 1-hop ego graph and one with its 2-hop ego graph. Fan-out is capped
+at every hop, keeping the strongest edges (by mention count), so a tile stays
+small no matter how connected the entity is or how large the graph gets.
+Tile filenames are content hashes: unchanged neighborhoods keep their names
+across runs and can be cached forever; only the index changes per run.
+"""
+import hashlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from .serialization import atomic_write_bytes, dumps, write_json, write_precompressed
+
+INDEX_NAME = "index.json"
+TILES_VERSION = 1
+DEFAULT_MAX_FANOUT = 20
+DEFAULT_SECOND_HOP_FANOUT = 5
+DEFAULT_MAX_NODES = 100
+
+
+def _weighted_neighbors(graph_data: Dict[str, Any]) -> Tuple[Dict[str, List[str]], Dict[Tuple[str, str], List[Dict]]]:
+    """Neighbors of every entity, strongest first, plus the relationships per pair.
+
+    Returns:
+        ``(neighbors, pair_relationships)`` where ``neighbors[name]`` is sorted by
+        descending edge weight (then name) and pair keys are sorted name tuples
+    """
+    names_by_id = {entity['id']: name for name, entity in graph_data.get('entities', {}).items()}
+    weights: Dict[Tuple[str, str], int] = defaultdict(int)
+    pair_relationships: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+
+    for rel in graph_data.get('relationships', []):
+        source, target = names_by_id.get(rel.get('subject')), names_by_id.get(rel.get('object'))
+        if not source or not target or source == target:
+            continue
+        pair = (source, target) if source < target else (target, source)
+        weight = rel.get('mention_count', 1)
+        weights[pair] += weight
+        pair_relationships[pair].append({
+            'from': source,
+            'to': target,
+            'type': rel.get('relationship', 'RELATED_TO'),
+            'weight': weight
+        })
+
+    adjacency: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+    for (a, b), weight in weights.items():
+        adjacency[a].append((-weight, b))
+        adjacency[b].append((-weight, a))
+    neighbors = {name: [other for _, other in sorted(entries)] for name, entries in adjacency.items()}
+    return neighbors, pair_relationships
+
+
+def ego_graph(center: str, hops: int, neighbors: Dict[str, List[str]],
+              max_fanout: int = DEFAULT_MAX_FANOUT,
+              second_hop_fanout: int = DEFAULT_SECOND_HOP_FANOUT,
+              max_nodes: int = DEFAULT_MAX_NODES) -> Dict[str, int]:
+    """Entities within ``hops`` (1 or 2) of ``center``, mapped to their hop distance.
+
+    The center keeps its ``max_fanout`` strongest neighbors; each of those
+    adds at most ``second_hop_fanout`` of its own, up to ``max_nodes`` total.
+    """
+    members = {center: 0}
+    for name in neighbors.get(center, [])[:max_fanout]:
+        members[name] = 1
+
+    if hops >= 2:
+        for name in [name for name, hop in members.items() if hop == 1]:
+            added = 0
+            for other in neighbors.get(name, []):
+                if len(members) >= max_nodes or added >= second_hop_fanout:
+                    break
+                if other not in members:
+                    members[other] = 2
+                    added += 1
+    return members
+
+
+def build_tile(center: str, members: Dict[str, int], graph_data: Dict[str, Any],
+               neighbors: Dict[str, List[str]], pair_relationships: Dict[Tuple[str, str], List[Dict]],
+               max_fanout: int = DEFAULT_MAX_FANOUT) -> Dict[str, Any]:
+    """Tile payload in the same entities/relationships shape as a short's graph.
+
+    Edges between members are found through each member's capped neighbor
+    list, so building a tile never walks a hub's full adjacency.
+    """
+    entities = graph_data.get('entities', {})
+    seen_pairs: Set[Tuple[str, str]] = set()
+    relationships = []
+    for name in members:
+        for other in neighbors.get(name, [])[:max_fanout]:
+            pair = (name, other) if name < other else (other, name)
+            if other in members and pair not in seen_pairs:
+                seen_pairs.add(pair)
+                relationships.extend(pair_relationships[pair])
+
+    return {
+        'center': center,
+        'entities': [
+            {
+                'name': name,
+                'type': entities.get(name, {}).get('type', 'OTHER'),
+                'mention_count': entities.get(name, {}).get('mention_count', 0),
+                'degree': len(neighbors.get(name, [])),
+                'hop': hop
+            }
+            for name, hop in members.items()
+        ],
+        'relationships': sorted(relationships, key=lambda rel: (rel['from'], rel['to'], rel['type']))
+    }
+
+
+def _write_tile(tiles_dir: Path, tile: Dict[str, Any]) -> str:
+    """Write a tile under its content hash (if not already there) and return the filename."""
+    payload = dumps(tile, pretty=False)
+    filename = f"{hashlib.sha1(payload).hexdigest()[:16]}.json"
+    path = tiles_dir / filename
+    if not path.exists():
+        atomic_write_bytes(path, payload)
+        write_precompressed(path, payload)
+    return filename
+
+
+def write_graph_tiles(graph_data: Dict[str, Any], tiles_dir: Path = Path("../data/graph/tiles"),
+                      max_fanout: int = DEFAULT_MAX_FANOUT,
+                      second_hop_fanout: int = DEFAULT_SECOND_HOP_FANOUT,
+                      max_nodes: int = DEFAULT_MAX_NODES) -> Path:
+    """Write 1-hop and 2-hop neighborhood tiles for every entity, plus the index.
+
+    Args:
+        graph_data: The knowledge_graph.json structure from graph_generator
+        tiles_dir: Output directory for tiles and index
+        max_fanout: Strongest neighbors kept around the center (and per member
+            when collecting edges)
+        second_hop_fanout: Neighbors added through each first-hop neighbor
+        max_nodes: Upper bound on entities in a 2-hop tile
+
+    Returns:
+        Path to the written index
+    """
+    tiles_dir = Path(tiles_dir)
+    neighbors, pair_relationships = _weighted_neighbors(graph_data)
+    index: Dict[str, List[str]] = {}
+    written = set()
+
+    for name in sorted(graph_data.get('entities', {})):
+        tiles = []
+        previous_members = None
+        for hops in (1, 2):
+            members = ego_graph(name, hops, neighbors, max_fanout, second_hop_fanout, max_nodes)
+            if members == previous_members:
+                # Nothing beyond the first hop; both levels share one tile
+                tiles.append(tiles[-1])
+                continue
+            tile = build_tile(name, members, graph_data, neighbors, pair_relationships, max_fanout)
+            tiles.append(_write_tile(tiles_dir, tile))
+            previous_members = members
+        written.update(tiles)
+        index[name] = tiles
+
+    index_path = write_json(tiles_dir / INDEX_NAME, {
+        "version": TILES_VERSION,
+        "generated_at": graph_data.get('generated_at'),
+        "max_fanout": max_fanout,
+        "entities": index
+    }, compress=True)
+
+    _remove_stale_tiles(tiles_dir, written)
+    return index_path
+
+
+def _remove_stale_tiles(tiles_dir: Path, keep: Set[str]):
+    """Delete tiles no longer referenced by the index."""
+    for path in tiles_dir.glob("*.json*"):
+        base = path.name
+        for suffix in ('.gz', '.br'):
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+        if base != INDEX_NAME and base not in keep:
+            path.unlink()
@@ -1,26 +1,171 @@
 """News loading module."""
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable
 from datetime import datetime
 
+from .article_archive import ArticleArchive, date_from_filename
+
+# Use ijson's C backend for incremental parsing when it is installed
+try:
+    import ijson
+    ijson_available = True
+    # ijson's parse errors derive from Exception, not ValueError
+    PARSE_ERRORS = (ValueError, ijson.common.JSONError)
+except ImportError:
+    ijson_available = False
+    PARSE_ERRORS = (ValueError,)
+
+JSON_WHITESPACE = ' \t\r\n'
+
+
+class _IncrementalJSONReader:
+    """Minimal pull parser that decodes one JSON value at a time from a file.
+    
+    Only the current value and one read chunk are held in memory, so a
+    daily file can be streamed article by article without ``json.load``.
+    """
+    
+    def __init__(self, f, chunk_size: int = 65536):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        """Read the next chunk, discarding everything already consumed."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+    
+    def expect(self, char: str):
+        """Consume ``char`` or fail."""
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A value ending exactly at the buffer edge may be a truncated number
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+    
+    def array_items(self) -> Iterator[Any]:
+        """Yield the items of the array starting at the current position."""
+        self.expect('[')
+        while True:
+            char = self.peek()
+            if char == ']':
+                self.pos += 1
+                return
+            if char == ',':
+                self.pos += 1
+                continue
+            if not char:
+                raise ValueError("Unexpected end of file inside array")
+            yield self.value()
+
+
+def iter_json_articles(file_path: Path, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """Yield raw articles from a news file without loading the whole file.
+    
+    Handles both ``{"articles": [...]}`` files and bare article lists.
+    """
+    with open(file_path, 'rb') as probe:
+        head = probe.read(64).lstrip()
+    is_list = head.startswith(b'[')
+    
+    if ijson_available:
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, 'item' if is_list else 'articles.item', use_float=True)
+        return
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        reader = _IncrementalJSONReader(f, chunk_size)
+        if is_list:
+            yield from reader.array_items()
+            return
+        
+        reader.expect('{')
+        while True:
+            char = reader.peek()
+            if char == '}' or not char:
+                return
+            if char == ',':
+                reader.pos += 1
+                continue
+            key = reader.value()
+            reader.expect(':')
+            if key == 'articles' and reader.peek() == '[':
+                yield from reader.array_items()
+            else:
+                reader.value()  # Small metadata values (query, fetched_at, ...)
+
+
 class NewsLoader:
-    """Handles loading news articles from various sources."""
+    """Handles loading news articles from various sources.
     
-    def __init__(self, data_dir: str = "../data/daily"):
+    When an ``ArticleArchive`` is given, date-range queries are answered
+    from its indexes; new or changed daily files are imported on first use.
+    The latest file is always found and read from the data directory.
+    """
+    
+    def __init__(self, data_dir: str = "../data/daily", archive: Optional[ArticleArchive] = None):
         self.data_dir = Path(data_dir)
-        
-    def load_latest(self) -> List[Dict[str, Any]]:
-        """Load the latest news file."""
-        # Find the most recent news file
+        self.archive = archive
+        self._archive_synced = False
+    
+    def _synced_archive(self) -> Optional[ArticleArchive]:
+        """Return the archive backend, importing new daily files once per loader."""
+        if self.archive is not None and not self._archive_synced:
+            if self.data_dir.exists():
+                self.archive.sync(self.data_dir)
+            self._archive_synced = True
+        return self.archive
+    
+    def latest_file(self) -> Path:
+        """Find the most recent daily news file."""
         news_files = list(self.data_dir.glob("scranton_news_*.json"))
         
         if not news_files:
             raise FileNotFoundError(f"No news files found in {self.data_dir}")
         
         # Sort by filename (contains date)
-        latest_file = sorted(news_files)[-1]
-        return self.load_from_file(latest_file)
+        return sorted(news_files)[-1]
+        
+    def load_latest(self) -> List[Dict[str, Any]]:
+        """Load the latest news file.
+        
+        Always read from the file itself: the archive files an article under
+        the day it was first seen, so a date query would miss stories that
+        were carried over into the latest fetch.
+        """
+        return self.load_from_file(self.latest_file())
     
     def load_from_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """Load articles from a specific file."""
@@ -45,6 +190,12 @@ class NewsLoader:
     
     def load_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Load articles from a date range (YYYY-MM-DD format)."""
+        archive = self._synced_archive()
+        if archive is not None:
+            articles = archive.load_date_range(start_date, end_date)
+            print(f"Loaded {len(articles)} articles from date range {start_date} to {end_date}")
+            return articles
+        
         articles = []
         
         for news_file in self.data_dir.glob("scranton_news_*.json"):
@@ -66,36 +217,105 @@ class NewsLoader:
         print(f"Loaded {len(articles)} articles from date range {start_date} to {end_date}")
         return articles
     
-    def validate_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Validate and clean article data."""
-        valid_articles = []
-        required_fields = ['title']
+    def iter_from_file(self, file_path: Path, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+        """Lazily yield raw articles from a specific file."""
+        try:
+            yield from iter_json_articles(file_path, chunk_size)
+        except (OSError, *PARSE_ERRORS) as e:
+            print(f"Error streaming {file_path}: {e}")
+    
+    def iter_articles(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      fields: Optional[List[str]] = None,
+                      where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                      validate: bool = True) -> Iterator[Dict[str, Any]]:
+        """Lazily yield cleaned articles across every file in a date range.
         
-        for article in articles:
-            # Check required fields
-            if not all(field in article and article[field] for field in required_fields):
+        Memory stays constant regardless of the range: only one article (and
+        one read chunk) is held at a time.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date to include (YYYY-MM-DD), or None for no upper bound
+            fields: Only keep these fields of each article (projection)
+            where: Predicate applied to each cleaned article
+            validate: Validate and clean articles like ``validate_articles``
+        """
+        for article in self._iter_raw_articles(start_date, end_date):
+            if validate:
+                cleaned = self.clean_article(article)
+                if not cleaned:
+                    continue
+                # Keep extra fields (e.g. distilled versions) available for projection
+                article = {**article, **cleaned} if fields else cleaned
+            
+            if where is not None and not where(article):
                 continue
             
-            # Clean and normalize fields
-            cleaned_article = {
-                'title': self._clean_text(article.get('title', '')),
-                'description': self._clean_text(article.get('description', '')),
-                'content': self._clean_text(article.get('content', '')),
-                'url': article.get('url', ''),
-                'publishedAt': article.get('publishedAt', ''),
-                'source': article.get('source', {}),
-                'urlToImage': article.get('urlToImage', ''),
-            }
+            if fields:
+                article = {field: article.get(field) for field in fields}
             
-            # Ensure we have some content
-            if (cleaned_article['title'] or 
-                cleaned_article['description'] or 
-                cleaned_article['content']):
-                valid_articles.append(cleaned_article)
+            yield article
+    
+    def _iter_raw_articles(self, start_date: Optional[str], end_date: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Yield raw articles in date order from the archive or daily files."""
+        archive = self._synced_archive()
+        if archive is not None:
+            yield from archive.iter_range(start_date or '0000-00-00', end_date or '9999-99-99')
+            return
+        
+        dated_files = []
+        for news_file in self.data_dir.glob("scranton_news_*.json"):
+            file_date = date_from_filename(news_file)
+            if file_date is None:
+                continue
+            if (start_date and file_date < start_date) or (end_date and file_date > end_date):
+                continue
+            dated_files.append((file_date, news_file))
+        
+        for _, news_file in sorted(dated_files):
+            yield from self.iter_from_file(news_file)
+    
+    def iter_validated(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Lazily validate and clean articles."""
+        for article in articles:
+            cleaned_article = self.clean_article(article)
+            if cleaned_article:
+                yield cleaned_article
+    
+    def validate_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validate and clean article data."""
+        valid_articles = list(self.iter_validated(articles))
         
         print(f"Validated {len(valid_articles)} articles")
         return valid_articles
     
+    def clean_article(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Validate and clean a single article, returning None if it is unusable."""
+        required_fields = ['title']
+        
+        # Check required fields
+        if not all(field in article and article[field] for field in required_fields):
+            return None
+        
+        # Clean and normalize fields
+        cleaned_article = {
+            'title': self._clean_text(article.get('title', '')),
+            'description': self._clean_text(article.get('description', '')),
+            'content': self._clean_text(article.get('content', '')),
+            'url': article.get('url', ''),
+            'publishedAt': article.get('publishedAt', ''),
+            'source': article.get('source', {}),
+            'urlToImage': article.get('urlToImage', ''),
+        }
+        
+        # Ensure we have some content
+        if (cleaned_article['title'] or 
+            cleaned_article['description'] or 
+            cleaned_article['content']):
+            return cleaned_article
+        
+        return None
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
         if not text:
@@ -120,6 +340,10 @@ class NewsLoader:
     
     def get_available_dates(self) -> List[str]:
         """Get list of available dates with news data."""
+        archive = self._synced_archive()
+        if archive is not None:
+            return archive.available_dates()
+        
         dates = []
         
         for news_file in self.data_dir.glob("scranton_news_*.json"):
@@ -0,0 +1,134 @@
+"""JSON serialization for pipeline outputs.
+
+Production output is compact (no indentation) and encoded with orjson when
+it is installed; set ``SCRANTENNA_JSON_MODE=pretty`` for indented, diffable
+debug output. Files are written atomically, and web-facing files can get
+precompressed ``.gz``/``.br`` siblings for static hosting.
+"""
+import gzip
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+try:
+    import brotli
+    brotli_available = True
+except ImportError:
+    brotli_available = False
+
+from .tracing import span
+
+JSON_MODE_ENV = 'SCRANTENNA_JSON_MODE'
+
+# mkstemp creates files as 0600; new outputs get the mode open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def is_pretty_mode() -> bool:
+    """Check whether debug (indented) JSON output is enabled."""
+    return os.getenv(JSON_MODE_ENV, 'compact').lower() == 'pretty'
+
+
+def dumps(data: Any, pretty: Optional[bool] = None) -> bytes:
+    """Serialize data to UTF-8 JSON bytes."""
+    if pretty is None:
+        pretty = is_pretty_mode()
+
+    if orjson_available:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # orjson rejects some inputs the stdlib accepts (e.g. non-str keys)
+            pass
+
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+def atomic_write_bytes(path: Path, payload: bytes):
+    """Write a file via a temp file and rename so readers never see partial output."""
+    atomic_write_chunks(path, [payload])
+
+
+def _target_mode(path: Path) -> int:
+    """Permissions for a rewritten file: the existing file's, else the umask default."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_chunks(path: Path, chunks: Iterable[bytes]):
+    """Atomically write a file from an iterable of byte chunks."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with span('write', category='io', path=str(path)) as write_span:
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=str(path.parent))
+        written = 0
+        try:
+            os.fchmod(fd, _target_mode(path))
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    written += f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        write_span.set(bytes=written)
+
+
+def write_precompressed(path: Path, payload: bytes) -> List[Path]:
+    """Write ``.gz`` (and ``.br`` when brotli is installed) siblings of a file."""
+    path = Path(path)
+    written = []
+
+    # mtime=0 keeps the gzip output byte-identical for identical payloads
+    gz_path = path.with_name(path.name + '.gz')
+    atomic_write_bytes(gz_path, gzip.compress(payload, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    if brotli_available:
+        br_path = path.with_name(path.name + '.br')
+        atomic_write_bytes(br_path, brotli.compress(payload, quality=11))
+        written.append(br_path)
+
+    return written
+
+
+def write_json(path: Path, data: Any, pretty: Optional[bool] = None, compress: bool = False) -> Path:
+    """Atomically write data as JSON.
+
+    Args:
+        path: Output file path
+        data: JSON-serializable data
+        pretty: Force indented (True) or compact (False) output; defaults to the
+            ``SCRANTENNA_JSON_MODE`` environment setting
+        compress: Also write precompressed siblings for web-facing files
+
+    Returns:
+        The path that was written
+    """
+    path = Path(path)
+    payload = dumps(data, pretty)
+    atomic_write_bytes(path, payload)
+    if compress:
+        write_precompressed(path, payload)
+    return path
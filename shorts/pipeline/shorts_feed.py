@@ -0,0 +1,107 @@
+"""Chunked shorts feed for lazy loading in the web player.
+
+The feed is a small manifest plus fixed-size chunk files, with each short's
+graph payload in its own file. Chunk and graph filenames carry a content
+hash, so they can be cached forever; only the manifest changes per run.
+"""
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .serialization import dumps, write_json
+
+DEFAULT_CHUNK_SIZE = 5
+MANIFEST_NAME = "manifest.json"
+FEED_VERSION = 1
+
+
+def _content_name(stem: str, data: Any) -> str:
+    """Build a content-addressed filename for a JSON payload."""
+    digest = hashlib.sha1(dumps(data, pretty=False)).hexdigest()[:12]
+    return f"{stem}.{digest}.json"
+
+
+def _split_graph(short: Dict[str, Any], graphs_dir: Path, feed_dir: Path) -> Dict[str, Any]:
+    """Move a short's graph into its own file and leave a reference behind."""
+    graph = short.get('graph')
+    light_short = {key: value for key, value in short.items() if key != 'graph'}
+    if not graph:
+        return light_short
+
+    graph_file = graphs_dir / _content_name(short.get('id', 'graph'), graph)
+    if not graph_file.exists():
+        write_json(graph_file, graph, compress=True)
+
+    light_short['graph_url'] = graph_file.relative_to(feed_dir).as_posix()
+    light_short['graph_summary'] = {
+        'entities': len(graph.get('entities', [])),
+        'relationships': len(graph.get('relationships', [])),
+    }
+    # The player styles headlines by it before the graph file is loaded
+    if 'has_svo' in graph:
+        light_short['graph_summary']['has_svo'] = graph['has_svo']
+    return light_short
+
+
+def write_shorts_feed(shorts_data: Dict[str, Any], feed_dir: Path = Path("shorts_feed"),
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Path:
+    """Write a manifest, chunk files and per-short graph files.
+
+    Args:
+        shorts_data: The shorts_data.json structure from generate_shorts
+        feed_dir: Output directory for the feed
+        chunk_size: Number of shorts per chunk file
+
+    Returns:
+        Path to the written manifest
+    """
+    feed_dir = Path(feed_dir)
+    chunks_dir = feed_dir / "chunks"
+    graphs_dir = feed_dir / "graphs"
+    chunk_size = max(1, chunk_size)
+
+    shorts = shorts_data.get('shorts', [])
+    chunk_entries: List[Dict[str, Any]] = []
+    written = set()
+
+    for start in range(0, len(shorts), chunk_size):
+        light_shorts = [_split_graph(short, graphs_dir, feed_dir) for short in shorts[start:start + chunk_size]]
+        written.update(short['graph_url'] for short in light_shorts if 'graph_url' in short)
+
+        chunk = {"start": start, "shorts": light_shorts}
+        chunk_file = chunks_dir / _content_name(f"chunk_{start // chunk_size:04d}", chunk)
+        if not chunk_file.exists():
+            write_json(chunk_file, chunk, compress=True)
+        written.add(chunk_file.relative_to(feed_dir).as_posix())
+
+        chunk_entries.append({
+            "url": chunk_file.relative_to(feed_dir).as_posix(),
+            "start": start,
+            "count": len(light_shorts),
+        })
+
+    manifest = {
+        "version": FEED_VERSION,
+        "generated_at": shorts_data.get('generated_at'),
+        "source_file": shorts_data.get('source_file'),
+        "total_shorts": len(shorts),
+        "total_duration": shorts_data.get('total_duration', 0),
+        "has_svo": shorts_data.get('has_svo', False),
+        "chunk_size": chunk_size,
+        "chunks": chunk_entries,
+    }
+    manifest_path = write_json(feed_dir / MANIFEST_NAME, manifest, compress=True)
+
+    _remove_stale_files(feed_dir, written)
+    return manifest_path
+
+
+def _remove_stale_files(feed_dir: Path, keep: set):
+    """Delete chunk and graph files no longer referenced by the manifest."""
+    for subdir in ("chunks", "graphs"):
+        for path in (feed_dir / subdir).glob("*.json*"):
+            relative = path.relative_to(feed_dir).as_posix()
+            base = relative[:-len('.gz')] if relative.endswith('.gz') else relative
+            base = base[:-len('.br')] if base.endswith('.br') else base
+            if base not in keep:
+                path.unlink()
@@ -0,0 +1,175 @@
+"""Streaming producer/consumer pipeline with bounded queues between stages."""
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .tracing import span
+
+# Marks the end of the stream on a stage's input queue
+_END = object()
+
+
+@dataclass
+class Stage:
+    """A pipeline stage served by a pool of worker threads.
+
+    ``func`` maps one item to one item. Returning None drops the item from
+    the stream (e.g. an article that fails validation).
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 8
+
+
+class PipelineError(RuntimeError):
+    """Raised when a stage fails and the pipeline is shut down."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StreamingPipeline:
+    """Runs items from a source through stages concurrently.
+
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure to everything upstream of it instead of letting work pile
+    up in memory. Results are returned in source order regardless of how
+    many workers each stage has.
+    """
+
+    def __init__(self, stages: List[Stage], poll_interval: float = 0.1):
+        if not stages:
+            raise ValueError("StreamingPipeline needs at least one stage")
+        self.stages = stages
+        self.poll_interval = poll_interval
+        self.stats: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._error: Optional[PipelineError] = None
+        self._error_lock = threading.Lock()
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        """Feed ``source`` through all stages and return the results in order."""
+        self._stop.clear()
+        self._error = None
+        self.stats = {stage.name: 0 for stage in self.stages}
+
+        queues = [queue.Queue(maxsize=max(1, stage.queue_size)) for stage in self.stages]
+        results: Dict[int, Any] = {}
+        results_lock = threading.Lock()
+        threads = []
+
+        producer = threading.Thread(
+            target=self._produce, args=(source, queues[0], self.stages[0].workers),
+            name="pipeline-source", daemon=True
+        )
+        threads.append(producer)
+
+        for position, stage in enumerate(self.stages):
+            in_queue = queues[position]
+            if position + 1 < len(self.stages):
+                out_queue = queues[position + 1]
+                downstream_workers = self.stages[position + 1].workers
+            else:
+                out_queue = None
+                downstream_workers = 0
+
+            remaining = [max(1, stage.workers)]
+            remaining_lock = threading.Lock()
+
+            for worker_id in range(max(1, stage.workers)):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, in_queue, out_queue, downstream_workers,
+                          remaining, remaining_lock, results, results_lock),
+                    name=f"pipeline-{stage.name}-{worker_id}",
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        return [results[seq] for seq in sorted(results)]
+
+    def _produce(self, source: Iterable[Any], out_queue: queue.Queue, consumers: int):
+        """Pull items from the source and push them into the first stage."""
+        try:
+            for seq, item in enumerate(source):
+                if not self._put(out_queue, (seq, item)):
+                    return
+        except Exception as e:
+            self._fail("source", e)
+            return
+        for _ in range(max(1, consumers)):
+            if not self._put(out_queue, _END):
+                return
+
+    def _work(self, stage: Stage, in_queue: queue.Queue, out_queue: Optional[queue.Queue],
+              downstream_workers: int, remaining: List[int], remaining_lock: threading.Lock,
+              results: Dict[int, Any], results_lock: threading.Lock):
+        """Worker loop for a single stage thread."""
+        while not self._stop.is_set():
+            try:
+                entry = in_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+            if entry is _END:
+                break
+
+            seq, item = entry
+            try:
+                with span(f"stage.{stage.name}", category='stage', item=seq):
+                    output = stage.func(item)
+            except Exception as e:
+                self._fail(stage.name, e)
+                return
+
+            if output is None:
+                continue
+
+            with results_lock:
+                self.stats[stage.name] += 1
+
+            if out_queue is None:
+                with results_lock:
+                    results[seq] = output
+            elif not self._put(out_queue, (seq, output)):
+                return
+
+        if self._stop.is_set():
+            return
+
+        # The last worker of a stage to finish closes the downstream queue
+        with remaining_lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker and out_queue is not None:
+            for _ in range(max(1, downstream_workers)):
+                if not self._put(out_queue, _END):
+                    return
+
+    def _put(self, target: queue.Queue, entry: Any) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                target.put(entry, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fail(self, stage: str, error: BaseException):
+        """Record the first failure and signal every thread to stop."""
+        with self._error_lock:
+            if self._error is None:
+                self._error = PipelineError(stage, error)
+        self._stop.set()
@@ -0,0 +1,257 @@
+"""Stage-level tracing for the news pipeline.
+
+Pipeline code wraps its stages in ``span()`` blocks (fetch per feed/query,
+distillation, each extractor tier attempt, vault resolution, SVG rendering,
+file writes). While tracing is off, ``span()`` returns a shared no-op
+context manager, so instrumented code costs one global lookup per call.
+Enable it with ``enable_tracing()`` or ``SCRANTENNA_TRACE=path``; recorded
+spans are written in Chrome trace event format (``chrome://tracing``,
+https://ui.perfetto.dev) with a per-stage summary table.
+
+Timestamps come from ``time.perf_counter_ns`` (the system-wide monotonic
+clock on Linux), so spans recorded in process-pool workers and merged back
+with ``merge_events`` line up with the parent's.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+TRACE_ENV = 'SCRANTENNA_TRACE'
+
+
+class _NoopSpan:
+    """Stand-in returned by ``span()`` while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """One timed block; attributes set during the block end up in the trace ``args``."""
+
+    __slots__ = ('tracer', 'name', 'category', 'attrs', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self.name, self.category, self.start, end, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Collects finished spans from every thread of this process."""
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, attrs: Dict[str, Any]):
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'start_ns': start_ns,
+            'dur_ns': end_ns - start_ns,
+            'pid': os.getpid(),
+            'tid': thread.ident,
+            'thread': thread.name,
+            'args': attrs
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return the events recorded so far (e.g. to ship them out of a worker)."""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def merge(self, events: List[Dict[str, Any]]):
+        with self._lock:
+            self.events.extend(events)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The recorded spans as a Chrome trace event document."""
+        with self._lock:
+            events = list(self.events)
+
+        trace_events = []
+        threads = {}
+        for event in sorted(events, key=lambda event: event['start_ns']):
+            threads.setdefault((event['pid'], event['tid']), event['thread'])
+            trace_events.append({
+                'name': event['name'],
+                'cat': event['cat'],
+                'ph': 'X',
+                'ts': (event['start_ns'] - self.origin) / 1000,
+                'dur': event['dur_ns'] / 1000,
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': event['args']
+            })
+
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                    for (pid, tid), name in threads.items()]
+        metadata += [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'scrantenna'}}
+                     for pid in sorted({pid for pid, _ in threads})]
+        return {'traceEvents': metadata + trace_events, 'displayTimeUnit': 'ms'}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per span name: count, errors, total/mean/max milliseconds, slowest first."""
+        with self._lock:
+            events = list(self.events)
+
+        durations = defaultdict(list)
+        errors = defaultdict(int)
+        for event in events:
+            durations[event['name']].append(event['dur_ns'] / 1e6)
+            if 'error' in event['args']:
+                errors[event['name']] += 1
+
+        rows = [{
+            'name': name,
+            'count': len(values),
+            'errors': errors[name],
+            'total_ms': sum(values),
+            'mean_ms': sum(values) / len(values),
+            'max_ms': max(values)
+        } for name, values in durations.items()]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def format_summary(self) -> str:
+        rows = self.summary()
+        if not rows:
+            return "No spans recorded"
+
+        width = max(len('stage'), *(len(row['name']) for row in rows))
+        lines = [f"{'stage':<{width}}  {'count':>6}  {'errors':>6}  {'total ms':>10}  {'mean ms':>9}  {'max ms':>9}"]
+        lines.append('-' * len(lines[0]))
+        for row in rows:
+            lines.append(f"{row['name']:<{width}}  {row['count']:>6}  {row['errors']:>6}  "
+                         f"{row['total_ms']:>10.1f}  {row['mean_ms']:>9.1f}  {row['max_ms']:>9.1f}")
+        return '\n'.join(lines)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, category: str = 'pipeline', **attrs):
+    """Time a block as a named span with attributes (article id, tier, model, bytes, ...).
+
+    Usage::
+
+        with span('extract.entities', tier='ollama', model=model) as s:
+            entities = extract(text)
+            s.set(entities=len(entities))
+
+    An exception escaping the block is recorded on the span and re-raised.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return Span(tracer, name, category, attrs)
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def enable_tracing() -> Tracer:
+    """Start recording spans (keeps the current tracer if one is active)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop recording spans; returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def drain_events() -> List[Dict[str, Any]]:
+    """Events recorded in this process since the last drain (empty when disabled)."""
+    return _tracer.drain() if _tracer is not None else []
+
+
+def merge_events(events: List[Dict[str, Any]]):
+    """Add events recorded elsewhere (e.g. a worker process) to the active trace."""
+    if _tracer is not None and events:
+        _tracer.merge(events)
+
+
+def trace_path_from_env() -> Optional[Path]:
+    value = os.getenv(TRACE_ENV)
+    return Path(value) if value else None
+
+
+def start_tracing(trace_file: Optional[Path] = None) -> Optional[Path]:
+    """Enable tracing if a trace file is given or ``SCRANTENNA_TRACE`` is set.
+
+    Returns:
+        The trace file to write at the end of the run, or None when tracing is off
+    """
+    trace_file = Path(trace_file) if trace_file else trace_path_from_env()
+    if trace_file is not None:
+        enable_tracing()
+    return trace_file
+
+
+def write_trace(trace_file: Path) -> Optional[Path]:
+    """Write the active trace as Chrome trace JSON; returns None when tracing is off."""
+    if _tracer is None:
+        return None
+    # Plain json rather than serialization.write_json, which is itself traced
+    trace_file = Path(trace_file)
+    trace_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(trace_file, 'w', encoding='utf-8') as f:
+        json.dump(_tracer.chrome_trace(), f, default=str)
+    return trace_file
+
+
+def finish_tracing(trace_file: Optional[Path]) -> Optional[Path]:
+    """Write the trace started by ``start_tracing`` and print its summary table."""
+    if trace_file is None or _tracer is None:
+        return None
+    written = write_trace(trace_file)
+    print("\n⏱️  Stage timings")
+    print(_tracer.format_summary())
+    print(f"📈 Trace written to {written} (open in chrome://tracing or ui.perfetto.dev)")
+    return written
@@ -14,6 +14,11 @@ from datetime import datetime
 from typing import List, Dict
 from pathlib import Path
 
+from graph_layout import add_graph_layouts
+from pipeline.serialization import write_json
+from pipeline.shorts_feed import write_shorts_feed
+from pipeline.tracing import finish_tracing, span, start_tracing
+
 # Try to import OpenAI for LLM-based distillation
 try:
     import openai
@@ -30,21 +35,22 @@ def create_distilled_version_llm(text: str) -> str:
         return ""
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "Extract the core facts from news text into direct, precise statements. Use simple subject-verb-object format. Avoid referring to 'the article' or 'the story'. State facts directly as if reporting them yourself. Keep it under 100 characters."
-                },
-                {
-                    "role": "user", 
-                    "content": f"Distill this news text: {text}"
-                }
-            ],
-            max_tokens=50,
-            temperature=0.1
-        )
+        with span('distill.llm', category='distill', model="gpt-3.5-turbo", chars=len(text)):
+            response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": "Extract the core facts from news text into direct, precise statements. Use simple subject-verb-object format. Avoid referring to 'the article' or 'the story'. State facts directly as if reporting them yourself. Keep it under 100 characters."
+                    },
+                    {
+                        "role": "user", 
+                        "content": f"Distill this news text: {text}"
+                    }
+                ],
+                max_tokens=50,
+                temperature=0.1
+            )
         return response.choices[0].message.content.strip()
     except Exception as e:
         print(f"LLM distillation failed: {e}")
@@ -71,10 +77,11 @@ def create_distilled_version_fallback(text: str) -> str:
 
 def create_distilled_version(text: str) -> str:
     """Create distilled version using best available method."""
-    if llm_available:
-        return create_distilled_version_llm(text)
-    else:
-        return create_distilled_version_fallback(text)
+    with span('distill', category='distill', method='llm' if llm_available else 'fallback', chars=len(text or '')):
+        if llm_available:
+            return create_distilled_version_llm(text)
+        else:
+            return create_distilled_version_fallback(text)
 
 def process_article(article: Dict) -> Dict:
     """Process article to include distilled versions alongside original text."""
@@ -95,17 +102,22 @@ def process_article(article: Dict) -> Dict:
     
     return processed
 
+# Try with demo NewsAPI key (you should replace this with your own)
+NEWSAPI_DEMO_KEY = 'be93936988fd4df185bd56e8a11125a0'  # Demo key from notebook
+NEWSAPI_QUERY = "Scranton"
+
 def fetch_news_with_demo_fallback():
     """Fetch news articles with demo data fallback if API fails."""
     
-    # Try with demo NewsAPI key (you should replace this with your own)
-    api_key = 'be93936988fd4df185bd56e8a11125a0'  # Demo key from notebook
-    query = "Scranton"
+    api_key = NEWSAPI_DEMO_KEY
+    query = NEWSAPI_QUERY
     url = f"https://newsapi.org/v2/everything?q={query}&apiKey={api_key}"
     
     try:
         print("🔄 Fetching fresh news articles...")
-        response = requests.get(url)
+        with span('fetch.query', category='fetch', query=query) as query_span:
+            response = requests.get(url)
+            query_span.set(status=response.status_code, bytes=len(response.content))
         
         if response.status_code == 200:
             data = response.json()
@@ -165,14 +177,18 @@ def create_demo_news_data():
 
 def save_news(news_data):
     """Save news articles with both original and distilled formats."""
-    data_dir = Path("../data/daily")
-    data_dir.mkdir(parents=True, exist_ok=True)
-    
     # Process articles to add distilled versions
     processed_articles = []
     for article in news_data.get('articles', []):
         processed_articles.append(process_article(article))
     
+    return save_processed_articles(processed_articles)
+
+def save_processed_articles(processed_articles: List[Dict]) -> Path:
+    """Save already-distilled articles to today's daily news file."""
+    data_dir = Path("../data/daily")
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
     # Create data structure with metadata
     output_data = {
         "query": "Scranton",
@@ -185,8 +201,7 @@ def save_news(news_data):
     
     # Save with date-based filename
     file_path = data_dir / f"scranton_news_{datetime.now().strftime('%Y-%m-%d')}.json"
-    with open(file_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    write_json(file_path, output_data)
     
     print(f"📄 Saved {len(processed_articles)} articles to {file_path}")
     if llm_available:
@@ -196,43 +211,307 @@ def save_news(news_data):
     
     return file_path
 
-def run_complete_pipeline():
-    """Run the complete news regeneration pipeline."""
+# Code each stage's output depends on; editing one reruns that stage
+SHORTS_SOURCES = ('generate_shorts.py', 'free_llm_extractor.py', 'svg_graph.py',
+                  'obsidian_entity_manager.py', 'graph_layout.py', 'entity_index.py',
+                  'front_matter.py', 'vault_writer.py', 'vault_index.py')
+GRAPH_SOURCES = ('graph_generator.py',)
+NEO4J_SOURCES = ('neo4j_export.py',)
+
+def _sources(names) -> List[Path]:
+    here = Path(__file__).resolve().parent
+    return [here / name for name in names]
+
+def build_pipeline_dag(workers: int = 1, state_file: Path = Path(".pipeline_state.json")):
+    """Build the fetch → distill → shorts → exports DAG.
+    
+    Distillation reruns only when the fetched articles change, shorts only
+    when the daily file (or their code) changes, and the knowledge graph and
+    Neo4j export branches run concurrently once their inputs are ready.
+    
+    Args:
+        workers: Parallel workers for short generation
+        state_file: Where stage fingerprints are kept between runs
+    """
+    from pipeline.dag import PipelineDAG, Task
+    from pipeline.serialization import dumps
+    
+    news_file = Path("../data/daily") / f"scranton_news_{datetime.now().strftime('%Y-%m-%d')}.json"
+    shorts_file = Path("shorts_data.json")
+    graph_dir = Path("../data/graph")
+    
+    def fetch(context):
+        return fetch_news_with_demo_fallback()
+    
+    def distill(context):
+        return save_news(context['fetch'])
+    
+    def shorts(context):
+        from generate_shorts import generate_shorts_from_news, shorts_build_inputs, write_shorts_outputs
+        build_inputs = shorts_build_inputs(news_file)
+        return write_shorts_outputs(generate_shorts_from_news(news_file, workers=workers), shorts_file,
+                                    build_inputs=build_inputs)
+    
+    def knowledge_graph(context):
+        from graph_generator import process_news_to_graph
+        return process_news_to_graph(news_file, graph_dir, cumulative=True)
+    
+    def neo4j(context):
+        from neo4j_export import ScrantennaNeo4jExporter
+        exporter = ScrantennaNeo4jExporter()
+        if not exporter.load_shorts_data(str(shorts_file)):
+            raise RuntimeError(f"Could not load {shorts_file}")
+        exporter.extract_graph_data()
+        if not (exporter.export_to_file() and exporter.create_import_script()):
+            raise RuntimeError("Cypher export failed")
+    
+    tasks = [
+        Task('fetch', fetch, always_run=True),
+        Task('distill', distill, deps=['fetch'],
+             inputs=lambda context: [dumps(context['fetch'].get('articles', []), pretty=False),
+                                     f"llm={llm_available}", Path(__file__).resolve()],
+             outputs=[news_file]),
+        Task('shorts', shorts, deps=['distill'],
+             inputs=lambda context: [news_file, f"llm={llm_available}", *_sources(SHORTS_SOURCES)],
+             outputs=[shorts_file]),
+        Task('knowledge_graph', knowledge_graph, deps=['distill'],
+             inputs=lambda context: [news_file, *_sources(GRAPH_SOURCES)],
+             outputs=[graph_dir / "knowledge_graph.json"]),
+        Task('neo4j', neo4j, deps=['shorts'],
+             inputs=lambda context: [shorts_file, *_sources(NEO4J_SOURCES)],
+             outputs=[Path("scrantenna_graph.cypher")]),
+    ]
+    return PipelineDAG(tasks, state_file=state_file)
+
+def run_complete_pipeline(force: bool = False, workers: int = 1):
+    """Run the complete news regeneration pipeline in-process.
+    
+    Stages whose inputs have not changed since the last run are skipped;
+    ``force`` reruns everything.
+    """
     print("🎬 Starting Scrantenna News Pipeline...")
     print("=" * 60)
     
-    # Step 1: Fetch fresh news
-    news_data = fetch_news_with_demo_fallback()
+    dag = build_pipeline_dag(workers)
+    statuses = dag.run(force=force)
     
-    # Step 2: Save with distilled content
-    news_file = save_news(news_data)
+    for name, status in statuses.items():
+        print(f"   {name}: {status}")
+    for error in dag.errors.values():
+        print(f"❌ {error}")
+    
+    print("=" * 60)
+    if dag.errors:
+        print("⚠️ Pipeline finished with errors")
+    else:
+        print("🎉 Pipeline complete! You can now view the shorts at:")
+        print("   python3 -m http.server 8000")
+        print("   Then open: http://localhost:8000")
+    return statuses
+
+# Default worker counts for the streaming pipeline. Distillation and
+# extraction wait on LLM calls, so they get more threads; vault access is
+# serialized by a lock because entity files are read-modify-write, and
+# normalize numbers shorts in stream order, so it must have one worker.
+DEFAULT_STAGE_WORKERS = {
+    'normalize': 1,
+    'distill': 4,
+    'extract': 2,
+    'vault': 1,
+    'render': 2,
+}
+
+def build_streaming_stages(workers: Dict[str, int] = None, queue_size: int = 8) -> List:
+    """Build the normalize → distill → extract → vault-sync → render stages."""
+    from pipeline import NewsLoader, Stage
+    from generate_shorts import create_short_from_article
+    from free_llm_extractor import get_extractor, integrate_graph_with_vault
     
-    # Step 3: Generate shorts data
-    print("🔄 Generating shorts data with knowledge graphs...")
+    stage_workers = dict(DEFAULT_STAGE_WORKERS)
+    stage_workers.update(workers or {})
+    if stage_workers['normalize'] != 1:
+        raise ValueError("The normalize stage numbers shorts in stream order and must have one worker")
     
-    # Import and run the shorts generator
-    import subprocess
-    import sys
+    loader = NewsLoader()
+    next_short_index = [0]
     
-    try:
-        result = subprocess.run([
-            sys.executable, 'generate_shorts.py', '--force'
-        ], capture_output=True, text=True, cwd='.')
+    def normalize(item: Dict) -> Dict:
+        cleaned = loader.clean_article(item['article'])
+        if not cleaned:
+            return None
+        # Keep any extra fields (e.g. existing distilled versions) from the source
+        item['article'] = {**item['article'], **cleaned}
+        # Numbered only once the article survives, so shorts ids have no gaps
+        if item['short_candidate']:
+            item['short_index'] = next_short_index[0]
+            next_short_index[0] += 1
+        return item
+    
+    def distill(item: Dict) -> Dict:
+        item['article'] = process_article(item['article'])
+        return item
+    
+    def extract(item: Dict) -> Dict:
+        if item['short_index'] is not None:
+            # Extractors are not thread-safe; each extract worker keeps its own
+            item['graph'] = get_extractor().extract_for_article(item['article'], item['short_index'])
+        return item
+    
+    def vault_sync(item: Dict) -> Dict:
+        if item.get('graph') is not None:
+            integrate_graph_with_vault(item['graph'], item['article'])
+        return item
+    
+    def render(item: Dict) -> Dict:
+        if item['short_index'] is not None:
+            item['short'] = create_short_from_article(item['article'], item['short_index'], item['graph'])
+        return item
+    
+    stage_funcs = [
+        ('normalize', normalize),
+        ('distill', distill),
+        ('extract', extract),
+        ('vault', vault_sync),
+        ('render', render),
+    ]
+    
+    return [Stage(name, func, workers=stage_workers[name], queue_size=queue_size)
+            for name, func in stage_funcs]
+
+def iter_news_with_demo_fallback(page_size: int = 20, max_results: int = 100):
+    """Yield fetched articles page by page, falling back to demo data.
+    
+    Each page is yielded before the next one is requested, so downstream
+    stages work on the first articles while the rest are still in flight.
+    """
+    fetched = 0
+    page = 1
+    print("🔄 Fetching fresh news articles...")
+    while fetched < max_results:
+        params = {'q': NEWSAPI_QUERY, 'apiKey': NEWSAPI_DEMO_KEY, 'pageSize': page_size, 'page': page}
+        try:
+            with span('fetch.query', category='fetch', query=NEWSAPI_QUERY, page=page) as query_span:
+                response = requests.get("https://newsapi.org/v2/everything", params=params)
+                query_span.set(status=response.status_code, bytes=len(response.content))
+            if response.status_code != 200:
+                print(f"❌ API request failed: {response.status_code} - {response.text}")
+                break
+            articles = response.json().get('articles', [])
+        except Exception as e:
+            print(f"❌ Failed to fetch news: {e}")
+            break
         
-        if result.returncode == 0:
-            print("✅ Shorts data generated successfully")
-            print(result.stdout)
-        else:
-            print("❌ Shorts generation failed:")
-            print(result.stderr)
+        if not articles:
+            break
+        fetched += len(articles)
+        yield from articles
+        if len(articles) < page_size:
+            break
+        page += 1
     
-    except Exception as e:
-        print(f"❌ Failed to run shorts generator: {e}")
+    if fetched:
+        print(f"✅ Successfully fetched {fetched} articles")
+    else:
+        print("📝 Using demo data fallback...")
+        yield from create_demo_news_data()['articles']
+
+def iter_fetched_articles(max_shorts: int = 15):
+    """Yield pipeline work items as articles come back from the fetch stage.
+    
+    Shorts selection is order-dependent, so candidates are marked here
+    while the stream is still sequential; normalize numbers the ones that
+    survive cleaning.
+    """
+    from generate_shorts import is_good_short_article
+    
+    for position, article in enumerate(iter_news_with_demo_fallback()):
+        yield {
+            'article': article,
+            'short_candidate': position < max_shorts and is_good_short_article(article),
+            'short_index': None,
+            'graph': None,
+            'short': None
+        }
+
+def run_streaming_pipeline(max_shorts: int = 15, workers: Dict[str, int] = None,
+                           queue_size: int = 8) -> Path:
+    """Run fetch → normalize → distill → extract → vault-sync → render in-process.
+    
+    Stages overlap, so total latency approaches the slowest stage rather
+    than the sum of all of them.
+    """
+    from pipeline import StreamingPipeline, PipelineError
+    from generate_shorts import build_shorts_data, create_player_launcher, flush_vault_updates
     
+    print("🎬 Starting Scrantenna Streaming Pipeline...")
     print("=" * 60)
-    print("🎉 Pipeline complete! You can now view the shorts at:")
-    print("   python3 -m http.server 8000")
-    print("   Then open: http://localhost:8000")
+    
+    pipeline = StreamingPipeline(build_streaming_stages(workers, queue_size))
+    
+    try:
+        items = pipeline.run(iter_fetched_articles(max_shorts))
+    except PipelineError as e:
+        print(f"❌ Pipeline stopped: {e}")
+        raise
+    finally:
+        flush_vault_updates()
+    
+    news_file = save_processed_articles([item['article'] for item in items])
+    
+    shorts = [item['short'] for item in items if item['short'] is not None]
+    add_graph_layouts(shorts)
+    shorts_data = build_shorts_data(shorts, news_file)
+    
+    output_file = Path("shorts_data.json")
+    write_json(output_file, shorts_data, compress=True)
+    write_shorts_feed(shorts_data, Path("shorts_feed"))
+    
+    print(f"✅ Generated {shorts_data['total_shorts']} shorts → {output_file}")
+    print(f"📊 Stage throughput: {pipeline.stats}")
+    create_player_launcher()
+    
+    return output_file
+
+def parse_worker_overrides(values: List[str]) -> Dict[str, int]:
+    """Parse ``stage=N`` worker overrides from the command line."""
+    overrides = {}
+    for value in values or []:
+        stage, _, count = value.partition('=')
+        if stage not in DEFAULT_STAGE_WORKERS or not count.isdigit():
+            raise ValueError(f"Invalid worker override '{value}', expected one of "
+                             f"{list(DEFAULT_STAGE_WORKERS)}=N")
+        overrides[stage] = int(count)
+    return overrides
+
+def main():
+    """Command-line entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Run the Scrantenna news pipeline')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Run all stages in-process with bounded queues between them')
+    parser.add_argument('--workers', action='append', metavar='STAGE=N',
+                        help='Worker count for a streaming stage (repeatable)')
+    parser.add_argument('--queue-size', type=int, default=8,
+                        help='Capacity of each inter-stage queue (default: 8)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rerun every stage even if its inputs are unchanged')
+    parser.add_argument('--shorts-workers', type=int, default=1,
+                        help='Parallel workers for short generation (default: 1)')
+    parser.add_argument('--trace', type=Path, metavar='FILE',
+                        help='Write a Chrome trace of pipeline stages to FILE (or set SCRANTENNA_TRACE)')
+    args = parser.parse_args()
+    
+    trace_file = start_tracing(args.trace)
+    try:
+        with span('pipeline', category='stage', mode='streaming' if args.streaming else 'dag'):
+            if args.streaming:
+                run_streaming_pipeline(workers=parse_worker_overrides(args.workers),
+                                       queue_size=args.queue_size)
+            else:
+                run_complete_pipeline(force=args.force, workers=args.shorts_workers)
+    finally:
+        finish_tracing(trace_file)
 
 if __name__ == "__main__":
-    run_complete_pipeline()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Persistent front-matter index for the Obsidian entity vault.
+
+Keeps a compact JSON file keyed by note path with each note's mtime, size and
+parsed front matter, so a process only re-parses notes that changed since
+the last run.
+"""
+
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from pipeline.serialization import write_json
+
+INDEX_VERSION = 1
+INDEX_DIR = ".scrantenna"
+INDEX_NAME = "vault_index.json"
+
+# Vault folders that hold templates and notes about the vault, not entities
+SKIPPED_FOLDERS = {"templates", "meta", "dashboards"}
+
+# Front matter that entity resolution reads; mention counts, dates and relationships are not
+RESOLUTION_FIELDS = ('name', 'aliases', 'search_patterns', 'entity_type')
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert YAML scalars (dates) into JSON-compatible values."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+class VaultIndex:
+    """Incrementally maintained path -> (mtime, size, front matter) index."""
+
+    def __init__(self, vault_path: Path, parse: Callable[[Path], Optional[Dict]],
+                 index_path: Optional[Path] = None):
+        self.vault_path = Path(vault_path)
+        self.parse = parse
+        self.index_path = Path(index_path) if index_path else self.vault_path / INDEX_DIR / INDEX_NAME
+        self.entries: Dict[str, Dict] = self._read()
+        self.dirty = False
+        self.reparsed = 0
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _key(self, file_path: Path) -> str:
+        return Path(file_path).relative_to(self.vault_path).as_posix()
+
+    def _is_entity_note(self, file_path: Path) -> bool:
+        parts = Path(file_path).relative_to(self.vault_path).parts
+        return not any(part in SKIPPED_FOLDERS or part.startswith('.') for part in parts[:-1])
+
+    def refresh(self, save: bool = True) -> Dict[Path, Dict]:
+        """Re-parse only notes whose mtime or size changed; drop deleted notes.
+
+        Args:
+            save: Write the updated index back to the vault
+
+        Returns:
+            Mapping of note path to parsed front matter (None if unparseable)
+        """
+        seen = set()
+        self.reparsed = 0
+
+        for file_path in self.vault_path.rglob("*.md"):
+            if not self._is_entity_note(file_path):
+                continue
+            key = self._key(file_path)
+            seen.add(key)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+
+            entry = self.entries.get(key)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                continue
+
+            self.entries[key] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'metadata': _json_safe(self.parse(file_path)),
+            }
+            self.reparsed += 1
+            self.dirty = True
+
+        for key in set(self.entries) - seen:
+            del self.entries[key]
+            self.dirty = True
+
+        if save:
+            self.save()
+        return {self.vault_path / key: entry['metadata'] for key, entry in sorted(self.entries.items())}
+
+    def fingerprint(self) -> str:
+        """Digest of every note's path and resolution fields, after a refresh.
+
+        Changes only when entity resolution could come out differently (a
+        note or alias added, renamed or retyped), not when a run records
+        mentions. Read-only: the refreshed index is not saved to the vault.
+        """
+        digest = hashlib.sha256()
+        for file_path, metadata in self.refresh(save=False).items():
+            fields = {field: (metadata or {}).get(field) for field in RESOLUTION_FIELDS}
+            digest.update(f"{self._key(file_path)}:{json.dumps(fields, sort_keys=True)}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def record(self, file_path: Path, metadata: Optional[Dict]):
+        """Record a note the manager just wrote, so it is not re-parsed next run."""
+        try:
+            stat = Path(file_path).stat()
+        except OSError:
+            return
+        self.entries[self._key(file_path)] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'metadata': _json_safe(metadata),
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the index if it changed."""
+        if not self.dirty:
+            return
+        try:
+            write_json(self.index_path, {'version': INDEX_VERSION, 'files': self.entries}, pretty=False)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving vault index {self.index_path}: {e}")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Advisory file locks for concurrent access to the Obsidian entity vault.
+
+Notes are rewritten by atomic replace, which swaps the inode, so locks are
+taken on per-note sidecar files under ``.scrantenna/locks`` rather than on
+the notes themselves. Locking uses ``fcntl.flock`` where available; on
+platforms without it the vault falls back to single-process access.
+"""
+
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+try:
+    import fcntl
+    fcntl_available = True
+except ImportError:
+    fcntl_available = False
+
+LOCK_DIR = Path(".scrantenna") / "locks"
+
+
+def lock_path_for(vault_path: Path, file_path: Path) -> Path:
+    """Sidecar lock file for a note, stable across processes."""
+    relative = Path(file_path).relative_to(vault_path).as_posix()
+    digest = hashlib.sha1(relative.encode('utf-8')).hexdigest()[:16]
+    return Path(vault_path) / LOCK_DIR / f"{digest}.lock"
+
+
+def lock_handle(handle: IO, blocking: bool = True) -> bool:
+    """Take an exclusive lock on an open file; returns False if it is held elsewhere."""
+    if not fcntl_available:
+        return True
+    flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+    try:
+        fcntl.flock(handle.fileno(), flags)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def unlock_handle(handle: IO):
+    """Release a lock taken with lock_handle()."""
+    if fcntl_available:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def vault_file_lock(vault_path: Path, file_path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a vault note for a read-modify-write."""
+    lock_path = lock_path_for(Path(vault_path), Path(file_path))
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a') as handle:
+        lock_handle(handle)
+        try:
+            yield
+        finally:
+            unlock_handle(handle)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Write-behind buffer for Obsidian entity note updates.
+
+Mentions, alias additions, confidence bumps and relationship additions are
+queued in memory per note and applied with one read-modify-write per note on
+flush, so vault I/O scales with distinct entities touched rather than with
+mentions. Every queued update is appended to a per-process journal first;
+if the process dies before flushing, the next manager replays the journal.
+
+Updates are stored as deltas and applied under a per-note lock, so several
+processes can share a vault without losing each other's updates.
+"""
+
+import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from front_matter import read_front_matter, write_front_matter
+from vault_lock import lock_handle, unlock_handle, vault_file_lock
+
+JOURNAL_DIR = "journals"
+
+
+def apply_mention(front_matter: Dict, name: str, confidence: float, date: str):
+    """Apply one entity mention to note front matter."""
+    front_matter['mention_count'] = front_matter.get('mention_count', 0) + 1
+    front_matter['last_mentioned'] = date
+
+    # Add new alias if different
+    if (name and
+        name != front_matter.get('name') and
+        name not in front_matter.get('aliases', [])):
+        aliases = front_matter.get('aliases', [])
+        aliases.append(name)
+        front_matter['aliases'] = aliases
+
+    # Update confidence if higher
+    if confidence > front_matter.get('confidence', 0.5):
+        front_matter['confidence'] = confidence
+
+
+def apply_relationship(front_matter: Dict, target_entity: str, rel_type: str, confidence: float) -> bool:
+    """Add a relationship to note front matter unless it already exists."""
+    relationships = front_matter.get('relationships', [])
+
+    for rel in relationships:
+        if (rel.get('target') == f"[[{target_entity}]]" and
+            rel.get('type') == rel_type):
+            return False
+
+    relationships.append({
+        'target': f"[[{target_entity}]]",
+        'type': rel_type,
+        'confidence': confidence
+    })
+    front_matter['relationships'] = relationships
+    return True
+
+
+def apply_operation(front_matter: Dict, op: Dict) -> bool:
+    """Apply a journaled operation; returns True if the front matter changed."""
+    if op['op'] == 'mention':
+        apply_mention(front_matter, op['name'], op['confidence'], op['date'])
+        return True
+    if op['op'] == 'relationship':
+        return apply_relationship(front_matter, op['target'], op['type'], op['confidence'])
+    return False
+
+
+class VaultWriteBuffer:
+    """Per-note queue of pending front-matter updates with a recovery journal."""
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = Path(vault_path)
+        self.journal_dir = self.vault_path / ".scrantenna" / JOURNAL_DIR
+        self.journal_path = self.journal_dir / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        self.pending: "OrderedDict[Path, List[Dict]]" = OrderedDict()
+        self._journal = None
+
+    def _key(self, file_path: Path) -> str:
+        return Path(file_path).relative_to(self.vault_path).as_posix()
+
+    def _append_journal(self, record: Dict):
+        if self._journal is None:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            # Held until close() so other processes know this journal is live
+            lock_handle(self._journal)
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+
+    def _queue(self, file_path: Path, op: Dict):
+        self._append_journal(dict(op, path=self._key(file_path)))
+        self.pending.setdefault(Path(file_path), []).append(op)
+
+    def add_mention(self, file_path: Path, name: str, confidence: float, date: Optional[str] = None):
+        """Queue a mention of the entity stored in file_path."""
+        self._queue(file_path, {
+            'op': 'mention',
+            'name': name,
+            'confidence': confidence,
+            'date': date or datetime.now().strftime('%Y-%m-%d')
+        })
+
+    def add_relationship(self, file_path: Path, target_entity: str, rel_type: str, confidence: float):
+        """Queue a relationship from the entity stored in file_path."""
+        self._queue(file_path, {
+            'op': 'relationship',
+            'target': target_entity,
+            'type': rel_type,
+            'confidence': confidence
+        })
+
+    def recover(self) -> int:
+        """Re-queue operations from journals left behind by unflushed runs.
+
+        Journals still locked by a live process are left alone, and notes
+        marked flushed in a journal are skipped. Returns the number of
+        recovered operations.
+        """
+        if not self.journal_dir.exists():
+            return 0
+
+        count = 0
+        for journal_path in sorted(self.journal_dir.glob("*.jsonl")):
+            if journal_path == self.journal_path:
+                continue
+            try:
+                f = open(journal_path, 'r', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            with f:
+                if not lock_handle(f, blocking=False):
+                    continue
+                try:
+                    # Another process may have replayed and removed it meanwhile
+                    if os.stat(journal_path).st_ino != os.fstat(f.fileno()).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+
+                recovered: "OrderedDict[str, List[Dict]]" = OrderedDict()
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append
+                        continue
+                    path = record.pop('path')
+                    if record['op'] == 'flushed':
+                        recovered.pop(path, None)
+                    else:
+                        recovered.setdefault(path, []).append(record)
+
+                # Move the operations into this process's journal before
+                # dropping the old one
+                for path, ops in recovered.items():
+                    for op in ops:
+                        self._queue(self.vault_path / path, op)
+                        count += 1
+                journal_path.unlink()
+                unlock_handle(f)
+
+        return count
+
+    def flush(self) -> Dict[Path, Dict]:
+        """Apply all pending operations with one atomic rewrite per note.
+
+        Returns:
+            Mapping of each rewritten note to its new front matter
+        """
+        written = {}
+
+        for file_path, ops in list(self.pending.items()):
+            try:
+                with vault_file_lock(self.vault_path, file_path):
+                    front_matter = read_front_matter(file_path)
+
+                    if front_matter is not None:
+                        changed = False
+                        for op in ops:
+                            changed = apply_operation(front_matter, op) or changed
+                        if changed and write_front_matter(file_path, front_matter):
+                            written[file_path] = front_matter
+            except Exception as e:
+                print(f"Error flushing entity file {file_path}: {e}")
+                continue
+
+            self._append_journal({'op': 'flushed', 'path': self._key(file_path)})
+            del self.pending[file_path]
+
+        if not self.pending:
+            self.close()
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+
+        return written
+
+    def close(self):
+        """Close the journal handle."""
+        if self._journal is not None:
+            unlock_handle(self._journal)
+            self._journal.close()
+            self._journal = None
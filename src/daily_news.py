@@ -3,16 +3,34 @@
 Daily news generation script for Scrantenna
 Orchestrates fetching news and generating static pages
 """
+import argparse
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 from news_fetcher import NewsFetcher
 from static_generator import StaticNewsGenerator
+import shorts_path  # noqa: F401  (makes the pipeline package importable)
+from pipeline.tracing import finish_tracing, span, start_tracing
 
 def main():
     """
     Main script to generate daily news page
     """
+    parser = argparse.ArgumentParser(description='Fetch the daily news and generate the static page')
+    parser.add_argument('--trace', type=Path, metavar='FILE',
+                        help='Write a Chrome trace of fetch stages to FILE (or set SCRANTENNA_TRACE)')
+    args = parser.parse_args()
+    
+    trace_file = start_tracing(args.trace)
+    try:
+        with span('daily_news'):
+            generate_daily_news()
+    finally:
+        finish_tracing(trace_file)
+
+def generate_daily_news():
+    """Fetch news, save the daily file and render the static page."""
     print(f"Starting daily news generation for {datetime.now().strftime('%Y-%m-%d')}")
     
     # Get API key from environment
@@ -7,6 +7,9 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional
 from rss_fetcher import RSSNewsFetcher
+import shorts_path  # noqa: F401  (makes the pipeline package importable)
+from pipeline.serialization import write_json
+from pipeline.tracing import span
 
 class NewsFetcher:
     def __init__(self, api_key: str):
@@ -52,14 +55,16 @@ class NewsFetcher:
         all_articles = []
         
         # Fetch from NewsAPI
-        for query in query_terms:
-            articles = self._fetch_by_query(query)
-            if articles:
-                all_articles.extend(articles)
+        with span('fetch.newsapi', category='fetch', queries=len(query_terms)):
+            for query in query_terms:
+                articles = self._fetch_by_query(query)
+                if articles:
+                    all_articles.extend(articles)
         
         # Fetch from local RSS feeds
         print("Fetching from local RSS feeds...")
-        rss_articles = self.rss_fetcher.fetch_local_rss_news(hours_back=24)
+        with span('fetch.rss', category='fetch', feeds=len(self.rss_fetcher.rss_feeds)):
+            rss_articles = self.rss_fetcher.fetch_local_rss_news(hours_back=24)
         all_articles.extend(rss_articles)
                 
         # Remove duplicates based on URL
@@ -93,10 +98,12 @@ class NewsFetcher:
         }
         
         try:
-            response = requests.get(f"{self.base_url}/everything", params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            with span('fetch.query', category='fetch', query=query) as query_span:
+                response = requests.get(f"{self.base_url}/everything", params=params)
+                response.raise_for_status()
+                
+                data = response.json()
+                query_span.set(bytes=len(response.content), articles=len(data.get('articles', [])))
             return data.get('articles', [])
             
         except requests.exceptions.RequestException as e:
@@ -169,8 +176,7 @@ class NewsFetcher:
         filename = f"scranton_news_{today}.json"
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(news_data, f, indent=2)
+        write_json(filepath, news_data)
             
         print(f"Saved {news_data['total_results']} articles to {filepath}")
         return filepath
@@ -8,6 +8,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import time
 
+import shorts_path  # noqa: F401  (makes the pipeline package importable)
+from pipeline.tracing import span
+
 class RSSNewsFetcher:
     def __init__(self):
         # Local news RSS feeds for Greater Scranton area
@@ -36,7 +39,9 @@ class RSSNewsFetcher:
         for source_name, feed_url in self.rss_feeds.items():
             try:
                 print(f"Fetching RSS from {source_name}: {feed_url}")
-                articles = self._fetch_rss_feed(feed_url, source_name, cutoff_time)
+                with span('fetch.feed', category='fetch', source=source_name, url=feed_url) as feed_span:
+                    articles = self._fetch_rss_feed(feed_url, source_name, cutoff_time)
+                    feed_span.set(articles=len(articles))
                 all_articles.extend(articles)
                 time.sleep(1)  # Be respectful with requests
             except Exception as e:
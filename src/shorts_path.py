@@ -0,0 +1,12 @@
+"""
+Put shorts/ on the import path so src/ scripts share the pipeline package
+with the shorts scripts, imported under the same name (``pipeline``).
+Import this module before any ``pipeline`` import.
+"""
+import sys
+from pathlib import Path
+
+SHORTS_DIR = str(Path(__file__).resolve().parent.parent / 'shorts')
+
+if SHORTS_DIR not in sys.path:
+    sys.path.append(SHORTS_DIR)
@@ -19,6 +19,14 @@ def temp_dir():
     shutil.rmtree(temp_dir)
 
 
+@pytest.fixture
+def entity_managers(temp_dir):
+    """Close the shared vault managers a test created, before its temp vault is removed."""
+    import obsidian_entity_manager
+    yield obsidian_entity_manager._managers
+    obsidian_entity_manager.close_entity_managers()
+
+
 @pytest.fixture
 def sample_news_article():
     """Sample news article for testing."""
@@ -0,0 +1,77 @@
+"""
+Integration stress test: several processes updating one Obsidian vault.
+"""
+
+import multiprocessing
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import vault_lock
+from obsidian_entity_manager import ObsidianEntityManager
+from front_matter import split_front_matter
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "entities" / "templates"
+
+WORKERS = 4
+ROUNDS = 10
+
+
+def vault_worker(vault_path, worker_id):
+    """Mention a shared entity, create a shared new entity and link them."""
+    manager = ObsidianEntityManager(vault_path)
+    for round_number in range(ROUNDS):
+        resolved = manager.resolve_entities([
+            {'name': 'Scranton', 'type': 'LOCATION', 'confidence': 0.8},
+            {'name': 'Brand New Person', 'type': 'PERSON', 'confidence': 0.6},
+        ])
+        entity_map = {entity['name']: entity['file_path'] for entity in resolved}
+        manager.create_entity_relationships([{
+            'from': 'Scranton',
+            'to': 'Brand New Person',
+            'type': f'MENTIONED_WITH_{worker_id}_{round_number}',
+        }], entity_map)
+
+        # Interleave flushes so workers contend on the same notes
+        if round_number % 3 == 2:
+            manager.flush()
+    manager.flush()
+
+
+@pytest.mark.skipif(not vault_lock.fcntl_available, reason="advisory locks need fcntl")
+def test_parallel_workers_lose_no_updates(temp_dir):
+    vault = temp_dir / "entities"
+    shutil.copytree(TEMPLATES_DIR, vault / "templates")
+    scranton = vault / "locations" / "scranton.md"
+    scranton.parent.mkdir(parents=True)
+    scranton.write_text(
+        "---\nname: Scranton\naliases: []\nentity_type: LOCATION\nconfidence: 0.9\nmention_count: 0\n---\n\n# Scranton\n"
+    )
+
+    processes = [
+        multiprocessing.Process(target=vault_worker, args=(str(vault), worker_id))
+        for worker_id in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    total = WORKERS * ROUNDS
+
+    front_matter, body = split_front_matter(scranton.read_text())
+    assert front_matter['mention_count'] == total
+    assert len(front_matter['relationships']) == total
+    assert body == "\n\n# Scranton\n"
+
+    # The new entity was created exactly once; later attempts became mentions
+    people = sorted(p.name for p in (vault / "people").glob("*.md"))
+    assert people == ["brand-new-person.md"]
+    person, _ = split_front_matter((vault / "people" / "brand-new-person.md").read_text())
+    assert person['mention_count'] == total
+
+    # Every journal was flushed and removed
+    assert not list((vault / ".scrantenna" / "journals").glob("*.jsonl"))
@@ -0,0 +1,121 @@
+"""
+Unit tests for the indexed article archive and its NewsLoader backend.
+"""
+
+import json
+import os
+
+import pytest
+
+from pipeline import ArticleArchive, NewsLoader
+from pipeline.article_archive import article_fingerprint
+
+
+def write_daily_file(data_dir, date, articles):
+    """Write a scranton_news_<date>.json file."""
+    path = data_dir / f"scranton_news_{date}.json"
+    with open(path, 'w') as f:
+        json.dump({"articles": articles}, f)
+    return path
+
+
+def make_article(i, source="Times Tribune"):
+    return {
+        "title": f"Scranton story number {i}",
+        "description": f"Description {i}",
+        "url": f"https://example.com/news/{i}",
+        "publishedAt": "2025-06-25T10:00:00Z",
+        "source": {"name": source},
+    }
+
+
+@pytest.fixture
+def archive(temp_dir):
+    archive = ArticleArchive(str(temp_dir / "archive" / "articles.db"))
+    yield archive
+    archive.close()
+
+
+@pytest.fixture
+def daily_dir(temp_dir):
+    data_dir = temp_dir / "daily"
+    data_dir.mkdir()
+    write_daily_file(data_dir, "2025-06-24", [make_article(1), make_article(2, "WNEP")])
+    write_daily_file(data_dir, "2025-06-25", [make_article(3), make_article(2, "WNEP")])
+    write_daily_file(data_dir, "2025-06-26", [make_article(4)])
+    return data_dir
+
+
+class TestArticleArchive:
+    """Test suite for ArticleArchive."""
+
+    def test_sync_imports_daily_files(self, archive, daily_dir):
+        """Daily files are imported and duplicates across days collapse by URL."""
+        archive.sync(daily_dir)
+
+        assert archive.count() == 4
+        assert archive.available_dates() == ["2025-06-24", "2025-06-25", "2025-06-26"]
+        assert archive.latest_date() == "2025-06-26"
+
+    def test_sync_skips_unchanged_files(self, archive, daily_dir):
+        """Re-syncing only re-imports files whose size or mtime changed."""
+        assert archive.sync(daily_dir) == 5
+        assert archive.sync(daily_dir) == 0
+
+        changed = write_daily_file(daily_dir, "2025-06-26", [make_article(4), make_article(5)])
+        os.utime(changed, (1, 1))
+        assert archive.sync(daily_dir) == 2
+        assert archive.count() == 5
+
+    def test_range_scan(self, archive, daily_dir):
+        """Range scans return articles in date order, optionally by source."""
+        archive.sync(daily_dir)
+
+        titles = [a['title'] for a in archive.load_date_range("2025-06-24", "2025-06-25")]
+        assert titles == ["Scranton story number 1", "Scranton story number 2", "Scranton story number 3"]
+
+        wnep = archive.load_date_range("2025-06-01", "2025-06-30", source="WNEP")
+        assert [a['url'] for a in wnep] == ["https://example.com/news/2"]
+
+        assert len(archive.last_n_days(2, today="2025-06-26")) == 2
+
+    def test_point_lookups(self, archive, daily_dir):
+        """Articles can be looked up by URL and by content fingerprint."""
+        archive.sync(daily_dir)
+
+        article = archive.get_by_url("https://example.com/news/3")
+        assert article['title'] == "Scranton story number 3"
+        assert archive.get_by_url("https://example.com/missing") is None
+
+        matches = archive.get_by_fingerprint(article_fingerprint(make_article(3)))
+        assert [a['url'] for a in matches] == ["https://example.com/news/3"]
+
+
+class TestNewsLoaderArchiveBackend:
+    """NewsLoader answers queries from the archive when one is configured."""
+
+    def test_loader_uses_archive(self, archive, daily_dir):
+        loader = NewsLoader(str(daily_dir), archive=archive)
+
+        assert loader.get_available_dates() == ["2025-06-24", "2025-06-25", "2025-06-26"]
+        assert len(loader.load_date_range("2025-06-25", "2025-06-26")) == 2
+        assert [a['url'] for a in loader.load_latest()] == ["https://example.com/news/4"]
+        assert loader.latest_file() == daily_dir / "scranton_news_2025-06-26.json"
+
+    def test_latest_is_the_newest_file_on_disk(self, archive, daily_dir):
+        """load_latest returns the latest file's articles, including carried-over stories."""
+        loader = NewsLoader(str(daily_dir), archive=archive)
+        loader.load_date_range("2025-06-24", "2025-06-26")  # Imports everything
+
+        latest = write_daily_file(daily_dir, "2025-06-27", [make_article(3), make_article(5)])
+        assert [a['url'] for a in loader.load_latest()] == ["https://example.com/news/3",
+                                                           "https://example.com/news/5"]
+
+        latest.unlink()
+        assert loader.latest_file() == daily_dir / "scranton_news_2025-06-26.json"
+
+    def test_loader_without_archive_still_globs(self, daily_dir):
+        loader = NewsLoader(str(daily_dir))
+
+        assert loader.latest_file() == daily_dir / "scranton_news_2025-06-26.json"
+        assert len(loader.load_date_range("2025-06-24", "2025-06-25")) == 4
@@ -0,0 +1,62 @@
+"""
+Unit tests for build manifests.
+"""
+
+import json
+
+from pipeline.build_manifest import BuildManifest, digest_files, manifest_path
+
+INPUTS = {"news_file": "aaa", "extractor": "bbb", "prompts": "ccc"}
+
+
+def build(temp_dir, inputs=INPUTS):
+    output = temp_dir / "shorts_data.json"
+    output.write_text('{"shorts": []}')
+    BuildManifest(output).write(inputs)
+    return output
+
+
+class TestBuildManifest:
+    """Test suite for BuildManifest."""
+
+    def test_manifest_sits_next_to_output(self, temp_dir):
+        output = build(temp_dir)
+        assert manifest_path(output) == temp_dir / "shorts_data.manifest.json"
+        assert json.loads(manifest_path(output).read_text())["inputs"] == INPUTS
+
+    def test_matching_inputs_are_current(self, temp_dir):
+        current, reason = BuildManifest(build(temp_dir)).check(dict(INPUTS))
+        assert current is True
+        assert reason.startswith("up to date")
+
+    def test_reason_names_changed_inputs(self, temp_dir):
+        manifest = BuildManifest(build(temp_dir))
+        current, reason = manifest.check({**INPUTS, "prompts": "new", "extractor": "new"})
+        assert current is False
+        assert reason == "inputs changed: extractor, prompts"
+
+    def test_added_or_removed_inputs_are_changes(self, temp_dir):
+        manifest = BuildManifest(build(temp_dir))
+        assert manifest.check({**INPUTS, "vault_index": "1"}) == (False, "inputs changed: vault_index")
+        assert manifest.check({"news_file": "aaa", "extractor": "bbb"}) == (False, "inputs changed: prompts")
+
+    def test_modified_output_is_stale(self, temp_dir):
+        output = build(temp_dir)
+        output.write_text('{"shorts": [1]}')
+        current, reason = BuildManifest(output).check(INPUTS)
+        assert current is False
+        assert "modified" in reason
+
+    def test_corrupt_manifest_is_stale(self, temp_dir):
+        output = build(temp_dir)
+        manifest_path(output).write_text("not json")
+        current, reason = BuildManifest(output).check(INPUTS)
+        assert current is False
+        assert "manifest" in reason
+
+    def test_digest_files_tracks_content(self, temp_dir):
+        source = temp_dir / "extractor.py"
+        source.write_text("PROMPT = 'a'")
+        before = digest_files([source])
+        source.write_text("PROMPT = 'b'")
+        assert digest_files([source]) != before
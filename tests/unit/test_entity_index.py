@@ -0,0 +1,128 @@
+"""
+Unit tests for the entity name lookup indexes.
+"""
+
+import random
+import re
+import string
+from difflib import SequenceMatcher
+
+from entity_index import FuzzyNameIndex, SearchPatternIndex
+
+
+def linear_best_match(query, names, threshold=0.8):
+    """The pre-index strategy: score every name with SequenceMatcher."""
+    best_match, best_score = None, threshold
+    for name, entity in names:
+        similarity = SequenceMatcher(None, query.lower(), name.lower()).ratio()
+        if similarity > best_score:
+            best_score, best_match = similarity, entity
+    return best_match
+
+
+def mutate(rng, text):
+    """Apply one or two random character edits."""
+    chars = list(text)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(chars))
+        action = rng.choice(['insert', 'delete', 'replace'])
+        if action == 'insert':
+            chars.insert(position, rng.choice(string.ascii_lowercase))
+        elif action == 'delete' and len(chars) > 1:
+            del chars[position]
+        else:
+            chars[position] = rng.choice(string.ascii_lowercase)
+    return ''.join(chars)
+
+
+def random_name(rng):
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+             for _ in range(rng.randint(1, 3))]
+    return ' '.join(words).title()
+
+
+class TestFuzzyNameIndex:
+    """Test suite for FuzzyNameIndex."""
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(1234)
+        names = [(random_name(rng), i) for i in range(200)]
+        index = FuzzyNameIndex()
+        for name, entity in names:
+            index.add(name, entity)
+
+        queries = [mutate(rng, rng.choice(names)[0]) for _ in range(150)]
+        queries += [random_name(rng) for _ in range(50)]
+
+        for query in queries:
+            assert index.best_match(query) == linear_best_match(query, names), query
+
+    def test_shortlist_is_small(self):
+        rng = random.Random(99)
+        index = FuzzyNameIndex()
+        for i in range(2000):
+            index.add(random_name(rng), i)
+        index.add("Paige Cognetti", "paige")
+
+        assert index.best_match("Paige Cogneti") == "paige"
+        assert len(index.candidates("Paige Cogneti")) < len(index) / 20
+
+    def test_accept_filter_and_duplicates(self):
+        index = FuzzyNameIndex()
+        person = {'entity_type': 'PERSON'}
+        place = {'entity_type': 'LOCATION'}
+        index.add("Ritz Theater", place)
+        index.add("Ritz Theater", place)
+        index.add("Ritz Theatre", person)
+
+        assert len(index) == 2
+        assert index.best_match("ritz theatr") is place
+        assert index.best_match("ritz theatr", lambda e: e['entity_type'] == 'PERSON') is person
+
+
+class TestSearchPatternIndex:
+    """Test suite for SearchPatternIndex."""
+
+    def linear_match(self, entries, name, entity_type):
+        """The pre-index strategy: search each entity's patterns in turn."""
+        for entity, owner_type, patterns in entries:
+            if owner_type != entity_type and entity_type != 'UNKNOWN':
+                continue
+            for pattern in patterns:
+                if re.search(pattern, name, re.IGNORECASE):
+                    return entity
+        return None
+
+    def test_first_matching_entity_wins(self):
+        entries = [
+            ("paige", 'PERSON', ["Mayor Cognetti", "Paige.*Cognetti"]),
+            ("bill", 'PERSON', ["Gaughan", "Commissioner.*Bill"]),
+            ("scranton", 'LOCATION', [r"\bScranton\b", "Electric City"]),
+            ("mayor", 'PERSON', ["Mayor"]),
+        ]
+        index = SearchPatternIndex()
+        for entity, entity_type, patterns in entries:
+            index.add(entity, entity_type, patterns)
+
+        cases = [
+            ("Mayor Bill Gaughan", 'PERSON'),
+            ("mayor of scranton", 'PERSON'),
+            ("PAIGE G. COGNETTI", 'PERSON'),
+            ("Scranton Mayor Cognetti", 'UNKNOWN'),
+            ("Scranton Mayor Cognetti", 'LOCATION'),
+            ("the electric city", 'LOCATION'),
+            ("Wilkes-Barre", 'UNKNOWN'),
+        ]
+        for name, entity_type in cases:
+            assert index.match(name, entity_type) == self.linear_match(entries, name, entity_type), name
+
+    def test_invalid_patterns_reported_once(self, capsys):
+        index = SearchPatternIndex()
+        entity = {'name': 'Ritz'}
+        index.add(entity, 'LOCATION', ["Ritz(", "Ritz Theat(er|re)"], label="ritz.md")
+        index.add(entity, 'LOCATION', ["Ritz(", "Ritz Theat(er|re)"], label="ritz.md")
+
+        assert capsys.readouterr().out.count("Invalid search pattern") == 1
+        assert index.invalid[0][:2] == ("ritz.md", "Ritz(")
+        # A pattern with its own groups still resolves via the ordered fallback
+        assert index.match("ritz theatre", 'LOCATION') is entity
@@ -307,4 +307,20 @@ class TestProductionFreeLLMExtractor:
         assert extractor._map_hf_entity_type("ORG") == "ORGANIZATION"
         assert extractor._map_hf_entity_type("LOC") == "LOCATION"
         assert extractor._map_hf_entity_type("MISC") == "OTHER"
-        assert extractor._map_hf_entity_type("UNKNOWN") == "OTHER"
\ No newline at end of file
+        assert extractor._map_hf_entity_type("UNKNOWN") == "OTHER"
+
+class TestVaultIntegration:
+    """Test suite for integrate_graph_with_vault."""
+    
+    def test_vault_failure_keeps_extraction(self):
+        """A vault error is logged and the article keeps its standard extraction."""
+        from shorts.free_llm_extractor import integrate_graph_with_vault
+        
+        graph = {"entities": [{"name": "Scranton", "type": "LOCATION"}], "relationships": [],
+                 "method": "rule_based"}
+        with patch('obsidian_entity_manager.integrate_with_obsidian', side_effect=OSError("vault unreadable")):
+            result = integrate_graph_with_vault(graph, {"url": "https://example.com/a"})
+        
+        assert result is graph
+        assert result["method"] == "rule_based"
+        assert result["entities"] == [{"name": "Scranton", "type": "LOCATION"}]
@@ -0,0 +1,65 @@
+"""
+Unit tests for the front-matter codec.
+"""
+
+import yaml
+
+import front_matter
+from front_matter import read_front_matter, split_front_matter, write_front_matter
+
+HEADER = b"---\nname: Scranton\naliases: [Electric City]\nfirst_mentioned: 2025-06-25\n---"
+# CRLF line endings, non-UTF-8 bytes and a delimiter inside the body
+BODY = b"\r\n\r\n# Scranton\r\n\r\n---\r\n\xff\xfe raw bytes \xe2\x80\x94 kept\r\n"
+
+
+class TestFrontMatterCodec:
+    """Test suite for the front-matter codec."""
+
+    def test_reads_header_without_decoding_body(self, temp_dir):
+        note = temp_dir / "scranton.md"
+        note.write_bytes(HEADER + BODY)
+
+        metadata = read_front_matter(note)
+
+        assert metadata['name'] == "Scranton"
+        assert metadata['aliases'] == ["Electric City"]
+
+    def test_rewrite_preserves_body_bytes(self, temp_dir):
+        note = temp_dir / "scranton.md"
+        note.write_bytes(HEADER + BODY)
+
+        metadata = read_front_matter(note)
+        metadata['mention_count'] = 4
+        assert write_front_matter(note, metadata)
+
+        content = note.read_bytes()
+        assert content.endswith(b"---" + BODY)
+        assert read_front_matter(note)['mention_count'] == 4
+        assert [p.name for p in temp_dir.iterdir()] == ["scranton.md"]
+
+    def test_notes_without_front_matter(self, temp_dir):
+        note = temp_dir / "plain.md"
+        note.write_bytes(b"# Just a heading\n---\n")
+        unterminated = temp_dir / "open.md"
+        unterminated.write_bytes(b"---\nname: Open\n")
+
+        assert read_front_matter(note) is None
+        assert read_front_matter(unterminated) is None
+        assert not write_front_matter(note, {'name': 'x'})
+        assert note.read_bytes() == b"# Just a heading\n---\n"
+
+    def test_split_matches_previous_parser(self):
+        content = (HEADER + b"\n\n# Scranton\n").decode('utf-8')
+        end_marker = content.find('---', 3)
+
+        metadata, body = split_front_matter(content)
+
+        assert metadata == yaml.safe_load(content[3:end_marker].strip())
+        assert body == content[end_marker + 3:]
+
+    def test_dump_matches_pure_python_dumper(self):
+        metadata = {'name': 'Scranton', 'mention_count': 3, 'aliases': ['Electric City'],
+                    'relationships': [{'target': '[[PA]]', 'type': 'LOCATED_IN', 'confidence': 0.8}]}
+
+        expected = "---\n" + yaml.dump(metadata, default_flow_style=False) + "---"
+        assert front_matter.dump_front_matter(metadata) == expected
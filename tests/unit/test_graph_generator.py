@@ -0,0 +1,194 @@
+"""
+Unit tests for the cumulative knowledge graph in graph_generator.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+import graph_generator
+from graph_generator import NewsGraphGenerator, process_news_to_graph, stable_entity_id
+
+
+def write_daily_file(data_dir, date, articles):
+    path = data_dir / f"scranton_news_{date}.json"
+    path.write_text(json.dumps({"articles": articles}))
+    return path
+
+
+def article(i, title):
+    return {"title": title, "description": "", "url": f"https://example.com/{i}"}
+
+
+DAY_ONE = [article(0, "Cognetti visits Scranton"), article(1, "Scranton council meets")]
+DAY_TWO = [article(1, "Scranton council meets"), article(2, "Cognetti opens Steamtown")]
+
+
+class TestCumulativeGraph:
+    """Test suite for multi-day graph merging."""
+
+    def test_ids_are_content_derived(self):
+        first, second = NewsGraphGenerator(), NewsGraphGenerator()
+        second.add_entity("Steamtown", "GPE")
+
+        assert first.add_entity("scranton", "GPE") == second.add_entity("Scranton", "GPE")
+        assert first.add_entity("Scranton", "GPE") == stable_entity_id("Scranton")
+
+    def test_days_merge_into_one_graph(self, temp_dir):
+        output_dir = temp_dir / "graph"
+        process_news_to_graph(write_daily_file(temp_dir, "2025-06-25", DAY_ONE), output_dir, cumulative=True)
+        graph = process_news_to_graph(write_daily_file(temp_dir, "2025-06-26", DAY_TWO), output_dir,
+                                      cumulative=True)
+
+        scranton = graph["entities"]["Scranton"]
+        assert scranton["id"] == stable_entity_id("Scranton")
+        # The repeated council story is only counted once
+        assert scranton["mention_count"] == 2
+        assert (scranton["first_seen"], scranton["last_seen"]) == ("2025-06-25", "2025-06-25")
+        cognetti = graph["entities"]["Cognetti"]
+        assert cognetti["mention_count"] == 2
+        assert (cognetti["first_seen"], cognetti["last_seen"]) == ("2025-06-25", "2025-06-26")
+        assert graph["days"] == {"2025-06-25": 2, "2025-06-26": 1}
+        assert "merged_articles" not in graph
+
+        saved = json.loads((output_dir / "knowledge_graph.json").read_text())
+        assert saved["entities"] == graph["entities"]
+        state = json.loads((output_dir / "merge_state.json").read_text())
+        assert len(state["merged_articles"]) == 3
+        assert not list(output_dir.glob(".*.tmp"))
+
+    def test_rerunning_a_day_changes_nothing(self, temp_dir):
+        output_dir = temp_dir / "graph"
+        day_one = write_daily_file(temp_dir, "2025-06-25", DAY_ONE)
+        first = process_news_to_graph(day_one, output_dir, cumulative=True)
+        second = process_news_to_graph(day_one, output_dir, cumulative=True)
+
+        assert second["entities"] == first["entities"]
+        assert second["days"] == first["days"]
+
+    def test_unchanged_day_skips_derived_outputs(self, temp_dir, monkeypatch):
+        output_dir = temp_dir / "graph"
+        day_one = write_daily_file(temp_dir, "2025-06-25", DAY_ONE)
+        process_news_to_graph(day_one, output_dir, cumulative=True)
+        saved = (output_dir / "knowledge_graph.json").read_bytes()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("derived outputs regenerated")
+
+        monkeypatch.setattr(NewsGraphGenerator, "generate_graphviz", fail)
+        monkeypatch.setattr(NewsGraphGenerator, "generate_neo4j_cypher", fail)
+        monkeypatch.setattr(graph_generator, "write_graph_tiles", fail)
+        process_news_to_graph(day_one, output_dir, cumulative=True)
+
+        assert (output_dir / "knowledge_graph.json").read_bytes() == saved
+
+    def test_crash_before_graph_write_merges_again(self, temp_dir, monkeypatch):
+        output_dir = temp_dir / "graph"
+        process_news_to_graph(write_daily_file(temp_dir, "2025-06-25", DAY_ONE), output_dir, cumulative=True)
+        saved = json.loads((output_dir / "knowledge_graph.json").read_text())
+
+        real_write_json = graph_generator.write_json
+
+        def crash_on_graph(path, *args, **kwargs):
+            if path.name == "knowledge_graph.json":
+                raise OSError("disk full")
+            return real_write_json(path, *args, **kwargs)
+
+        day_two = write_daily_file(temp_dir, "2025-06-26", DAY_TWO)
+        monkeypatch.setattr(graph_generator, "write_json", crash_on_graph)
+        with pytest.raises(OSError):
+            process_news_to_graph(day_two, output_dir, cumulative=True)
+        monkeypatch.setattr(graph_generator, "write_json", real_write_json)
+        assert json.loads((output_dir / "knowledge_graph.json").read_text()) == saved
+
+        graph = process_news_to_graph(day_two, output_dir, cumulative=True)
+        assert graph["days"] == {"2025-06-25": 2, "2025-06-26": 1}
+        assert graph["entities"]["Cognetti"]["mention_count"] == 2
+
+    def test_inline_merge_state_moves_to_sidecar(self, temp_dir):
+        output_dir = temp_dir / "graph"
+        output_dir.mkdir()
+        graph_gen = NewsGraphGenerator()
+        graph_gen.merge_articles(DAY_ONE, "2025-06-25")
+        legacy = dict(graph_gen.to_graph_data(), merged_articles=sorted(graph_gen.merged_articles))
+        (output_dir / "knowledge_graph.json").write_text(json.dumps(legacy))
+
+        graph = process_news_to_graph(write_daily_file(temp_dir, "2025-06-26", DAY_TWO), output_dir,
+                                      cumulative=True)
+
+        assert graph["days"] == {"2025-06-25": 2, "2025-06-26": 1}
+        state = json.loads((output_dir / "merge_state.json").read_text())
+        assert len(state["merged_articles"]) == 3
+
+    def test_saved_graph_has_entity_positions(self, temp_dir):
+        pytest.importorskip("numpy")
+        output_dir = temp_dir / "graph"
+        process_news_to_graph(write_daily_file(temp_dir, "2025-06-25", DAY_ONE), output_dir, cumulative=True)
+
+        saved = json.loads((output_dir / "knowledge_graph.json").read_text())
+        assert all(0 <= entity["x"] <= 1 and 0 <= entity["y"] <= 1 for entity in saved["entities"].values())
+
+    def test_default_mode_rebuilds_from_one_day(self, temp_dir):
+        output_dir = temp_dir / "graph"
+        process_news_to_graph(write_daily_file(temp_dir, "2025-06-25", DAY_ONE), output_dir)
+        graph = process_news_to_graph(write_daily_file(temp_dir, "2025-06-26", DAY_TWO), output_dir)
+
+        assert "Cognetti" in graph["entities"]
+        assert graph["entities"]["Scranton"]["first_seen"] == "2025-06-26"
+        assert graph["days"] == {"2025-06-26": 2}
+
+    def test_relationships_merge_with_counts(self):
+        graph_gen = NewsGraphGenerator()
+        a, b = graph_gen.add_entity("Cognetti", "PERSON"), graph_gen.add_entity("Scranton", "GPE")
+        graph_gen.add_relationship(a, "WORKS_AT", b, "2025-06-25")
+        graph_gen.add_relationship(a, "WORKS_AT", b, "2025-06-27")
+
+        assert graph_gen.relationships == [{
+            "subject": a, "relationship": "WORKS_AT", "object": b,
+            "mention_count": 2, "first_seen": "2025-06-25", "last_seen": "2025-06-27",
+        }]
+
+    def test_legacy_counter_ids_are_migrated(self):
+        legacy = {
+            "entities": {
+                "Scranton": {"id": "GPE_0", "type": "GPE", "label": "Scranton", "properties": {}},
+                "Cognetti": {"id": "PERSON_1", "type": "PERSON", "label": "Cognetti", "properties": {}},
+            },
+            "relationships": [{"subject": "PERSON_1", "relationship": "WORKS_AT", "object": "GPE_0"}] * 2,
+        }
+
+        graph_gen = NewsGraphGenerator.from_graph_data(legacy)
+
+        assert graph_gen.entities["Scranton"]["id"] == stable_entity_id("Scranton")
+        assert graph_gen.relationships == [{
+            "subject": stable_entity_id("Cognetti"), "relationship": "WORKS_AT",
+            "object": stable_entity_id("Scranton"), "mention_count": 2,
+        }]
+
+
+class TestGraphviz:
+    """Test suite for the Graphviz visualization step."""
+
+    def test_missing_dot_binary_skips_rendering(self, temp_dir, monkeypatch):
+        monkeypatch.setattr(graph_generator, "graphviz_available", True)
+        monkeypatch.setattr(graph_generator, "graphviz", MagicMock(), raising=False)
+        monkeypatch.setenv("PATH", str(temp_dir))
+
+        graph = process_news_to_graph(write_daily_file(temp_dir, "2025-06-25", DAY_ONE), temp_dir / "graph")
+
+        assert "Scranton" in graph["entities"]
+        assert not list((temp_dir / "graph").glob("news_knowledge_graph.*"))
+        assert (temp_dir / "graph" / "knowledge_graph.json").exists()
+
+    def test_failed_render_skips_rendering(self, temp_dir, monkeypatch):
+        monkeypatch.setattr(graph_generator, "graphviz_available", True)
+        monkeypatch.setattr(graph_generator, "graphviz", MagicMock(), raising=False)
+        # On PATH but not runnable
+        dot = temp_dir / "dot"
+        dot.write_text("")
+        dot.chmod(0o644)
+        monkeypatch.setattr(graph_generator.GraphRenderer, "available", property(lambda self: True))
+        monkeypatch.setenv("PATH", str(temp_dir))
+
+        assert NewsGraphGenerator().generate_graphviz(temp_dir / "graph" / "news_knowledge_graph") is None
@@ -0,0 +1,164 @@
+"""
+Unit tests for server-side graph layouts.
+"""
+
+import json
+
+import pytest
+
+import graph_layout
+from graph_layout import add_graph_layouts, add_knowledge_graph_positions
+
+np = pytest.importorskip("numpy")
+
+from graph_layout import (  # noqa: E402
+    LayoutCache,
+    graph_signature,
+    shortest_path_lengths,
+    stress,
+    stress_majorization,
+)
+
+
+def make_graph(names, edges):
+    return {
+        'entities': [{'name': name, 'type': 'PERSON'} for name in names],
+        'relationships': [{'from': a, 'to': b, 'type': 'KNOWS'} for a, b in edges]
+    }
+
+
+class TestLayoutMath:
+    def test_shortest_paths_on_a_chain(self):
+        distances = shortest_path_lengths(4, [(0, 1), (1, 2), (2, 3)])
+        assert distances[0, 3] == 3
+        assert distances[3, 0] == 3
+        assert distances[1, 1] == 0
+
+    def test_disconnected_pairs_get_max_plus_one(self):
+        distances = shortest_path_lengths(3, [(0, 1)])
+        assert distances[0, 2] == 2
+        assert np.isfinite(distances).all()
+
+    def test_stress_majorization_reduces_stress(self):
+        distances = shortest_path_lengths(5, [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0)])
+        initial = np.random.default_rng(0).normal(size=(5, 2))
+        result = stress_majorization(distances, initial)
+        assert stress(result, distances) < stress(initial, distances)
+        assert stress(result, distances) < 0.5
+
+    def test_signature_ignores_order(self):
+        assert graph_signature(['a', 'b'], [('a', 'b')]) == graph_signature(['b', 'a'], [('a', 'b')])
+        assert graph_signature(['a', 'b'], [('a', 'b')]) != graph_signature(['a', 'b'], [('b', 'a')])
+
+
+class TestLayoutCache:
+    def test_positions_are_normalized(self, temp_dir):
+        cache = LayoutCache(temp_dir / "layouts.json")
+        layout = cache.layout_graph(make_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('B', 'C'), ('C', 'D')]))
+
+        assert layout['algorithm'] == 'stress'
+        assert set(layout['positions']) == {'A', 'B', 'C', 'D'}
+        coordinates = np.array(list(layout['positions'].values()))
+        assert coordinates.min() >= 0 and coordinates.max() <= 1
+        assert np.isclose(np.ptp(coordinates, axis=0).max(), 1, atol=1e-3)
+
+    def test_single_entity_is_centered(self, temp_dir):
+        layout = LayoutCache(temp_dir / "layouts.json").layout_graph(make_graph(['A'], []))
+        assert layout['positions'] == {'A': [0.5, 0.5]}
+
+    def test_unchanged_graph_reuses_cached_layout(self, temp_dir, monkeypatch):
+        graph = make_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C')])
+        cache = LayoutCache(temp_dir / "layouts.json")
+        first = cache.layout_graph(graph)
+        cache.save()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("layout recomputed")
+
+        monkeypatch.setattr(graph_layout, 'stress_majorization', fail)
+        assert LayoutCache(temp_dir / "layouts.json").layout_graph(graph) == first
+
+    def test_recurring_entities_keep_their_relative_placement(self, temp_dir):
+        cache = LayoutCache(temp_dir / "layouts.json")
+        day_one = make_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('B', 'C'), ('C', 'D')])
+        cache.layout_graph(day_one)
+        before = {name: np.array(cache.entities[name]['position']) for name in 'ABCD'}
+
+        day_two = make_graph(['A', 'B', 'C', 'D', 'E'], [('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'E')])
+        cache.layout_graph(day_two)
+        moved = max(np.linalg.norm(np.array(cache.entities[name]['position']) - before[name]) for name in 'ABCD')
+        assert moved < 0.5
+
+    def test_save_prunes_stale_entries(self, temp_dir):
+        path = temp_dir / "layouts.json"
+        cache = LayoutCache(path)
+        cache.layout_graph(make_graph(['A', 'B'], [('A', 'B')]))
+        cache.entities['Old'] = {'position': [0, 0], 'last_seen': '2000-01-01'}
+        cache.save()
+
+        saved = json.loads(path.read_text())
+        assert 'Old' not in saved['entities']
+        assert set(saved['entities']) == {'A', 'B'}
+
+
+def test_add_graph_layouts(temp_dir):
+    shorts = [
+        {'graph': make_graph(['A', 'B'], [('A', 'B')])},
+        {'graph': make_graph([], [])},
+        {'title': 'no graph'}
+    ]
+    assert add_graph_layouts(shorts, temp_dir / "layouts.json") == 1
+    assert 'layout' in shorts[0]['graph']
+    assert 'layout' not in shorts[1]['graph']
+    assert (temp_dir / "layouts.json").exists()
+
+
+def test_add_graph_layouts_redraws_svg(temp_dir):
+    from svg_graph import render_svg_graph
+
+    graph = make_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C')])
+    graph['svg'] = render_svg_graph(graph['entities'], graph['relationships'])
+    grid_svg = graph['svg']
+    add_graph_layouts([{'graph': graph}], temp_dir / "layouts.json")
+
+    assert graph['svg'] == render_svg_graph(graph['entities'], graph['relationships'], graph['layout']['positions'])
+    assert graph['svg'] != grid_svg
+
+
+def knowledge_graph(names, edges):
+    return {
+        'entities': {name: {'id': f"entity_{name}", 'type': 'PERSON'} for name in names},
+        'relationships': [{'subject': f"entity_{a}", 'relationship': 'KNOWS', 'object': f"entity_{b}"}
+                          for a, b in edges]
+    }
+
+
+class TestKnowledgeGraphPositions:
+    def test_every_entity_gets_normalized_coordinates(self):
+        graph = knowledge_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C')])
+        assert add_knowledge_graph_positions(graph)
+
+        coordinates = np.array([[entity['x'], entity['y']] for entity in graph['entities'].values()])
+        assert coordinates.min() >= 0 and coordinates.max() <= 1
+        json.dumps(graph)
+
+    def test_previous_positions_seed_the_layout(self):
+        graph = knowledge_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('B', 'C'), ('C', 'D')])
+        add_knowledge_graph_positions(graph)
+        before = {name: np.array([entity['x'], entity['y']]) for name, entity in graph['entities'].items()}
+
+        grown = knowledge_graph(['A', 'B', 'C', 'D', 'E'], [('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'E')])
+        for name, position in before.items():
+            grown['entities'][name].update(x=position[0], y=position[1])
+        add_knowledge_graph_positions(grown)
+
+        moved = max(np.linalg.norm(np.array([grown['entities'][name]['x'], grown['entities'][name]['y']])
+                                   - before[name]) for name in 'ABCD')
+        assert moved < 0.5
+
+    def test_oversized_graph_drops_positions(self):
+        graph = knowledge_graph(['A', 'B', 'C'], [])
+        graph['entities']['A'].update(x=0.1, y=0.2)
+
+        assert not add_knowledge_graph_positions(graph, max_nodes=2)
+        assert all('x' not in entity for entity in graph['entities'].values())
@@ -0,0 +1,95 @@
+"""
+Unit tests for the cached Graphviz renderer.
+"""
+
+import os
+import shutil
+import sys
+import textwrap
+
+import pytest
+
+from graph_render import GraphRenderer
+
+DOT = 'digraph { "Paige Cognetti" -> "Scranton" [label="MAYOR OF"] }'
+
+
+@pytest.fixture
+def fake_dot(temp_dir):
+    """A stand-in ``dot`` that logs each invocation and writes <input>.<format> for -O."""
+    log = temp_dir / "dot_calls.log"
+    script = temp_dir / "fake_dot"
+    script.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import sys
+        args = sys.argv[1:]
+        if args == ['-V']:
+            sys.stderr.write('dot - graphviz version 0.0 (test)\\n')
+            sys.exit(0)
+        with open({str(log)!r}, 'a') as f:
+            f.write(' '.join(args) + '\\n')
+        source = open(args[-1]).read()
+        for arg in args:
+            if arg.startswith('-T'):
+                with open(args[-1] + '.' + arg[2:], 'w') as out:
+                    out.write(arg[2:] + ':' + source)
+    """))
+    script.chmod(0o755)
+    return script, log
+
+
+def calls(log):
+    return log.read_text().splitlines() if log.exists() else []
+
+
+class TestGraphRenderer:
+    """Test suite for the render cache."""
+
+    def test_one_layout_for_all_formats(self, fake_dot, temp_dir):
+        script, log = fake_dot
+        renderer = GraphRenderer(temp_dir / "cache", dot_binary=str(script))
+
+        outputs = renderer.render(DOT, temp_dir / "out" / "graph", ('svg', 'png'))
+
+        assert len(calls(log)) == 1
+        assert calls(log)[0].startswith("-Tsvg -Tpng -O ")
+        assert outputs['svg'].read_text() == f"svg:{DOT}"
+        assert outputs['png'].read_text() == f"png:{DOT}"
+
+    def test_unchanged_source_is_not_rendered_again(self, fake_dot, temp_dir):
+        script, log = fake_dot
+        renderer = GraphRenderer(temp_dir / "cache", dot_binary=str(script))
+
+        renderer.render(DOT, temp_dir / "day1" / "graph")
+        outputs = renderer.render(DOT, temp_dir / "day2" / "graph")
+        renderer.render(DOT + "\n", temp_dir / "day3" / "graph")
+
+        assert len(calls(log)) == 2
+        assert renderer.stats == {'hits': 1, 'renders': 2}
+        assert outputs['svg'].read_text() == f"svg:{DOT}"
+
+    def test_only_missing_formats_are_rendered(self, fake_dot, temp_dir):
+        script, log = fake_dot
+        renderer = GraphRenderer(temp_dir / "cache", dot_binary=str(script))
+
+        renderer.render(DOT, temp_dir / "graph", ('svg',))
+        renderer.render(DOT, temp_dir / "graph", ('svg', 'pdf'))
+
+        assert [line.split()[0] for line in calls(log)] == ["-Tsvg", "-Tpdf"]
+
+    def test_prune_removes_stale_outputs(self, fake_dot, temp_dir):
+        script, _ = fake_dot
+        renderer = GraphRenderer(temp_dir / "cache", dot_binary=str(script))
+        renderer.render(DOT, temp_dir / "graph", ('svg',))
+        cached = next((temp_dir / "cache").glob("*.svg"))
+        os.utime(cached, (0, 0))
+
+        assert renderer.prune(max_age_days=1) == 1
+        assert not cached.exists()
+
+    @pytest.mark.skipif(shutil.which('dot') is None, reason="Graphviz is not installed")
+    def test_real_graphviz(self, temp_dir):
+        outputs = GraphRenderer(temp_dir / "cache").render(DOT, temp_dir / "graph", ('svg', 'png'))
+
+        assert b"<svg" in outputs['svg'].read_bytes()
+        assert outputs['png'].read_bytes().startswith(b"\x89PNG")
@@ -0,0 +1,138 @@
+"""
+Unit tests for the embedded SQLite graph store.
+"""
+
+import random
+from collections import deque
+
+import pytest
+
+from pipeline import GraphStore
+
+
+def short(i, date, source, entities, relationships=()):
+    return {
+        "id": f"short_{i}",
+        "title": f"Story {i}",
+        "url": f"https://example.com/{i}",
+        "source": source,
+        "publishedAt": f"{date}T10:00:00Z",
+        "graph": {
+            "entities": [{"name": name, "type": entity_type, "confidence": 0.8} for name, entity_type in entities],
+            "relationships": [{"from": a, "type": rel_type, "to": b} for a, rel_type, b in relationships],
+        },
+    }
+
+
+SHORTS = [
+    short(0, "2025-06-20", "WNEP", [("Paige Cognetti", "PERSON"), ("Scranton", "LOCATION")],
+          [("Paige Cognetti", "MAYOR_OF", "Scranton")]),
+    short(1, "2025-06-24", "WNEP", [("Scranton", "LOCATION"), ("Steamtown", "LOCATION"),
+                                    ("Lackawanna County", "LOCATION")],
+          [("Steamtown", "LOCATED_IN", "Scranton"), ("Scranton", "LOCATED_IN", "Lackawanna County")]),
+    short(2, "2025-06-25", "Times-Tribune", [("Paige Cognetti", "PERSON"), ("City Council", "ORGANIZATION"),
+                                             ("Scranton", "LOCATION"), ("Budget", "CONCEPT")],
+          [("Paige Cognetti", "PRESENTED_TO", "City Council"), ("City Council", "GOVERNS", "Scranton")]),
+    short(3, "2025-06-26", "Times-Tribune", [("Marywood", "ORGANIZATION"), ("Dunmore", "LOCATION")],
+          [("Marywood", "LOCATED_IN", "Dunmore")]),
+]
+
+
+@pytest.fixture
+def store(temp_dir):
+    store = GraphStore(str(temp_dir / "graph.db"))
+    assert store.add_articles(SHORTS) == 4
+    yield store
+    store.close()
+
+
+class TestGraphStore:
+    """Test suite for the graph store and its sample query shapes."""
+
+    def test_readding_articles_is_a_no_op(self, store):
+        before = store.count()
+        assert store.add_articles(SHORTS) == 0
+        assert store.count() == before == {'entities': 8, 'articles': 4, 'mentions': 11, 'edges': 6}
+
+    def test_mention_and_degree_rankings(self, store):
+        assert store.most_mentioned(2) == [("Scranton", "LOCATION", 3), ("Paige Cognetti", "PERSON", 2)]
+        assert store.top_by_degree(1) == [("Scranton", "LOCATION", 4)]
+
+    def test_neighbors(self, store):
+        assert store.neighbors("Scranton") == [
+            ("GOVERNS", "in", "City Council", "ORGANIZATION"),
+            ("LOCATED_IN", "out", "Lackawanna County", "LOCATION"),
+            ("LOCATED_IN", "in", "Steamtown", "LOCATION"),
+            ("MAYOR_OF", "in", "Paige Cognetti", "PERSON"),
+        ]
+        assert store.neighbors("Nobody") == []
+
+    def test_source_stats_and_timeline(self, store):
+        assert store.source_stats() == [("Times-Tribune", 6, 2), ("WNEP", 4, 2)]
+        assert store.timeline("2025-06-24", "2025-06-25") == [("2025-06-25", 4), ("2025-06-24", 3)]
+
+    def test_find_paths(self, store):
+        assert store.find_paths("Paige Cognetti", "Steamtown") == [
+            {'nodes': ["Paige Cognetti", "Scranton", "Steamtown"], 'relationships': ["MAYOR_OF", "LOCATED_IN"]}
+        ]
+        # Longer detours through other entities are not returned
+        paths = store.find_paths("City Council", "Lackawanna County")
+        assert [path['nodes'] for path in paths] == [["City Council", "Scranton", "Lackawanna County"]]
+        assert store.find_paths("Paige Cognetti", "Lackawanna County", max_depth=1) == []
+        assert store.find_paths("Paige Cognetti", "Marywood") == []
+
+    def test_communities_and_multi_type_articles(self, store):
+        assert store.communities() == [
+            ["City Council", "Lackawanna County", "Paige Cognetti", "Scranton", "Steamtown"],
+            ["Dunmore", "Marywood"],
+        ]
+        assert store.multi_type_articles() == [
+            ("Story 2", "Times-Tribune", ["CONCEPT", "LOCATION", "ORGANIZATION", "PERSON"])
+        ]
+
+    def test_recent_mentions(self, store):
+        assert store.recent_mentions(days=3, today="2025-06-26", limit=3) == [
+            ("Scranton", "LOCATION", 2), ("Budget", "CONCEPT", 1), ("City Council", "ORGANIZATION", 1)
+        ]
+
+    def test_co_occurrences(self, store):
+        assert store.co_occurrences(limit=1) == [("Paige Cognetti", "Scranton", 2)]
+        assert store.co_occurrences(limit=1, entity="Scranton") == [("Paige Cognetti", "Scranton", 2)]
+        assert store.co_occurrences(limit=1, start_date="2025-06-26") == [("Dunmore", "Marywood", 1)]
+
+    def test_bounded_bfs_matches_brute_force(self, temp_dir):
+        rng = random.Random(7)
+        names = [f"E{i}" for i in range(60)]
+        edges = [(rng.choice(names), "REL", rng.choice(names)) for _ in range(90)]
+        with GraphStore(str(temp_dir / "random.db")) as store:
+            store.add_articles([short(i, "2025-06-25", "WNEP", [(a, "X"), (b, "X")], [(a, t, b)])
+                                for i, (a, t, b) in enumerate(edges)])
+
+            adjacency = {}
+            for a, _, b in edges:
+                adjacency.setdefault(a, set()).add(b)
+                adjacency.setdefault(b, set()).add(a)
+
+            def distance(a, b):
+                seen, queue = {a: 0}, deque([a])
+                while queue:
+                    node = queue.popleft()
+                    for neighbor in adjacency.get(node, ()):
+                        if neighbor not in seen:
+                            seen[neighbor] = seen[node] + 1
+                            queue.append(neighbor)
+                return seen.get(b)
+
+            for _ in range(100):
+                a, b = rng.sample(sorted(adjacency), 2)
+                expected = distance(a, b)
+                paths = store.find_paths(a, b, max_depth=4, limit=3)
+                if expected is None or expected > 4:
+                    assert paths == []
+                    continue
+                assert paths
+                for path in paths:
+                    assert path['nodes'][0] == a and path['nodes'][-1] == b
+                    assert len(path['relationships']) == expected
+                    for x, y in zip(path['nodes'], path['nodes'][1:]):
+                        assert y in adjacency[x]
@@ -0,0 +1,92 @@
+"""
+Unit tests for knowledge-graph neighborhood tiles.
+"""
+
+import json
+
+from pipeline import write_graph_tiles
+
+
+def make_graph_data(edges, extra_entities=()):
+    """knowledge_graph.json-shaped data from (subject, object, mention_count) edges."""
+    names = sorted({name for a, b, _ in edges for name in (a, b)} | set(extra_entities))
+    return {
+        "generated_at": "2025-06-26T10:00:00",
+        "entities": {name: {"id": f"id_{name}", "type": "PERSON", "mention_count": 1} for name in names},
+        "relationships": [
+            {"subject": f"id_{a}", "relationship": "KNOWS", "object": f"id_{b}", "mention_count": count}
+            for a, b, count in edges
+        ]
+    }
+
+
+def read_json(path):
+    return json.loads(path.read_text())
+
+
+def load_tile(tiles_dir, name, hops):
+    index = read_json(tiles_dir / "index.json")
+    return read_json(tiles_dir / index["entities"][name][hops - 1])
+
+
+class TestGraphTiles:
+    """Test suite for write_graph_tiles."""
+
+    def test_one_and_two_hop_tiles(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        write_graph_tiles(make_graph_data([("A", "B", 1), ("B", "C", 1), ("C", "D", 1)]), tiles_dir)
+
+        one_hop = load_tile(tiles_dir, "A", 1)
+        two_hop = load_tile(tiles_dir, "A", 2)
+        assert one_hop["center"] == "A"
+        assert {e["name"]: e["hop"] for e in one_hop["entities"]} == {"A": 0, "B": 1}
+        assert {e["name"]: e["hop"] for e in two_hop["entities"]} == {"A": 0, "B": 1, "C": 2}
+        assert {(r["from"], r["to"]) for r in two_hop["relationships"]} == {("A", "B"), ("B", "C")}
+
+    def test_fanout_keeps_strongest_edges(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        edges = [("Hub", f"N{i:02d}", i) for i in range(30)]
+        write_graph_tiles(make_graph_data(edges), tiles_dir, max_fanout=5)
+
+        names = {e["name"] for e in load_tile(tiles_dir, "Hub", 1)["entities"]}
+        assert names == {"Hub", "N29", "N28", "N27", "N26", "N25"}
+        assert next(e for e in load_tile(tiles_dir, "Hub", 1)["entities"] if e["name"] == "Hub")["degree"] == 30
+
+    def test_two_hop_tiles_are_capped(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        edges = [("Hub", f"N{i}", 1) for i in range(10)]
+        edges += [(f"N{i}", f"M{i}_{j}", 1) for i in range(10) for j in range(10)]
+        write_graph_tiles(make_graph_data(edges), tiles_dir, max_fanout=10, second_hop_fanout=2, max_nodes=15)
+
+        tile = load_tile(tiles_dir, "Hub", 2)
+        assert len(tile["entities"]) == 15
+        assert all(r["from"] in {e["name"] for e in tile["entities"]} for r in tile["relationships"])
+
+    def test_isolated_entity_shares_one_tile(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        write_graph_tiles(make_graph_data([("A", "B", 1)], extra_entities=["Lonely"]), tiles_dir)
+
+        index = read_json(tiles_dir / "index.json")
+        assert index["entities"]["Lonely"][0] == index["entities"]["Lonely"][1]
+        assert [e["name"] for e in load_tile(tiles_dir, "Lonely", 2)["entities"]] == ["Lonely"]
+
+    def test_unchanged_neighborhoods_keep_their_filenames(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        write_graph_tiles(make_graph_data([("A", "B", 1), ("C", "D", 1)]), tiles_dir)
+        before = read_json(tiles_dir / "index.json")["entities"]
+
+        write_graph_tiles(make_graph_data([("A", "B", 1), ("C", "D", 1), ("D", "E", 1)]), tiles_dir)
+        after = read_json(tiles_dir / "index.json")["entities"]
+
+        assert after["A"] == before["A"]
+        assert after["C"] != before["C"]
+
+    def test_stale_tiles_are_removed(self, temp_dir):
+        tiles_dir = temp_dir / "tiles"
+        write_graph_tiles(make_graph_data([("A", "B", 1)]), tiles_dir)
+        write_graph_tiles(make_graph_data([("C", "D", 1)]), tiles_dir)
+
+        referenced = {tile for tiles in read_json(tiles_dir / "index.json")["entities"].values() for tile in tiles}
+        on_disk = {path.name for path in tiles_dir.glob("*.json")} - {"index.json"}
+        assert on_disk == referenced
+        assert (tiles_dir / "index.json.gz").exists()
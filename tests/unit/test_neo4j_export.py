@@ -0,0 +1,386 @@
+"""
+Unit tests for the Neo4j exporters.
+"""
+
+import csv
+import gzip
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import neo4j_export
+from neo4j_export import Neo4jBulkCSVExporter, ScrantennaNeo4jExporter, load_parameter_batches
+from pipeline import ArticleArchive
+
+
+@pytest.fixture
+def shorts_file(temp_dir):
+    shorts = [
+        {
+            "id": "short_0",
+            "title": "Mayor's plan for O'Neill Park \\ Phase 2",
+            "source": "Times-Tribune",
+            "publishedAt": "2025-06-25T10:00:00Z",
+            "url": "https://example.com/0",
+            "graph": {
+                "entities": [
+                    {"name": "Paige Cognetti", "type": "PERSON", "confidence": 0.9},
+                    {"name": "O'Neill Park", "type": "LOCATION", "confidence": 0.7},
+                ],
+                "relationships": [{"from": "Paige Cognetti", "to": "O'Neill Park", "type": "VISITED"}],
+            },
+        },
+        {
+            "id": "short_1",
+            "title": "Scranton budget",
+            "source": "WNEP",
+            "publishedAt": "2025-06-26T10:00:00Z",
+            "url": "https://example.com/1",
+            "graph": {
+                "entities": [
+                    {"name": "Scranton", "type": "LOCATION", "confidence": 0.95},
+                    {"name": "Paige Cognetti", "type": "PERSON", "confidence": 0.9},
+                ],
+                "relationships": [{"from": "Paige Cognetti", "to": "Scranton", "type": "MAYOR_OF"}],
+            },
+        },
+    ]
+    path = temp_dir / "shorts_data.json"
+    path.write_text(json.dumps({"shorts": shorts}))
+    return path
+
+
+@pytest.fixture
+def exporter(shorts_file):
+    exporter = ScrantennaNeo4jExporter()
+    assert exporter.load_shorts_data(str(shorts_file))
+    exporter.extract_graph_data()
+    return exporter
+
+
+class TestParameterBatches:
+    """Test suite for UNWIND parameter batch export."""
+
+    def test_batches_carry_raw_values_as_parameters(self, exporter):
+        batches = list(exporter.iter_parameter_batches(batch_size=1000))
+
+        assert all(batch['query'].startswith("UNWIND $rows AS row ") for batch in batches)
+        location = next(b for b in batches if 'Entity:`LOCATION`' in b['query'])
+        assert location['rows'] == [
+            {'name': "O'Neill Park", 'type': 'LOCATION'},
+            {'name': 'Scranton', 'type': 'LOCATION'},
+        ]
+        article = next(b for b in batches if 'MERGE (a:Article' in b['query'])
+        assert article['rows'][0]['title'] == "Mayor's plan for O'Neill Park \\ Phase 2"
+        mentions = next(b for b in batches if ':MENTIONS' in b['query'])
+        assert len(mentions['rows']) == 4
+
+    def test_batch_size_splits_rows(self, exporter):
+        batches = list(exporter.iter_parameter_batches(batch_size=1))
+
+        assert all(len(batch['rows']) == 1 for batch in batches)
+        assert sum(len(batch['rows']) for batch in batches) == 3 + 2 + 2 + 4
+
+    def test_export_and_load_with_driver(self, exporter, temp_dir):
+        batch_file = temp_dir / "graph.batches.json"
+        assert exporter.export_parameter_batches(str(batch_file), batch_size=2)
+        export = json.loads(batch_file.read_text())
+
+        driver = MagicMock()
+        session = driver.__enter__.return_value.session.return_value.__enter__.return_value
+        graph_database = MagicMock()
+        graph_database.driver.return_value = driver
+
+        with patch.object(neo4j_export, 'neo4j_available', True), \
+             patch.object(neo4j_export, 'GraphDatabase', graph_database, create=True):
+            assert load_parameter_batches(str(batch_file), password="secret")
+
+        graph_database.driver.assert_called_once_with("neo4j://localhost:7687", auth=("neo4j", "secret"))
+        # One write transaction per batch
+        assert session.execute_write.call_count == len(export['batches'])
+        tx = MagicMock()
+        session.execute_write.call_args_list[0].args[0](tx)
+        first = export['batches'][0]
+        tx.run.assert_called_once_with(first['query'], rows=first['rows'])
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class TestBulkCSVExport:
+    """Test suite for the neo4j-admin bulk-import CSV exporter."""
+
+    @pytest.fixture
+    def archive(self, temp_dir):
+        archive = ArticleArchive(str(temp_dir / "articles.db"))
+        archive.add_articles([
+            {
+                "title": "Mayor Paige Cognetti visits O'Neill Park, \"again\"",
+                "description": "A multi-line\ndescription",
+                "url": "https://example.com/0",
+                "publishedAt": "2025-06-25T10:00:00Z",
+                "source": {"name": "Times-Tribune"},
+                "graph": {
+                    "entities": [
+                        {"name": "Paige Cognetti", "type": "PERSON", "confidence": 0.9},
+                        {"name": "O'Neill Park", "type": "LOCATION", "confidence": 0.7},
+                    ],
+                    "relationships": [
+                        {"from": "Paige Cognetti", "to": "O'Neill Park", "type": "VISITED"},
+                        {"from": "Paige Cognetti", "to": "Nowhere", "type": "VISITED"},
+                    ],
+                },
+            },
+        ], date="2025-06-25")
+        archive.add_articles([
+            {
+                "title": "Paige Cognetti presents the Scranton budget",
+                "description": "Mayor Paige Cognetti presented the budget.",
+                "url": "https://example.com/1",
+                "publishedAt": "2025-06-26T10:00:00Z",
+                "source": {"name": "WNEP"},
+            },
+        ], date="2025-06-26")
+        yield archive
+        archive.close()
+
+    def export(self, archive, output_dir):
+        exporter = Neo4jBulkCSVExporter(str(output_dir))
+        exporter.export(archive.iter_range("0000-01-01", "9999-12-31"))
+        return exporter
+
+    def test_csv_layout_matches_import_format(self, archive, temp_dir):
+        exporter = self.export(archive, temp_dir / "import")
+        out = temp_dir / "import"
+
+        articles = read_csv(out / "articles.csv")
+        entities = read_csv(out / "entities.csv")
+        mentions = read_csv(out / "mentions.csv")
+        relationships = read_csv(out / "relationships.csv")
+
+        assert articles[0] == [':ID', 'url', 'title', 'source', 'published_at', ':LABEL']
+        assert entities[0] == [':ID', 'name', 'type', ':LABEL']
+        assert mentions[0] == [':START_ID', ':END_ID', 'confidence:float', ':TYPE']
+        assert relationships[0] == [':START_ID', ':END_ID', 'article_id:long', 'source', ':TYPE']
+
+        node_ids = [row[0] for row in articles[1:] + entities[1:]]
+        assert all(node_id.isdigit() for node_id in node_ids)
+        assert len(node_ids) == len(set(node_ids))
+        for row in mentions[1:] + relationships[1:]:
+            assert row[0] in node_ids and row[1] in node_ids
+            assert row[-1]
+
+        assert [row[-1] for row in articles[1:]] == ['Article', 'Article']
+        assert ['Paige Cognetti', 'PERSON', 'Entity;PERSON'] in [row[1:] for row in entities]
+        # Values stay on one line; quotes are doubled by the CSV writer
+        assert articles[1][2] == "Mayor Paige Cognetti visits O'Neill Park, \"again\""
+        assert (out / "articles.csv").read_text().count('\n') == 3
+        # Edges to entities missing from the article graph are dropped
+        assert [row[-1] for row in relationships[1:]].count('VISITED') == 1
+        assert exporter.stats['articles'] == 2
+
+        command = exporter.import_command()
+        assert command.startswith("neo4j-admin database import full --id-type=INTEGER")
+        assert f"--relationships={out / 'mentions.csv'}" in command
+
+    def test_repeated_entity_is_one_mention(self, temp_dir):
+        article = {
+            "title": "Cognetti and Cognetti", "url": "https://example.com/2",
+            "graph": {"entities": [
+                {"name": "Paige Cognetti", "type": "PERSON", "confidence": 0.6},
+                {"name": "Paige Cognetti", "type": "PERSON", "confidence": 0.9},
+            ], "relationships": []},
+        }
+        exporter = Neo4jBulkCSVExporter(str(temp_dir / "import"))
+        exporter.export([article])
+
+        mentions = read_csv(temp_dir / "import" / "mentions.csv")[1:]
+        assert len(mentions) == 1
+        assert mentions[0][2] == "0.9"
+        assert exporter.stats['mentions'] == 1
+
+    def test_output_is_deterministic(self, archive, temp_dir):
+        self.export(archive, temp_dir / "first")
+        self.export(archive, temp_dir / "second")
+
+        for name in ("articles", "entities", "mentions", "relationships"):
+            first = (temp_dir / "first" / f"{name}.csv").read_bytes()
+            assert first == (temp_dir / "second" / f"{name}.csv").read_bytes()
+
+
+class TestDeltaExport:
+    """Test suite for incremental delta exports."""
+
+    def export_delta(self, shorts_file, temp_dir, name, loaded=True):
+        exporter = ScrantennaNeo4jExporter()
+        assert exporter.load_shorts_data(str(shorts_file))
+        output = temp_dir / f"{name}.json"
+        assert exporter.export_delta(str(output), str(temp_dir / "state.json"))
+        if loaded:
+            # What load_parameter_batches() does after a successful load
+            assert neo4j_export.commit_pending_state(str(output)) == (temp_dir / "state.json").resolve()
+        return json.loads(output.read_text())
+
+    def rows(self, export, keyword):
+        return [row for batch in export['batches'] if keyword in batch['query'] for row in batch['rows']]
+
+    def test_first_delta_merges_everything(self, shorts_file, temp_dir):
+        export = self.export_delta(shorts_file, temp_dir, "first")
+
+        assert all('CREATE (' not in batch['query'] and 'MERGE' in batch['query']
+                   for batch in export['batches'])
+        assert [row['id'] for row in self.rows(export, 'MERGE (a:Article')] == [
+            "https://example.com/0", "https://example.com/1"]
+        assert len(self.rows(export, 'MERGE (a)-[m:MENTIONS]')) == 4
+        assert {row['name'] for row in self.rows(export, 'MERGE (e:Entity')} == {
+            "Paige Cognetti", "O'Neill Park", "Scranton"}
+
+        state = json.loads((temp_dir / "state.json").read_text())
+        assert state['watermark']['published_at'] == "2025-06-26T10:00:00Z"
+        assert set(state['articles']) == {"https://example.com/0", "https://example.com/1"}
+
+    def test_rerun_exports_nothing(self, shorts_file, temp_dir):
+        self.export_delta(shorts_file, temp_dir, "first")
+        export = self.export_delta(shorts_file, temp_dir, "second")
+
+        assert export['batches'] == []
+        assert export['since']['published_at'] == "2025-06-26T10:00:00Z"
+
+    def test_next_day_emits_only_new_and_changed_items(self, shorts_file, temp_dir):
+        self.export_delta(shorts_file, temp_dir, "first")
+
+        data = json.loads(shorts_file.read_text())
+        # Positional ids are reused by the next day's feed
+        data['shorts'][0]['id'] = "short_1"
+        data['shorts'][0]['graph']['relationships'] = [
+            {"from": "O'Neill Park", "to": "Paige Cognetti", "type": "HOSTED"}]
+        data['shorts'][1] = {
+            "id": "short_0", "title": "Steamtown", "source": "WNEP",
+            "publishedAt": "2025-06-27T09:00:00Z", "url": "https://example.com/2",
+            "graph": {"entities": [{"name": "Steamtown", "type": "LOCATION", "confidence": 0.8},
+                                   {"name": "Scranton", "type": "LOCATION", "confidence": 0.95}],
+                      "relationships": [{"from": "Steamtown", "to": "Scranton", "type": "LOCATED_IN"}]},
+        }
+        shorts_file.write_text(json.dumps(data))
+
+        export = self.export_delta(shorts_file, temp_dir, "second")
+
+        assert [row['id'] for row in self.rows(export, 'MERGE (a:Article')] == [
+            "https://example.com/0", "https://example.com/2"]
+        assert [row['name'] for row in self.rows(export, 'MERGE (e:Entity')] == ["Steamtown"]
+        assert self.rows(export, 'DELETE r') == [{
+            "from": "Paige Cognetti", "type": "VISITED", "to": "O'Neill Park",
+            "article_id": "https://example.com/0"}]
+        assert [row['type'] for row in self.rows(export, 'MERGE (from)')] == ["HOSTED", "LOCATED_IN"]
+        # Unchanged mentions of the edited article are not re-sent
+        assert [(row['article_id'], row['name']) for row in self.rows(export, 'MERGE (a)-[m:MENTIONS]')] == [
+            ("https://example.com/2", "Steamtown"), ("https://example.com/2", "Scranton")]
+
+        state = json.loads((temp_dir / "state.json").read_text())
+        assert state['watermark']['published_at'] == "2025-06-27T09:00:00Z"
+        assert len(state['articles']) == 3
+
+    def test_state_waits_for_load(self, shorts_file, temp_dir):
+        self.export_delta(shorts_file, temp_dir, "delta", loaded=False)
+
+        assert not (temp_dir / "state.json").exists()
+        assert (temp_dir / "delta.pending_state.json").exists()
+        # Re-exporting before the load still carries every article
+        export = self.export_delta(shorts_file, temp_dir, "delta", loaded=False)
+        assert len(self.rows(export, 'MERGE (a:Article')) == 2
+
+    def test_load_commits_pending_state(self, shorts_file, temp_dir):
+        self.export_delta(shorts_file, temp_dir, "delta", loaded=False)
+        driver = MagicMock()
+        session = driver.__enter__.return_value.session.return_value.__enter__.return_value
+        graph_database = MagicMock()
+        graph_database.driver.return_value = driver
+
+        with patch.object(neo4j_export, 'neo4j_available', True), \
+             patch.object(neo4j_export, 'GraphDatabase', graph_database, create=True):
+            session.execute_write.side_effect = ConnectionError("neo4j went away")
+            with pytest.raises(ConnectionError):
+                load_parameter_batches(str(temp_dir / "delta.json"))
+            assert not (temp_dir / "state.json").exists()
+
+            session.execute_write.side_effect = None
+            assert load_parameter_batches(str(temp_dir / "delta.json"))
+
+        state = json.loads((temp_dir / "state.json").read_text())
+        assert set(state['articles']) == {"https://example.com/0", "https://example.com/1"}
+        assert 'state_file' not in state
+        assert not (temp_dir / "delta.pending_state.json").exists()
+
+    def test_full_export_uses_article_keys(self, exporter):
+        articles = next(b for b in exporter.iter_parameter_batches() if 'MERGE (a:Article' in b['query'])
+        assert [row['id'] for row in articles['rows']] == ["https://example.com/0", "https://example.com/1"]
+        assert all(rel['article_id'].startswith("https://") for rel in exporter.relationships)
+        assert "id: 'https://example.com/0'" in '\n'.join(exporter.iter_cypher_commands())
+
+
+
+def statements(lines):
+    return [line for line in lines if line and not line.startswith("//")]
+
+
+class TestStreamingCypherExport:
+    """Test suite for the streaming Cypher writer."""
+
+    def test_single_file_matches_generated_commands(self, exporter, temp_dir):
+        output = temp_dir / "graph.cypher"
+        assert exporter.export_to_file(str(output))
+
+        lines = output.read_text().splitlines()
+        assert statements(lines) == statements(exporter.iter_cypher_commands())
+        assert lines[0] == "// Scrantenna Knowledge Graph Import"
+        assert "MERGE (e:Entity:PERSON {name: 'Paige Cognetti'}) SET e.type = 'PERSON', e.created_at = datetime();" in lines
+        assert exporter.export_phases == [[output]]
+
+    def test_string_literals_escape_backslashes(self, exporter):
+        commands = '\n'.join(exporter.iter_cypher_commands())
+        assert r"title: 'Mayor\'s plan for O\'Neill Park \\ Phase 2'" in commands
+        assert neo4j_export.cypher_string("Dunmore \\") == r"Dunmore \\"
+
+    def test_gzip_stream(self, exporter, temp_dir):
+        assert exporter.export_to_file(str(temp_dir / "graph.cypher"), compress=True)
+
+        with gzip.open(temp_dir / "graph.cypher.gz", 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert statements(lines) == statements(exporter.iter_cypher_commands())
+
+    def test_shards_split_by_label_and_type(self, exporter, temp_dir):
+        assert exporter.export_to_file(str(temp_dir / "graph.cypher"), shards=2)
+
+        names = [[path.name for path in phase] for phase in exporter.export_phases]
+        assert names == [
+            ["graph.setup.cypher"],
+            ["graph.nodes-01.cypher", "graph.nodes-02.cypher"],
+            ["graph.relationships-01.cypher", "graph.relationships-02.cypher"],
+            ["graph.indices.cypher"],
+        ]
+
+        shard_statements = {name: statements((temp_dir / name).read_text().splitlines())
+                            for phase in names for name in phase}
+        # Every statement lands in exactly one file
+        assert sorted(sum(shard_statements.values(), [])) == sorted(statements(exporter.iter_cypher_commands()))
+        for name in names[1]:
+            assert all(not line.startswith("MATCH") for line in shard_statements[name])
+        for name in names[2]:
+            assert all(line.startswith("MATCH") for line in shard_statements[name])
+        # A label or relationship type is never split across files
+        for label in ("Entity:PERSON {", "Entity:LOCATION {", "CREATE (a:Article", "[:MENTIONS", "[r:VISITED"):
+            holders = [name for name, lines in shard_statements.items() if any(label in line for line in lines)]
+            assert len(holders) == 1
+
+    def test_import_script_runs_phases(self, exporter, temp_dir):
+        assert exporter.export_to_file(str(temp_dir / "graph.cypher"), compress=True, shards=2)
+        script = temp_dir / "import.sh"
+        assert exporter.create_import_script(str(script))
+
+        content = script.read_text()
+        assert 'import_phase "graph.nodes-01.cypher.gz" "graph.nodes-02.cypher.gz" || exit 1' in content
+        assert content.index("graph.setup.cypher.gz\" ||") < content.index("graph.indices.cypher.gz\" ||")
+        assert 'gunzip -c "$1" | cypher-shell' in content
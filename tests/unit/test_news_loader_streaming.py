@@ -0,0 +1,133 @@
+"""
+Unit tests for the streaming NewsLoader API.
+"""
+
+import json
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+import pipeline.news_loader as news_loader
+from pipeline import NewsLoader
+from pipeline.news_loader import iter_json_articles
+
+
+def make_article(i, **extra):
+    article = {
+        "title": f"Article {i} mentions [brackets], {{braces}} and \"articles\": [1]",
+        "description": f"Description {i}",
+        "content": f"Content {i}",
+        "url": f"https://example.com/news/{i}",
+        "publishedAt": "2025-06-25T10:00:00Z",
+        "source": {"name": "Times Tribune"},
+        "score": 12345.5,
+    }
+    article.update(extra)
+    return article
+
+
+@pytest.fixture(params=[False, True], ids=["fallback", "ijson"])
+def parser_backend(request):
+    """Run streaming tests against the built-in parser and, if installed, ijson."""
+    if request.param and not news_loader.ijson_available:
+        pytest.skip("ijson not installed")
+    with patch.object(news_loader, 'ijson_available', request.param):
+        yield request.param
+
+
+class TestIterJsonArticles:
+    """Test suite for incremental parsing of news files."""
+
+    def test_dict_format_with_metadata_around_articles(self, temp_dir, parser_backend):
+        path = temp_dir / "scranton_news_2025-06-25.json"
+        data = {
+            "query": "Scranton \"articles\"",
+            "fetched_at": "2025-06-25T10:00:00",
+            "total_articles": 3,
+            "articles": [make_article(i) for i in range(3)],
+            "queries": ["Scranton", "Lackawanna County"],
+        }
+        path.write_text(json.dumps(data, indent=2))
+
+        assert list(iter_json_articles(path, chunk_size=7)) == data["articles"]
+
+    def test_list_format(self, temp_dir, parser_backend):
+        path = temp_dir / "articles.json"
+        articles = [make_article(i) for i in range(4)]
+        path.write_text(json.dumps(articles))
+
+        assert list(iter_json_articles(path, chunk_size=5)) == articles
+
+    def test_truncated_file_raises(self, temp_dir, parser_backend):
+        path = temp_dir / "broken.json"
+        path.write_text(json.dumps({"articles": [make_article(1), make_article(2)]})[:-40])
+
+        with pytest.raises(Exception):
+            list(iter_json_articles(path, chunk_size=16))
+
+
+class TestNewsLoaderStreaming:
+    """Test suite for NewsLoader.iter_articles."""
+
+    @pytest.fixture
+    def daily_dir(self, temp_dir):
+        data_dir = temp_dir / "daily"
+        data_dir.mkdir()
+        for day, ids in [("2025-06-24", [1, 2]), ("2025-06-25", [3]), ("2025-06-26", [4, 5])]:
+            articles = [make_article(i, title_distilled=f"Distilled {i}") for i in ids]
+            articles.append({"description": "No title, dropped by validation"})
+            (data_dir / f"scranton_news_{day}.json").write_text(json.dumps({"articles": articles}))
+        (data_dir / "scranton_news_latest.json").write_text("[]")
+        return data_dir
+
+    def test_date_range_across_files(self, daily_dir):
+        loader = NewsLoader(str(daily_dir))
+
+        urls = [a['url'] for a in loader.iter_articles("2025-06-25", "2025-06-26")]
+        assert urls == [f"https://example.com/news/{i}" for i in (3, 4, 5)]
+
+        assert len(list(loader.iter_articles())) == 5
+
+    def test_malformed_file_is_skipped(self, daily_dir, parser_backend):
+        (daily_dir / "scranton_news_2025-06-25.json").write_text('{"articles": [{"title": "x",,]}')
+        loader = NewsLoader(str(daily_dir))
+
+        urls = [a['url'] for a in loader.iter_articles("2025-06-24", "2025-06-26")]
+        assert urls == [f"https://example.com/news/{i}" for i in (1, 2, 4, 5)]
+
+    def test_projection_and_filter(self, daily_dir):
+        loader = NewsLoader(str(daily_dir))
+
+        articles = list(loader.iter_articles(
+            fields=['url', 'title_distilled'],
+            where=lambda a: a['url'].endswith(('2', '4')),
+        ))
+
+        assert articles == [
+            {'url': 'https://example.com/news/2', 'title_distilled': 'Distilled 2'},
+            {'url': 'https://example.com/news/4', 'title_distilled': 'Distilled 4'},
+        ]
+
+    def test_iter_validated_is_lazy(self):
+        loader = NewsLoader()
+
+        def articles():
+            yield make_article(1)
+            raise AssertionError("consumed past the first article")
+
+        assert next(loader.iter_validated(articles()))['url'] == "https://example.com/news/1"
+
+    def test_memory_does_not_grow_with_file_size(self, temp_dir):
+        path = temp_dir / "scranton_news_2025-06-25.json"
+        path.write_text(json.dumps({"articles": [make_article(i) for i in range(5000)]}))
+        file_size = path.stat().st_size
+
+        with patch.object(news_loader, 'ijson_available', False):
+            tracemalloc.start()
+            count = sum(1 for _ in NewsLoader(str(temp_dir)).iter_articles())
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        assert count == 5000
+        assert peak < file_size / 4
@@ -0,0 +1,119 @@
+"""
+Unit tests for the in-process pipeline DAG.
+"""
+
+import threading
+
+import pytest
+
+from pipeline import PipelineDAG, Task
+
+
+def make_chain(temp_dir, calls):
+    """source.txt -> upper (upper.txt) -> count (count.txt)."""
+    source, upper, count = temp_dir / "source.txt", temp_dir / "upper.txt", temp_dir / "count.txt"
+
+    def to_upper(context):
+        calls.append('upper')
+        upper.write_text(source.read_text().upper())
+
+    def count_chars(context):
+        calls.append('count')
+        count.write_text(str(len(upper.read_text().strip())))
+
+    return [
+        Task('upper', to_upper, inputs=lambda context: [source], outputs=[upper]),
+        Task('count', count_chars, deps=['upper'], inputs=lambda context: [upper], outputs=[count]),
+    ]
+
+
+class TestPipelineDAG:
+    """Test suite for PipelineDAG."""
+
+    def test_unchanged_inputs_are_skipped(self, temp_dir):
+        (temp_dir / "source.txt").write_text("scranton")
+        calls = []
+        state = temp_dir / "state.json"
+
+        assert PipelineDAG(make_chain(temp_dir, calls), state).run() == {'upper': 'ran', 'count': 'ran'}
+        assert PipelineDAG(make_chain(temp_dir, calls), state).run() == {'upper': 'skipped', 'count': 'skipped'}
+        assert calls == ['upper', 'count']
+
+    def test_identical_upstream_output_does_not_rerun_downstream(self, temp_dir):
+        source = temp_dir / "source.txt"
+        source.write_text("scranton")
+        calls = []
+        state = temp_dir / "state.json"
+        PipelineDAG(make_chain(temp_dir, calls), state).run()
+
+        # Different input, same uppercased output
+        source.write_text("SCRANTON")
+        statuses = PipelineDAG(make_chain(temp_dir, calls), state).run()
+        assert statuses == {'upper': 'ran', 'count': 'skipped'}
+
+    def test_missing_output_forces_rerun(self, temp_dir):
+        (temp_dir / "source.txt").write_text("scranton")
+        calls = []
+        state = temp_dir / "state.json"
+        PipelineDAG(make_chain(temp_dir, calls), state).run()
+
+        (temp_dir / "count.txt").unlink()
+        assert PipelineDAG(make_chain(temp_dir, calls), state).run() == {'upper': 'skipped', 'count': 'ran'}
+
+    def test_force_and_always_run(self, temp_dir):
+        (temp_dir / "source.txt").write_text("scranton")
+        calls = []
+        state = temp_dir / "state.json"
+        tasks = make_chain(temp_dir, calls) + [Task('fetch', lambda context: calls.append('fetch'), always_run=True)]
+        PipelineDAG(tasks, state).run()
+
+        assert PipelineDAG(tasks, state).run()['fetch'] == 'ran'
+        assert PipelineDAG(tasks, state).run(force=True) == {'upper': 'ran', 'count': 'ran', 'fetch': 'ran'}
+
+    def test_results_flow_through_context(self, temp_dir):
+        tasks = [
+            Task('fetch', lambda context: [1, 2, 3], always_run=True),
+            Task('total', lambda context: sum(context['fetch']), deps=['fetch'],
+                 inputs=lambda context: [repr(context['fetch'])]),
+        ]
+        context = {}
+        PipelineDAG(tasks, temp_dir / "state.json").run(context)
+        assert context['total'] == 6
+
+    def test_independent_branches_run_concurrently(self, temp_dir):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def branch(context):
+            # Deadlocks (and times out) unless both branches run at once
+            barrier.wait()
+
+        tasks = [
+            Task('root', lambda context: None),
+            Task('neo4j', branch, deps=['root']),
+            Task('graphviz', branch, deps=['root']),
+        ]
+        statuses = PipelineDAG(tasks, temp_dir / "state.json", workers=2).run()
+        assert statuses == {'root': 'ran', 'neo4j': 'ran', 'graphviz': 'ran'}
+
+    def test_failure_blocks_only_dependents(self, temp_dir):
+        def boom(context):
+            raise RuntimeError("export failed")
+
+        tasks = [
+            Task('root', lambda context: None),
+            Task('bad', boom, deps=['root']),
+            Task('after_bad', lambda context: None, deps=['bad']),
+            Task('good', lambda context: None, deps=['root']),
+        ]
+        dag = PipelineDAG(tasks, temp_dir / "state.json")
+        statuses = dag.run()
+
+        assert statuses == {'root': 'ran', 'bad': 'failed', 'after_bad': 'blocked', 'good': 'ran'}
+        assert dag.errors['bad'].stage == 'bad'
+
+    def test_invalid_graphs_are_rejected(self, temp_dir):
+        with pytest.raises(ValueError):
+            PipelineDAG([Task('a', lambda context: None, deps=['missing'])], temp_dir / "state.json")
+        with pytest.raises(ValueError):
+            PipelineDAG([Task('a', lambda context: None, deps=['b']),
+                         Task('b', lambda context: None, deps=['a'])], temp_dir / "state.json")
@@ -0,0 +1,85 @@
+"""
+Unit tests for the JSON serialization layer.
+"""
+
+import gzip
+import json
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+
+import pipeline.serialization as serialization
+from pipeline.serialization import dumps, write_json
+
+
+SAMPLE = {"shorts": [{"id": "short_0", "title": "Scranton café reopens", "score": 0.5}]}
+
+
+class TestSerialization:
+    """Test suite for pipeline.serialization."""
+
+    def test_compact_by_default(self, monkeypatch):
+        monkeypatch.delenv(serialization.JSON_MODE_ENV, raising=False)
+        payload = dumps(SAMPLE)
+
+        assert b"\n" not in payload
+        assert b": " not in payload
+        assert json.loads(payload) == SAMPLE
+
+    def test_pretty_debug_mode(self, monkeypatch):
+        monkeypatch.setenv(serialization.JSON_MODE_ENV, 'pretty')
+        payload = dumps(SAMPLE)
+
+        assert b'\n  "shorts"' in payload
+        assert json.loads(payload) == SAMPLE
+        assert b"\n" not in dumps(SAMPLE, pretty=False)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_encoders_agree(self, use_orjson):
+        if use_orjson and not serialization.orjson_available:
+            pytest.skip("orjson not installed")
+        with patch.object(serialization, 'orjson_available', use_orjson):
+            assert json.loads(dumps(SAMPLE, pretty=False)) == SAMPLE
+            # Non-string keys fall back to the stdlib encoder
+            assert json.loads(dumps({1: "a"}, pretty=False)) == {"1": "a"}
+
+    def test_write_json_with_precompressed_siblings(self, temp_dir):
+        path = write_json(temp_dir / "shorts_data.json", SAMPLE, compress=True)
+
+        raw = path.read_bytes()
+        assert json.loads(raw) == SAMPLE
+        assert gzip.decompress((temp_dir / "shorts_data.json.gz").read_bytes()) == raw
+        if serialization.brotli_available:
+            import brotli
+            assert brotli.decompress((temp_dir / "shorts_data.json.br").read_bytes()) == raw
+        assert sorted(p.name for p in temp_dir.iterdir() if p.name.endswith('.tmp')) == []
+
+    def test_gzip_output_is_deterministic(self, temp_dir):
+        write_json(temp_dir / "a.json", SAMPLE, compress=True)
+        write_json(temp_dir / "b.json", SAMPLE, compress=True)
+
+        assert (temp_dir / "a.json.gz").read_bytes() == (temp_dir / "b.json.gz").read_bytes()
+
+    def test_failed_write_keeps_previous_file(self, temp_dir):
+        path = write_json(temp_dir / "shorts_data.json", SAMPLE)
+        original = path.read_bytes()
+
+        with patch.object(serialization.os, 'replace', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                write_json(path, {"shorts": []})
+
+        assert path.read_bytes() == original
+        assert [p.name for p in temp_dir.iterdir()] == ["shorts_data.json"]
+
+    def test_written_files_keep_normal_permissions(self, temp_dir):
+        umask = os.umask(0)
+        os.umask(umask)
+        path = write_json(temp_dir / "shorts_data.json", SAMPLE, compress=True)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+        assert stat.S_IMODE((temp_dir / "shorts_data.json.gz").stat().st_mode) == 0o666 & ~umask
+
+        path.chmod(0o640)
+        write_json(path, {"shorts": []})
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
@@ -0,0 +1,88 @@
+"""
+Unit tests for the chunked shorts feed.
+"""
+
+import json
+
+from pipeline import write_shorts_feed
+
+
+def make_shorts_data(count, title_prefix="Story"):
+    shorts = []
+    for i in range(count):
+        shorts.append({
+            "id": f"short_{i}",
+            "title": f"{title_prefix} {i}",
+            "duration": 30,
+            "graph": {
+                "entities": [{"id": "e0", "text": f"Entity {i}"}, {"id": "e1", "text": "Scranton"}],
+                "relationships": [{"source": "e0", "target": "e1", "type": "located_in"}],
+            },
+        })
+    return {
+        "generated_at": "2025-06-25T10:00:00",
+        "source_file": "scranton_news_2025-06-25.json",
+        "total_shorts": count,
+        "total_duration": count * 30,
+        "shorts": shorts,
+    }
+
+
+def read_json(path):
+    return json.loads(path.read_text())
+
+
+class TestShortsFeed:
+    """Test suite for write_shorts_feed."""
+
+    def test_manifest_and_chunks_reassemble_feed(self, temp_dir):
+        data = make_shorts_data(12)
+        feed_dir = temp_dir / "shorts_feed"
+
+        manifest = read_json(write_shorts_feed(data, feed_dir, chunk_size=5))
+
+        assert manifest["total_shorts"] == 12
+        assert [(c["start"], c["count"]) for c in manifest["chunks"]] == [(0, 5), (5, 5), (10, 2)]
+
+        shorts = []
+        for chunk in manifest["chunks"]:
+            shorts.extend(read_json(feed_dir / chunk["url"])["shorts"])
+        assert [s["id"] for s in shorts] == [f"short_{i}" for i in range(12)]
+
+        # Graphs are split out and fetched on demand
+        assert all("graph" not in s for s in shorts)
+        assert shorts[3]["graph_summary"] == {"entities": 2, "relationships": 1}
+        assert read_json(feed_dir / shorts[3]["graph_url"]) == data["shorts"][3]["graph"]
+        assert (feed_dir / (manifest["chunks"][0]["url"] + ".gz")).exists()
+
+    def test_summary_keeps_svo_flag(self, temp_dir):
+        data = make_shorts_data(2)
+        data["shorts"][0]["graph"]["has_svo"] = True
+        feed_dir = temp_dir / "shorts_feed"
+
+        manifest = read_json(write_shorts_feed(data, feed_dir))
+        shorts = read_json(feed_dir / manifest["chunks"][0]["url"])["shorts"]
+
+        assert shorts[0]["graph_summary"]["has_svo"] is True
+        assert "has_svo" not in shorts[1]["graph_summary"]
+
+    def test_unchanged_chunks_keep_their_names(self, temp_dir):
+        feed_dir = temp_dir / "shorts_feed"
+        first = read_json(write_shorts_feed(make_shorts_data(10), feed_dir, chunk_size=5))
+
+        data = make_shorts_data(10)
+        data["shorts"][7]["title"] = "Updated story"
+        second = read_json(write_shorts_feed(data, feed_dir, chunk_size=5))
+
+        assert first["chunks"][0]["url"] == second["chunks"][0]["url"]
+        assert first["chunks"][1]["url"] != second["chunks"][1]["url"]
+
+    def test_stale_files_are_removed(self, temp_dir):
+        feed_dir = temp_dir / "shorts_feed"
+        write_shorts_feed(make_shorts_data(10, "Old"), feed_dir, chunk_size=5)
+        manifest = read_json(write_shorts_feed(make_shorts_data(3, "New"), feed_dir, chunk_size=5))
+
+        chunk_files = sorted(p.name for p in (feed_dir / "chunks").glob("*.json"))
+        assert chunk_files == [manifest["chunks"][0]["url"].split("/")[-1]]
+        assert len(list((feed_dir / "graphs").glob("*.json"))) == 3
+        assert not [p for p in (feed_dir / "chunks").glob("*.gz") if p.name[:-3] not in chunk_files]
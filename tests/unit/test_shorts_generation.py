@@ -18,6 +18,7 @@ from generate_shorts import (
     create_short_from_article,
     get_background_gradient,
     generate_shorts_from_news,
+    build_shorts,
     check_if_shorts_current
 )
 
@@ -214,47 +215,63 @@ class TestShortsGeneration:
             assert shorts_data["shorts"][0]["title"] == "Valid Article Title"
     
     def test_check_if_shorts_current(self, mock_file_system):
-        """Test checking if shorts are current."""
-        news_file = mock_file_system["data_dir"] / "test_news.json"
-        shorts_file = Path("shorts_data.json")
+        """Shorts are current only when the build manifest matches the inputs."""
+        from pipeline.build_manifest import BuildManifest
+        from generate_shorts import shorts_build_inputs
         
-        # Test when shorts file doesn't exist
-        assert check_if_shorts_current(news_file) is False
+        news_file = mock_file_system["data_dir"] / "scranton_news_2025-06-25.json"
+        shorts_file = mock_file_system["shorts_dir"] / "shorts_data.json"
         
-        # Test when shorts file exists and is current
-        current_shorts_data = {
-            "generated_at": datetime.now().isoformat(),
-            "source_file": str(news_file)
-        }
+        current, reason = check_if_shorts_current(news_file, shorts_file)
+        assert current is False
+        assert "does not exist" in reason
         
-        with patch('builtins.open', mock_open(read_data=json.dumps(current_shorts_data))):
-            with patch('pathlib.Path.exists', return_value=True):
-                # Mock datetime.now in the function's context
-                with patch('generate_shorts.datetime') as mock_datetime:
-                    mock_datetime.now.return_value = datetime.now()
-                    mock_datetime.fromisoformat = datetime.fromisoformat
-                    result = check_if_shorts_current(news_file)
-                    assert result is True
+        shorts_file.write_text(json.dumps({"shorts": []}))
+        current, reason = check_if_shorts_current(news_file, shorts_file)
+        assert current is False
+        assert "manifest" in reason
+        
+        BuildManifest(shorts_file).write(shorts_build_inputs(news_file))
+        current, reason = check_if_shorts_current(news_file, shorts_file)
+        assert current is True
+        assert "up to date" in reason
     
-    def test_check_if_shorts_current_old_data(self, mock_file_system):
-        """Test that old shorts data is considered not current."""
-        news_file = mock_file_system["data_dir"] / "test_news.json"
+    def test_check_if_shorts_current_changed_news(self, mock_file_system):
+        """Editing the news file makes the shorts stale regardless of age."""
+        from pipeline.build_manifest import BuildManifest
+        from generate_shorts import shorts_build_inputs
         
-        # Create old shorts data (more than 1 hour ago)
-        old_time = datetime.now().replace(hour=datetime.now().hour - 2)
-        old_shorts_data = {
-            "generated_at": old_time.isoformat(),
-            "source_file": str(news_file)
-        }
+        news_file = mock_file_system["data_dir"] / "scranton_news_2025-06-25.json"
+        shorts_file = mock_file_system["shorts_dir"] / "shorts_data.json"
+        shorts_file.write_text(json.dumps({"shorts": []}))
+        BuildManifest(shorts_file).write(shorts_build_inputs(news_file))
+        
+        news_file.write_text(json.dumps({"articles": []}))
+        current, reason = check_if_shorts_current(news_file, shorts_file)
+        assert current is False
+        assert reason == "inputs changed: news_file"
+    
+    def test_check_if_shorts_current_changed_vault(self, mock_file_system, temp_dir, monkeypatch):
+        """Adding an alias to the entity vault makes the shorts stale."""
+        import generate_shorts
+        from pipeline.build_manifest import BuildManifest
+        from generate_shorts import shorts_build_inputs
         
-        with patch('builtins.open', mock_open(read_data=json.dumps(old_shorts_data))):
-            with patch('pathlib.Path.exists', return_value=True):
-                with patch('generate_shorts.datetime') as mock_datetime:
-                    mock_datetime.now.return_value = datetime.now()
-                    mock_datetime.fromisoformat = datetime.fromisoformat
-                    mock_datetime.timedelta = datetime.timedelta
-                    result = check_if_shorts_current(news_file)
-                    assert result is False
+        vault = temp_dir / "entities"
+        note = vault / "locations" / "scranton.md"
+        note.parent.mkdir(parents=True)
+        note.write_text("---\nname: Scranton\naliases: []\nentity_type: LOCATION\nmention_count: 1\n---\n")
+        monkeypatch.setattr(generate_shorts, "VAULT_PATH", vault)
+        
+        news_file = mock_file_system["data_dir"] / "scranton_news_2025-06-25.json"
+        shorts_file = mock_file_system["shorts_dir"] / "shorts_data.json"
+        shorts_file.write_text(json.dumps({"shorts": []}))
+        BuildManifest(shorts_file).write(shorts_build_inputs(news_file))
+        
+        note.write_text(note.read_text().replace("aliases: []", "aliases: [Electric City]"))
+        current, reason = check_if_shorts_current(news_file, shorts_file)
+        assert current is False
+        assert reason == "inputs changed: vault"
     
     def test_shorts_animation_delays(self, sample_news_response, mock_file_system):
         """Test that shorts have proper animation delays."""
@@ -329,4 +346,81 @@ class TestShortsGeneration:
         
         # Should handle missing file gracefully
         with pytest.raises(FileNotFoundError):
-            generate_shorts_from_news(nonexistent_file)
\ No newline at end of file
+            generate_shorts_from_news(nonexistent_file)
+
+
+def make_articles(count):
+    return [
+        {
+            "title": f"Mayor Paige Cognetti opens Scranton story {i}",
+            "description": f"Paige Cognetti announced project {i} in Scranton on Tuesday.",
+            "source": {"name": "Test Source"}
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.usefixtures("entity_managers")
+class TestParallelShorts:
+    """Test suite for parallel short generation."""
+    
+    def test_thread_workers_keep_article_order(self):
+        """Shorts come back in article order even when later ones finish first."""
+        import time
+        
+        def slow_graph(article, index):
+            time.sleep(0.02 * (5 - index))
+            return {"entities": [], "relationships": [], "svg": ""}
+        
+        with patch('generate_shorts.generate_article_graph', side_effect=slow_graph):
+            shorts = build_shorts(make_articles(5), workers=4, executor='thread')
+        
+        assert [short["id"] for short in shorts] == [f"short_{i}" for i in range(5)]
+        assert [short["title"] for short in shorts] == [a["title"] for a in make_articles(5)]
+    
+    def test_failed_article_is_isolated(self):
+        """One failing article is skipped without losing the others."""
+        def flaky_graph(article, index):
+            if index == 1:
+                raise RuntimeError("extractor crashed")
+            return {"entities": [], "relationships": [], "svg": ""}
+        
+        with patch('generate_shorts.generate_article_graph', side_effect=flaky_graph):
+            serial = build_shorts(make_articles(3))
+            threaded = build_shorts(make_articles(3), workers=3, executor='thread')
+        
+        assert [short["id"] for short in serial] == ["short_0", "short_2"]
+        assert threaded == serial
+    
+    def test_process_workers_match_serial(self, temp_dir, monkeypatch):
+        """Rule-based extraction in worker processes gives the serial result."""
+        shorts_dir = temp_dir / "shorts"
+        shorts_dir.mkdir()
+        # The entity vault resolves to ../entities, i.e. inside temp_dir
+        monkeypatch.chdir(shorts_dir)
+        
+        parallel = build_shorts(make_articles(4), workers=2, executor='process')
+        serial = build_shorts(make_articles(4))
+        
+        assert [short["id"] for short in parallel] == [f"short_{i}" for i in range(4)]
+        assert [s["graph"]["relationships"] for s in parallel] == [s["graph"]["relationships"] for s in serial]
+
+    def test_process_workers_create_each_new_entity_once(self, temp_dir, monkeypatch):
+        """Vault resolution happens in the parent, so workers don't each create the same entity."""
+        import shutil
+        
+        templates = Path(__file__).resolve().parents[2] / "entities" / "templates"
+        results = {}
+        for mode, workers in (('parallel', 2), ('serial', 1)):
+            shorts_dir = temp_dir / mode / "shorts"
+            shorts_dir.mkdir(parents=True)
+            shutil.copytree(templates, temp_dir / mode / "entities" / "templates")
+            monkeypatch.chdir(shorts_dir)
+            results[mode] = build_shorts(make_articles(4), workers=workers, executor='process')
+        
+        parallel_entities = [s["graph"]["entities"] for s in results['parallel']]
+        assert parallel_entities == [s["graph"]["entities"] for s in results['serial']]
+        created = [e["name"] for entities in parallel_entities for e in entities
+                   if e["resolution_method"] == "new_entity"]
+        assert created.count("Paige Cognetti") == 1
+        assert all("vault_pending" not in s["graph"] for s in results['parallel'])
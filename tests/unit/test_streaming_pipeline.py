@@ -0,0 +1,115 @@
+"""
+Unit tests for the streaming producer/consumer pipeline.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pipeline.streaming import Stage, StreamingPipeline, PipelineError
+
+
+class TestStreamingPipeline:
+    """Test suite for StreamingPipeline."""
+
+    def test_results_keep_source_order(self):
+        """Results come back in source order even with many workers."""
+        def jitter(x):
+            time.sleep(0.001 * (x % 3))
+            return x
+
+        pipeline = StreamingPipeline([
+            Stage('double', lambda x: x * 2, workers=3),
+            Stage('jitter', jitter, workers=4),
+            Stage('inc', lambda x: x + 1, workers=2),
+        ])
+
+        assert pipeline.run(range(50)) == [x * 2 + 1 for x in range(50)]
+        assert pipeline.stats == {'double': 50, 'jitter': 50, 'inc': 50}
+
+    def test_none_drops_item(self):
+        """Returning None from a stage removes the item from the stream."""
+        pipeline = StreamingPipeline([
+            Stage('evens', lambda x: x if x % 2 == 0 else None, workers=2),
+            Stage('square', lambda x: x * x),
+        ])
+
+        assert pipeline.run(range(10)) == [0, 4, 16, 36, 64]
+
+    def test_stage_error_shuts_down_cleanly(self):
+        """A failing stage stops every thread and surfaces the error."""
+        def explode(x):
+            if x == 5:
+                raise ValueError("bad article")
+            return x
+
+        pipeline = StreamingPipeline([
+            Stage('explode', explode, workers=2, queue_size=2),
+            Stage('slow', lambda x: time.sleep(0.01) or x),
+        ])
+
+        with pytest.raises(PipelineError) as exc_info:
+            pipeline.run(iter(range(1000)))
+
+        assert exc_info.value.stage == 'explode'
+        assert isinstance(exc_info.value.error, ValueError)
+        assert not [t for t in threading.enumerate() if t.name.startswith('pipeline-')]
+
+    def test_source_error_is_reported(self):
+        """Errors raised by the source generator are reported as a stage failure."""
+        def source():
+            yield 1
+            raise IOError("fetch failed")
+
+        pipeline = StreamingPipeline([Stage('noop', lambda x: x)])
+
+        with pytest.raises(PipelineError) as exc_info:
+            pipeline.run(source())
+
+        assert exc_info.value.stage == 'source'
+
+    def test_backpressure_bounds_in_flight_items(self):
+        """A slow stage keeps the source from running far ahead."""
+        produced = []
+        consumed = []
+        max_lead = [0]
+
+        def source():
+            for i in range(40):
+                produced.append(i)
+                max_lead[0] = max(max_lead[0], len(produced) - len(consumed))
+                yield i
+
+        def slow(x):
+            time.sleep(0.002)
+            consumed.append(x)
+            return x
+
+        pipeline = StreamingPipeline([Stage('slow', slow, queue_size=2)])
+        pipeline.run(source())
+
+        # Queue capacity + the item being processed + the item being put
+        assert max_lead[0] <= 5
+
+    def test_stages_overlap(self):
+        """Total latency approaches the slowest stage, not the sum of stages."""
+        delay = 0.02
+
+        def wait(x):
+            time.sleep(delay)
+            return x
+
+        pipeline = StreamingPipeline([Stage(f'stage{i}', wait) for i in range(3)])
+
+        start = time.perf_counter()
+        pipeline.run(range(10))
+        elapsed = time.perf_counter() - start
+
+        sequential = 10 * 3 * delay
+        assert elapsed < sequential * 0.75
+
+    def test_requires_stages(self):
+        """An empty stage list is rejected."""
+        with pytest.raises(ValueError):
+            StreamingPipeline([])
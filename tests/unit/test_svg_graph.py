@@ -0,0 +1,75 @@
+"""
+Unit tests for the shared SVG graph renderer.
+"""
+
+from xml.etree import ElementTree
+
+from svg_graph import EMPTY_SVG, MAX_NODES, render_svg_graph
+
+
+def entity(name, entity_type="PERSON"):
+    return {"name": name, "type": entity_type}
+
+
+def parse(svg):
+    return ElementTree.fromstring(svg.replace('<svg ', '<svg xmlns="http://www.w3.org/2000/svg" ', 1))
+
+
+NS = "{http://www.w3.org/2000/svg}"
+
+
+class TestSvgGraph:
+    """Test suite for render_svg_graph."""
+
+    def test_empty_graph(self):
+        assert render_svg_graph([], []) == EMPTY_SVG
+
+    def test_well_formed_with_one_symbol_per_type(self):
+        svg = render_svg_graph(
+            [entity("Paige Cognetti"), entity("Scranton", "LOCATION"), entity("Jane Doe")],
+            [{"from": "Paige Cognetti", "to": "Scranton", "type": "MAYOR_OF"}]
+        )
+        root = parse(svg)
+
+        symbols = [symbol.get("id") for symbol in root.iter(f"{NS}symbol")]
+        assert symbols == ["sg-node-PERSON", "sg-node-LOCATION"]
+        assert len(list(root.iter(f"{NS}use"))) == 3
+        assert len(list(root.iter(f"{NS}line"))) == 1
+
+    def test_names_are_escaped(self):
+        svg = render_svg_graph(
+            [entity("<b>&Co"), entity("Scranton", "LOCATION")],
+            [{"from": "<b>&Co", "to": "Scranton", "type": "<script>"}]
+        )
+        texts = [text.text for text in parse(svg).iter(f"{NS}text")]
+
+        assert "<b>&Co" in texts
+        assert "<script>" in texts
+        assert "<script>" not in svg
+
+    def test_type_names_are_case_insensitive(self):
+        svg = render_svg_graph([entity("Scranton", "Location")], [])
+        assert 'href="#sg-node-LOCATION"' in svg
+
+    def test_only_visible_entities_are_connected(self):
+        entities = [entity(f"Entity {i}") for i in range(MAX_NODES + 2)]
+        relationships = [
+            {"from": "Entity 0", "to": "Entity 1", "type": "A"},
+            {"from": "Entity 0", "to": f"Entity {MAX_NODES}", "type": "B"},
+            {"from": "Entity 0", "to": "Unknown", "type": "C"}
+        ]
+        root = parse(render_svg_graph(entities, relationships))
+
+        assert len(list(root.iter(f"{NS}use"))) == MAX_NODES
+        assert len(list(root.iter(f"{NS}line"))) == 1
+
+    def test_layout_positions_replace_grid_slots(self):
+        entities = [entity("A"), entity("B"), entity("C")]
+        relationships = [{"from": "A", "to": "B", "type": "X"}]
+        svg = render_svg_graph(entities, relationships, {"A": [0, 0], "B": [1, 1]})
+        root = parse(svg)
+
+        line = next(root.iter(f"{NS}line"))
+        assert (line.get("x1"), line.get("y1"), line.get("x2"), line.get("y2")) == ("50", "40", "250", "160")
+        # C has no position and keeps its grid slot
+        assert render_svg_graph(entities, relationships).count('x="228" y="28"') == svg.count('x="228" y="28"') == 1
@@ -0,0 +1,116 @@
+"""
+Unit tests for stage-level tracing.
+"""
+
+import json
+
+import pytest
+
+from pipeline import tracing
+from pipeline.serialization import write_json
+from pipeline.tracing import disable_tracing, enable_tracing, span, write_trace
+
+
+@pytest.fixture(autouse=True)
+def no_tracer():
+    disable_tracing()
+    yield
+    disable_tracing()
+
+
+def complete_events(trace):
+    return [event for event in trace["traceEvents"] if event["ph"] == "X"]
+
+
+class TestTracing:
+    """Test suite for the pipeline tracer."""
+
+    def test_disabled_spans_are_shared_noops(self):
+        first = span("fetch", query="Scranton")
+        assert first is span("distill")
+        with first as s:
+            s.set(articles=3)
+        assert tracing.get_tracer() is None
+
+    def test_spans_record_attributes_and_nesting(self):
+        tracer = enable_tracing()
+        with span("article", category="article", index=0):
+            with span("extract.entities", tier="rule_based") as tier:
+                tier.set(entities=4)
+
+        inner, outer = tracer.events
+        assert inner["name"] == "extract.entities"
+        assert inner["args"] == {"tier": "rule_based", "entities": 4}
+        assert outer["start_ns"] <= inner["start_ns"]
+        assert inner["start_ns"] + inner["dur_ns"] <= outer["start_ns"] + outer["dur_ns"]
+
+    def test_failed_attempt_is_recorded_and_reraised(self):
+        tracer = enable_tracing()
+        with pytest.raises(ConnectionError):
+            with span("extract.entities", tier="ollama", model="phi3:mini"):
+                raise ConnectionError("ollama not running")
+
+        assert tracer.events[0]["args"]["error"] == "ConnectionError: ollama not running"
+        assert tracer.summary()[0]["errors"] == 1
+
+    def test_chrome_trace_file(self, temp_dir):
+        enable_tracing()
+        with span("fetch.feed", category="fetch", source="wnep"):
+            pass
+        trace = json.loads(write_trace(temp_dir / "trace.json").read_text())
+
+        event, = complete_events(trace)
+        assert event["name"] == "fetch.feed"
+        assert event["cat"] == "fetch"
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        assert event["args"] == {"source": "wnep"}
+        thread_names = [e for e in trace["traceEvents"] if e["name"] == "thread_name"]
+        assert thread_names[0]["tid"] == event["tid"]
+
+    def test_file_writes_are_traced_with_size(self, temp_dir):
+        tracer = enable_tracing()
+        path = write_json(temp_dir / "out.json", {"a": 1}, pretty=False)
+
+        event, = tracer.events
+        assert event["name"] == "write"
+        assert event["args"] == {"path": str(path), "bytes": len(b'{"a":1}')}
+
+    def test_summary_table(self):
+        tracer = enable_tracing()
+        for _ in range(3):
+            with span("render.svg"):
+                pass
+        with span("distill"):
+            pass
+
+        rows = {row["name"]: row for row in tracer.summary()}
+        assert rows["render.svg"]["count"] == 3
+        assert rows["distill"]["count"] == 1
+        table = tracer.format_summary()
+        assert "render.svg" in table and "distill" in table
+
+    def test_worker_events_merge_into_trace(self, temp_dir, monkeypatch, entity_managers):
+        """Spans recorded in process-pool workers end up in the parent's trace."""
+        from generate_shorts import build_shorts
+
+        shorts_dir = temp_dir / "shorts"
+        shorts_dir.mkdir()
+        monkeypatch.chdir(shorts_dir)
+        articles = [{"title": f"Scranton council meets {i}", "description": "Mayor Paige Cognetti spoke.",
+                     "url": f"https://example.com/{i}"} for i in range(2)]
+
+        tracer = enable_tracing()
+        build_shorts(articles, workers=2, executor="process")
+
+        article_spans = [event for event in tracer.events if event["name"] == "article"]
+        assert sorted(event["args"]["article"] for event in article_spans) == [a["url"] for a in articles]
+        assert any(event["name"] == "extract.entities" for event in tracer.events)
+
+    def test_fetchers_share_the_pipeline_tracer(self):
+        """src/ scripts record into the same tracer that finish_tracing writes."""
+        pytest.importorskip("requests")
+        pytest.importorskip("feedparser")
+        import news_fetcher
+        import rss_fetcher
+
+        assert news_fetcher.span is rss_fetcher.span is tracing.span
@@ -0,0 +1,106 @@
+"""
+Unit tests for the persistent vault index and the shared entity manager.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import obsidian_entity_manager
+from obsidian_entity_manager import ObsidianEntityManager, get_entity_manager
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "entities" / "templates"
+
+
+def write_note(vault, relative, name, entity_type="PERSON", aliases=()):
+    path = vault / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    alias_list = ", ".join(f'"{a}"' for a in aliases)
+    path.write_text(
+        f"---\nname: {name}\naliases: [{alias_list}]\nentity_type: {entity_type}\n"
+        f"confidence: 0.9\nfirst_mentioned: 2025-06-25\nmention_count: 1\n---\n\n# {name}\n"
+    )
+    return path
+
+
+@pytest.fixture
+def vault(temp_dir):
+    vault = temp_dir / "entities"
+    shutil.copytree(TEMPLATES_DIR, vault / "templates")
+    write_note(vault, "people/paige-cognetti.md", "Paige Cognetti", aliases=["Mayor Cognetti"])
+    write_note(vault, "locations/scranton.md", "Scranton", entity_type="LOCATION")
+    write_note(vault, "meta/vault-overview.md", "Vault Overview")
+    return vault
+
+
+class TestVaultIndex:
+    """Test suite for incremental vault loading."""
+
+    def test_second_load_reparses_only_changed_notes(self, vault):
+        first = ObsidianEntityManager(str(vault))
+        assert first.index.reparsed == 2
+        assert first.known_entities["mayor cognetti"]["canonical_name"] == "Paige Cognetti"
+        assert (vault / ".scrantenna" / "vault_index.json").exists()
+
+        assert ObsidianEntityManager(str(vault)).index.reparsed == 0
+
+        changed = write_note(vault, "locations/scranton.md", "Scranton", "LOCATION", aliases=["Electric City"])
+        os.utime(changed, ns=(1, 1))
+        (vault / "people" / "paige-cognetti.md").unlink()
+
+        manager = ObsidianEntityManager(str(vault))
+        assert manager.index.reparsed == 1
+        assert manager.known_entities["electric city"]["canonical_name"] == "Scranton"
+        assert "paige cognetti" not in manager.known_entities
+
+    def test_fingerprint_tracks_resolution_fields_only(self, vault):
+        manager = ObsidianEntityManager(str(vault))
+        before = manager.index.fingerprint()
+
+        manager.resolve_entities([{'name': 'Mayor Cognetti', 'type': 'PERSON', 'confidence': 0.95}])
+        manager.flush()
+        assert manager.index.fingerprint() == before
+
+        write_note(vault, "locations/scranton.md", "Scranton", "LOCATION", aliases=["Electric City"])
+        assert manager.index.fingerprint() != before
+
+    def test_fingerprint_does_not_write_the_vault(self, vault):
+        from front_matter import read_front_matter
+        from vault_index import VaultIndex
+
+        index = VaultIndex(vault, read_front_matter)
+        index.fingerprint()
+
+        assert not index.index_path.exists()
+
+    def test_manager_writes_keep_index_current(self, vault):
+        manager = ObsidianEntityManager(str(vault))
+        manager.resolve_entities([{'name': 'Mayor Cognetti', 'type': 'PERSON', 'confidence': 0.95}])
+        manager.flush()
+
+        reloaded = ObsidianEntityManager(str(vault))
+        assert reloaded.index.reparsed == 0
+        assert reloaded.known_entities["paige cognetti"]["metadata"]["mention_count"] == 2
+
+    def test_new_entities_resolve_within_process(self, vault):
+        manager = ObsidianEntityManager(str(vault))
+
+        first = manager.resolve_entities([{'name': 'Bill Gaughan', 'type': 'PERSON'}])
+        second = manager.resolve_entities([{'name': 'Bill Gaughan', 'type': 'PERSON'}])
+
+        assert first[0]['resolution_method'] == 'new_entity'
+        assert second[0]['resolution_method'] == 'known_entity'
+        assert second[0]['file_path'] == first[0]['file_path']
+
+
+def test_shared_manager_is_created_once(vault, entity_managers):
+    manager = get_entity_manager(str(vault))
+
+    assert get_entity_manager(str(vault)) is manager
+    result = obsidian_entity_manager.integrate_with_obsidian(
+        [{'name': 'Scranton', 'type': 'LOCATION'}], [], manager=manager
+    )
+    assert result['resolved_entities'][0]['name'] == 'Scranton'
+    assert entity_managers[vault.resolve()] is manager
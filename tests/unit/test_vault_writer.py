@@ -0,0 +1,107 @@
+"""
+Unit tests for write-behind batching of vault updates.
+"""
+
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+import vault_writer
+from obsidian_entity_manager import ObsidianEntityManager
+from front_matter import split_front_matter
+from vault_writer import VaultWriteBuffer
+
+BODY = "\n\n# Scranton\n\nBody text --- with dashes.\n"
+
+
+@pytest.fixture
+def vault(temp_dir):
+    vault = temp_dir / "entities"
+    note = vault / "locations" / "scranton.md"
+    note.parent.mkdir(parents=True)
+    note.write_text(
+        "---\nname: Scranton\naliases: []\nentity_type: LOCATION\nconfidence: 0.7\nmention_count: 3\n---" + BODY
+    )
+    return vault
+
+
+def read_front_matter(path):
+    front_matter, body = split_front_matter(path.read_text())
+    return front_matter, body
+
+
+class TestVaultWriteBuffer:
+    """Test suite for VaultWriteBuffer."""
+
+    def test_updates_are_merged_into_one_write(self, vault):
+        note = vault / "locations" / "scranton.md"
+        buffer = VaultWriteBuffer(vault)
+
+        with patch.object(vault_writer, 'write_front_matter', wraps=vault_writer.write_front_matter) as write:
+            for _ in range(10):
+                buffer.add_mention(note, "Scranton", 0.6, "2025-06-26")
+            buffer.add_mention(note, "Electric City", 0.95, "2025-06-27")
+            buffer.add_relationship(note, "Lackawanna County", "LOCATED_IN", 0.8)
+            buffer.add_relationship(note, "Lackawanna County", "LOCATED_IN", 0.8)
+
+            assert write.call_count == 0
+            written = buffer.flush()
+
+        assert write.call_count == 1
+        front_matter, body = read_front_matter(note)
+        assert written[note] == front_matter
+        assert front_matter['mention_count'] == 14
+        assert front_matter['aliases'] == ["Electric City"]
+        assert front_matter['confidence'] == 0.95
+        assert front_matter['last_mentioned'] == "2025-06-27"
+        assert front_matter['relationships'] == [
+            {'target': '[[Lackawanna County]]', 'type': 'LOCATED_IN', 'confidence': 0.8}
+        ]
+        assert body == BODY
+        assert not buffer.journal_path.exists()
+
+    def test_journal_replays_unflushed_updates(self, vault):
+        note = vault / "locations" / "scranton.md"
+        crashed = VaultWriteBuffer(vault)
+        crashed.add_mention(note, "Scranton", 0.5)
+        crashed.add_mention(note, "Scranton", 0.5)
+        crashed.close()
+
+        recovered = VaultWriteBuffer(vault)
+        assert recovered.recover() == 2
+        recovered.flush()
+
+        assert read_front_matter(note)[0]['mention_count'] == 5
+
+    def test_journal_skips_notes_already_flushed(self, vault):
+        note = vault / "locations" / "scranton.md"
+        other = vault / "locations" / "ritz-theater.md"
+        other.write_text("---\nname: Ritz Theater\nmention_count: 0\n---\n")
+
+        buffer = VaultWriteBuffer(vault)
+        buffer.add_mention(note, "Scranton", 0.5)
+        buffer.add_mention(other, "Ritz Theater", 0.5)
+
+        # Crash after the first note is rewritten
+        with patch.object(vault_writer, 'write_front_matter', side_effect=[True, OSError("killed")]):
+            buffer.flush()
+        buffer.close()
+
+        replay = VaultWriteBuffer(vault)
+        assert replay.recover() == 1
+        assert list(replay.pending) == [other]
+
+
+def test_manager_flushes_each_touched_file_once(vault):
+    manager = ObsidianEntityManager(str(vault))
+    for _ in range(5):
+        manager.resolve_entities([{'name': 'Scranton', 'type': 'LOCATION', 'confidence': 0.8}])
+
+    # Lookups see pending updates before anything is written
+    assert manager.known_entities['scranton']['metadata']['mention_count'] == 8
+    assert yaml.safe_load((vault / "locations" / "scranton.md").read_text().split('---')[1])['mention_count'] == 3
+
+    assert manager.flush() == 1
+    assert read_front_matter(vault / "locations" / "scranton.md")[0]['mention_count'] == 8
+    assert ObsidianEntityManager(str(vault)).index.reparsed == 0